@@ -0,0 +1,27 @@
+import sys
+import time
+
+from pong_batch import BatchPong
+
+
+def bench(n=10000, seed=0, warm_ticks=2000):
+    """Time full-occupancy stepping, then play every match out for statistics"""
+    batch = BatchPong(n, seed=seed)
+    start = time.perf_counter()
+    ticks = 0
+    for _ in range(warm_ticks):
+        ticks += batch.step()
+    elapsed = time.perf_counter() - start
+    print(f"{n} matches: {ticks / elapsed / 1e6:.2f}M match-ticks/s "
+          f"({elapsed / warm_ticks * 1e3:.3f} ms per step)")
+
+    ticks += batch.run()
+    stats = batch.stats()
+    print(f"finished {stats['finished']}/{n} after {ticks} match-ticks")
+    print(f"player wins {stats['player_win_rate']:.1%}, AI wins {stats['ai_win_rate']:.1%}")
+    print(f"rallies {stats['rallies']}: mean {stats['mean_rally_hits']:.2f} hits / "
+          f"{stats['mean_rally_ticks']:.0f} ticks, longest {stats['max_rally_hits']} hits")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
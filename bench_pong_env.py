@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+from pong_env import PongEnv, VectorPongEnv, ACTIONS
+
+
+def bench_single(steps=100000):
+    """Steps per second of one PongEnv in this process"""
+    env = PongEnv(seed=0)
+    env.reset()
+    actions = np.random.default_rng(0).integers(len(ACTIONS), size=steps)
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vector(workers, envs_per_worker=256, steps=400):
+    """Environment steps per second with workers processes of envs_per_worker each"""
+    n = workers * envs_per_worker
+    rng = np.random.default_rng(0)
+    with VectorPongEnv(n, workers=workers, seed=0) as env:
+        env.reset()
+        env.step(rng.integers(len(ACTIONS), size=n))  # workers warmed up
+        start = time.perf_counter()
+        for _ in range(steps):
+            env.step(rng.integers(len(ACTIONS), size=n))
+        return n * steps / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"single PongEnv: {bench_single():,.0f} steps/s")
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else cores
+    base = None
+    workers = 1
+    while workers <= max_workers:
+        rate = bench_vector(workers)
+        base = base or rate
+        print(f"{workers:3d} workers: {rate:12,.0f} steps/s  ({rate / base:.2f}x, "
+              f"{rate / base / workers:.0%} of linear)")
+        workers *= 2
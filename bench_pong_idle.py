@@ -0,0 +1,70 @@
+import importlib.util
+import os
+import sys
+import time
+import tkinter as tk
+
+GAME = "pongv0_Catsanv1.py"
+
+
+def load_game(path):
+    spec = importlib.util.spec_from_file_location("game", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_for(root, seconds):
+    """Run Tk's event loop for seconds; returns the CPU used as a fraction of one core"""
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+    return (time.process_time() - cpu) / (time.perf_counter() - wall)
+
+
+def run_until(root, done, timeout=60.0):
+    def check():
+        if done() or time.perf_counter() > deadline:
+            root.quit()
+        else:
+            root.after(20, check)
+    deadline = time.perf_counter() + timeout
+    check()
+    root.mainloop()
+
+
+def bench(seconds=5.0):
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, here)
+    module = load_game(os.path.join(here, GAME))
+    root = tk.Tk()
+    game = module.PS5Pong(root)
+    game.sounds.ready.wait(10)
+    root.update()
+    results = [("menu", run_for(root, seconds))]
+
+    game.start_game()
+    results.append(("playing", run_for(root, seconds)))
+
+    # One point from the end, then let the AI finish the match
+    state = game.sim.state
+    state.ai_score = game.sim.win_score - 1
+    run_until(root, lambda: state.game_over)
+    results.append(("game over", run_for(root, seconds)))
+
+    game.restart_game()
+    root.update()
+    game.pause()
+    results.append(("paused", run_for(root, seconds)))
+
+    game.resume()
+    results.append(("resumed", run_for(root, seconds)))
+    root.destroy()
+
+    for name, cpu in results:
+        print(f"{name:10s} {cpu:6.1%} of a core")
+
+
+if __name__ == "__main__":
+    bench(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
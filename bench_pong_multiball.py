@@ -0,0 +1,119 @@
+import math
+import os
+import sys
+import time
+
+from pong_core import BALL_SIZE
+from pong_multiball import MultiBallSim
+
+COUNTS = (10, 100, 250, 500, 1000, 2000)
+DENSE_COUNTS = (1000, 2000, 5000, 10000, 20000)
+AREA_PER_BALL = 40 * 40  # constant-density series: court grows with the ball count
+BRUTE_LIMIT = 2000  # n * (n - 1) / 2 candidate pairs gets slow past this
+
+
+def time_physics(sim, ticks=200, warmup=20):
+    """Mean ms per step(), and mean candidate pairs per tick"""
+    for _ in range(warmup):
+        sim.step()
+    pairs = 0
+    elapsed = 0.0
+    for _ in range(ticks):
+        pairs += len(sim.candidate_pairs()[0])  # untimed: the step below repeats it
+        start = time.perf_counter()
+        sim.step()
+        elapsed += time.perf_counter() - start
+    return elapsed / ticks * 1000, pairs / ticks
+
+
+def bench_physics():
+    print("physics, 900x600 court")
+    print(f"{'balls':>6s} {'grid ms':>9s} {'pairs':>9s} {'brute ms':>9s} {'pairs':>10s}")
+    for n in COUNTS:
+        grid, grid_pairs = time_physics(MultiBallSim(n, seed=0))
+        line = f"{n:6d} {grid:9.3f} {grid_pairs:9.0f}"
+        if n <= BRUTE_LIMIT:
+            brute, brute_pairs = time_physics(MultiBallSim(n, seed=0, broad_phase="brute"), ticks=50)
+            line += f" {brute:9.3f} {brute_pairs:10.0f}"
+        print(line)
+
+    print(f"\nphysics, constant density ({AREA_PER_BALL} px^2 per ball)")
+    print(f"{'balls':>6s} {'court':>11s} {'grid ms':>9s} {'us/ball':>8s}")
+    for n in DENSE_COUNTS:
+        height = int(math.sqrt(n * AREA_PER_BALL / 1.5))
+        width = int(height * 1.5)
+        ms, _ = time_physics(MultiBallSim(n, width=width, height=height, seed=0), ticks=100)
+        print(f"{n:6d} {width:5d}x{height:<5d} {ms:9.3f} {ms / n * 1000:8.2f}")
+
+
+def time_pygame(counts, frames=200):
+    """ms per frame to draw and flip n balls with PygameRenderer"""
+    import pygame
+    from pong_pygame import PygameRenderer
+    pygame.display.init()
+    pygame.font.init()
+    results = {}
+    for n in counts:
+        sim = MultiBallSim(n, seed=0)
+        renderer = PygameRenderer(pygame.display.set_mode((sim.width, sim.height)), sim)
+        elapsed = 0.0
+        for _ in range(frames):
+            sim.step()
+            start = time.perf_counter()
+            renderer.draw_balls(zip(sim.x.tolist(), sim.y.tolist()), sim.state.player_y, sim.state.ai_y, start)
+            pygame.display.flip()
+            pygame.event.pump()
+            elapsed += time.perf_counter() - start
+        results[n] = elapsed / frames * 1000
+    pygame.quit()
+    return results
+
+
+def time_tk(counts, frames=100):
+    """ms per frame to move n canvas ovals and let Tk redraw them; None without a display"""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    results = {}
+    for n in counts:
+        sim = MultiBallSim(n, seed=0)
+        canvas = tk.Canvas(root, width=sim.width, height=sim.height, bg="#111", highlightthickness=0)
+        canvas.pack()
+        size = BALL_SIZE
+        balls = [canvas.create_oval(0, 0, size, size, fill="#FF9B1A", outline="") for _ in range(n)]
+        root.update()
+        elapsed = 0.0
+        for _ in range(frames):
+            sim.step()
+            start = time.perf_counter()
+            for item, x, y in zip(balls, sim.x.tolist(), sim.y.tolist()):
+                canvas.coords(item, x, y, x + size, y + size)
+            root.update_idletasks()
+            elapsed += time.perf_counter() - start
+        results[n] = elapsed / frames * 1000
+        canvas.destroy()
+    root.destroy()
+    return results
+
+
+def bench_render():
+    """Frame time per renderer; physics is stepped between frames but not timed"""
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # headless: software surface, no window
+    pygame_ms = time_pygame(COUNTS)
+    tk_ms = time_tk(COUNTS)
+    print(f"\nrender ({os.environ.get('SDL_VIDEODRIVER', 'default')} pygame driver)")
+    print(f"{'balls':>6s} {'pygame ms':>10s} {'tk ms':>8s}")
+    for n in COUNTS:
+        tk_cell = f"{tk_ms[n]:8.3f}" if tk_ms else f"{'-':>8s}"
+        print(f"{n:6d} {pygame_ms[n]:10.3f} {tk_cell}")
+    if tk_ms is None:
+        print("(no display: Tk skipped)")
+
+
+if __name__ == "__main__":
+    bench_physics()
+    if "--physics" not in sys.argv:
+        bench_render()
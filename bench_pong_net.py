@@ -0,0 +1,139 @@
+import heapq
+import random
+import socket
+import sys
+import time
+
+from pong_core import PongSim, P1_UP, P1_DOWN, PADDLE_HEIGHT, BALL_SIZE
+from pong_net import RollbackSession, UdpPeer
+from pong_replay import replay
+
+FRAME = 1 / 60
+
+
+class ImpairedSocket:
+    """UDP socket whose outgoing datagrams are delayed, jittered (and so reordered) or dropped"""
+
+    def __init__(self, sock, latency, jitter, loss, rng, clock=time.perf_counter):
+        self.sock = sock
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = rng
+        self.clock = clock
+        self.queue = []  # (due time, sequence, data, addr)
+        self.sequence = 0
+        self.dropped = 0
+
+    def sendto(self, data, addr):
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return len(data)
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        self.sequence += 1
+        heapq.heappush(self.queue, (self.clock() + delay, self.sequence, data, addr))
+        return len(data)
+
+    def flush(self):
+        """Put every datagram whose delay has passed on the wire"""
+        now = self.clock()
+        while self.queue and self.queue[0][0] <= now:
+            _, _, data, addr = heapq.heappop(self.queue)
+            self.sock.sendto(data, addr)
+
+    def recvfrom(self, size):
+        return self.sock.recvfrom(size)
+
+
+def bot_input(state, paddle_y, rng):
+    """Chase the ball with a little dithering, as seen in this peer's (possibly predicted) state"""
+    offset = state.ball_y + BALL_SIZE / 2 - (paddle_y + PADDLE_HEIGHT / 2)
+    if rng.random() < 0.1:
+        return rng.choice((0, P1_UP, P1_DOWN))
+    if offset < -15:
+        return P1_UP
+    if offset > 15:
+        return P1_DOWN
+    return 0
+
+
+def make_peer(side, seed, latency, jitter, loss, rng, input_delay, max_rollback):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.setblocking(False)
+    sim = PongSim(win_score=None, seed=seed, ai_mode="versus")
+    session = RollbackSession(sim, side, input_delay, max_rollback)
+    return UdpPeer(session, None, None, ImpairedSocket(sock, latency, jitter, loss, rng))
+
+
+def bench(seconds=20.0, rtt=0.150, jitter=0.015, loss=0.05, input_delay=2, max_rollback=8, seed=1):
+    rng = random.Random(seed)
+    peers = [make_peer(side, seed, rtt / 2, jitter, loss, rng, input_delay, max_rollback)
+             for side in ("left", "right")]
+    peers[0].peer_addr = peers[1].sock.sock.getsockname()
+    peers[1].peer_addr = peers[0].sock.sock.getsockname()
+    costs = []
+    frames = int(seconds / FRAME)
+    start = next_frame = time.perf_counter()
+    late = 0
+    for _ in range(frames):
+        for peer in peers:
+            peer.sock.flush()
+        for peer in peers:
+            state = peer.session.sim.state
+            y = state.player_y if peer.session.side == "left" else state.ai_y
+            t = time.perf_counter()
+            peer.tick(bot_input(state, y, rng))
+            costs.append(time.perf_counter() - t)
+        next_frame += FRAME
+        delay = next_frame - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            late += 1
+    elapsed = time.perf_counter() - start
+
+    # Let the last inputs through without impairment so both sides confirm the same frames
+    for peer in peers:
+        peer.sock.loss = peer.sock.latency = peer.sock.jitter = 0.0
+    for _ in range(30):
+        for peer in peers:
+            peer.sock.flush()
+            peer.poll()
+            peer.send()
+        time.sleep(0.005)
+    for peer in peers:
+        peer.session.finalize()
+
+    costs.sort()
+    print(f"RTT {rtt * 1000:.0f} ms, jitter +/-{jitter * 1000:.0f} ms, loss {loss:.0%}, "
+          f"input delay {input_delay}, max rollback {max_rollback}")
+    print(f"{frames} frames in {elapsed:.2f} s ({frames / elapsed:.1f} Hz), {late} late wakeups")
+    print(f"tick cost: p50 {costs[len(costs) // 2] * 1e6:.0f} us, "
+          f"p99 {costs[int(len(costs) * 0.99)] * 1e6:.0f} us, max {costs[-1] * 1e6:.0f} us")
+    for peer in peers:
+        stats = peer.session.stats()
+        print(f"{peer.session.side:5s} "
+              + "  ".join(f"{k}={v}" for k, v in stats.items())
+              + f"  sent={peer.packets_sent} ({peer.bytes_sent / max(1, peer.packets_sent):.1f} B avg)"
+              + f"  dropped={peer.sock.dropped}")
+
+    # Both peers must have recorded the same match, and it must replay exactly
+    left, right = (peer.session.recording for peer in peers)
+    same = min(left.ticks, right.ticks)
+    if list(left.inputs())[:same] != list(right.inputs())[:same]:
+        raise SystemExit("peers confirmed different inputs")
+    n = same // left.checksum_interval
+    if left.checksums[:n] != right.checksums[:n]:
+        raise SystemExit("peers desynced")
+    replay(left)
+    replay(right)
+    print(f"{same} confirmed frames identical on both peers and verified by replay")
+    stalled = max(peer.session.stalls for peer in peers)
+    if stalled > frames * 0.01:
+        raise SystemExit(f"{stalled} stalled frames: not a stable 60 Hz")
+
+
+if __name__ == "__main__":
+    bench(float(sys.argv[1]) if len(sys.argv) > 1 else 20.0,
+          float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.150)
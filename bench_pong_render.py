@@ -0,0 +1,74 @@
+import importlib.util
+import os
+import sys
+import time
+
+# Render rates asked for. pygame's Clock.tick waits whole milliseconds, so
+# the pygame front end aims at 1000 / (1000 // rate) fps instead: 62.5, 166.7
+# and 250. Each run reports the rate actually reached next to the one asked for
+RATES = (60, 144, 240)
+GAME = "ponghdr1.08.5.25.py"  # endless, so every frame has a ball in play
+
+
+def load_game(path):
+    spec = importlib.util.spec_from_file_location("game", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_tk(module, rate, seconds):
+    """(frames drawn, CPU seconds) for the Tk canvas front end asked to render at rate Hz"""
+    import tkinter as tk
+    from pong_loop import FixedStepLoop
+    root = tk.Tk()
+    game = module.PS5Pong(root)
+    game.sounds.ready.wait(10)
+    game.start_game()
+    game.loop.stop()
+    game.loop = FixedStepLoop(root, game.tick_rate, game.tick, game.draw, render_rate=rate)
+    root.update()
+    cpu = time.process_time()
+    game.loop.start()
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+    cpu = time.process_time() - cpu
+    frames = game.loop.frames
+    game.loop.stop()
+    root.destroy()
+    return frames, cpu
+
+
+def bench_pygame(rate, seconds):
+    """(frames drawn, CPU seconds) for the pygame surface front end asked to render at rate Hz"""
+    import pygame
+    from pong_pygame import PygamePong
+    game = PygamePong(win_score=None, fps=rate)
+    game.sounds.ready.wait(10)
+    cpu = time.process_time()
+    frames = game.run(seconds)
+    cpu = time.process_time() - cpu
+    pygame.display.quit()
+    return frames, cpu
+
+
+def bench(seconds=5.0):
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, here)
+    module = load_game(os.path.join(here, GAME))
+    for rate in RATES:
+        for name in ("tk", "pygame"):
+            try:
+                if name == "tk":
+                    frames, cpu = bench_tk(module, rate, seconds)
+                else:
+                    frames, cpu = bench_pygame(rate, seconds)
+            except Exception as exc:  # no display, no pygame: report and carry on
+                print(f"{name:6s} asked for {rate:3d} Hz: skipped ({exc})")
+                continue
+            print(f"{name:6s} asked for {rate:3d} Hz: {frames / seconds:6.1f} fps achieved, "
+                  f"{cpu / frames * 1000:6.3f} ms CPU per frame, {cpu / seconds:5.1%} of a core")
+
+
+if __name__ == "__main__":
+    bench(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
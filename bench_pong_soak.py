@@ -0,0 +1,64 @@
+import gc
+import importlib.util
+import os
+import resource
+import sys
+import time
+import tracemalloc
+import tkinter as tk
+
+GAME = "pongv0_Catsanv1.py"
+WARMUP = 20  # matches before the baseline is taken
+MAX_GROWTH = 256 * 1024  # traced Python bytes allowed to grow after warmup
+
+
+def load_game(path):
+    spec = importlib.util.spec_from_file_location("game", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def soak(matches=2000):
+    """Play matches back to back through game over and restart; fail if the canvas or heap grows"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, here)
+    module = load_game(os.path.join(here, GAME))
+    root = tk.Tk()
+    game = module.PS5Pong(root)
+    game.start_game()
+    game.loop.stop()  # ticks are driven directly below, as fast as they run
+    game.sounds.ready.wait(10)  # the loader thread's imports aren't part of the soak
+    canvas = game.canvas
+    tracemalloc.start()
+    start = time.perf_counter()
+    ticks = 0
+    baseline = None
+    for match in range(matches):
+        while not game.sim.state.game_over:
+            game.tick()
+            ticks += 1
+        game.draw(1.0)
+        root.update()
+        game.restart_game()
+        root.update()
+        if match + 1 == WARMUP:
+            gc.collect()
+            baseline = len(canvas.find_all()), tracemalloc.get_traced_memory()[0]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    items, traced = len(canvas.find_all()), tracemalloc.get_traced_memory()[0]
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    root.destroy()
+    print(f"{matches} matches, {ticks} ticks in {elapsed:.1f} s")
+    print(f"canvas items: {baseline[0]} after warmup, {items} at end")
+    print(f"traced Python memory: {baseline[1] / 1024:.0f} KiB after warmup, {traced / 1024:.0f} KiB at end")
+    print(f"peak RSS: {rss_kb / 1024:.1f} MiB")
+    if items != baseline[0]:
+        raise SystemExit(f"canvas leaked {items - baseline[0]} items")
+    if traced - baseline[1] > MAX_GROWTH:
+        raise SystemExit(f"memory grew by {(traced - baseline[1]) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    soak(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
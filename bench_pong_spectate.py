@@ -0,0 +1,125 @@
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import time
+
+from pong_core import PongSim
+from pong_spectate import SpectatorServer, SpectatorDecoder, watch, ACK
+
+TICK_RATE = 60
+
+
+def run_loop(seconds, server=None):
+    """A headless 60 Hz fixed-step game loop: per-tick work (wall and CPU) and tick intervals, in ms"""
+    sim = PongSim(seed=0, win_score=None)
+    step = 1.0 / TICK_RATE
+    work = []
+    cpu = []
+    intervals = []
+    next_tick = last = time.perf_counter()
+    end = next_tick + seconds
+    while next_tick < end:
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        start = time.perf_counter()
+        start_cpu = time.thread_time()
+        intervals.append((start - last) * 1000)
+        last = start
+        sim.step()
+        if server is not None:
+            server.publish(sim.state)
+        work.append((time.perf_counter() - start) * 1000)
+        cpu.append((time.thread_time() - start_cpu) * 1000)
+        next_tick += step
+    return work[1:], cpu[1:], intervals[1:], sim
+
+
+async def _slow_watch(host, port, counts, i, period):
+    """A viewer that reads and acks only every period seconds"""
+    reader, writer = await asyncio.open_connection(host, port)
+    decoder = SpectatorDecoder()
+    decoded = 0
+    try:
+        while True:
+            await asyncio.sleep(period)
+            data = await reader.read(65536)
+            if not data:
+                break
+            decoded += len(decoder.feed(data))
+            counts[i] = (decoded, decoder.keyframes, decoder.values)
+            writer.write(ACK.pack(decoded))
+    finally:
+        writer.close()
+
+
+def _spectators(conn, port, n, slow, period):
+    async def main():
+        counts = [(0, 0, None)] * n
+        loop = asyncio.get_running_loop()
+
+        def fast(i):
+            def on_frame(values):
+                decoded, keyframes, _ = counts[i]
+                counts[i] = (decoded + 1, keyframes, values)
+            return watch("127.0.0.1", port, on_frame)
+        tasks = [asyncio.create_task(_slow_watch("127.0.0.1", port, counts, i, period) if i < slow else fast(i))
+                 for i in range(n)]
+        await loop.run_in_executor(None, conn.recv)  # until told to report
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        conn.send(counts)
+    asyncio.run(main())
+
+
+def summary(name, work, cpu, intervals):
+    work = sorted(work)
+    intervals = sorted(intervals)
+    p99 = int(len(work) * 0.99)
+    print(f"{name:26s} {statistics.mean(work):6.3f} {work[p99]:6.3f} {statistics.mean(cpu):6.3f}   "
+          f"{statistics.mean(intervals):6.2f} {intervals[p99]:6.2f} {intervals[-1]:6.2f}")
+
+
+def bench(clients=500, slow=50, seconds=10.0, period=0.5):
+    print(f"60 Hz loop, {seconds:.0f} s per run, times in ms")
+    print(f"{'':26s} {'work':>6s} {'p99':>6s} {'cpu':>6s}   {'tick':>6s} {'p99':>6s} {'max':>6s}")
+    summary("no server", *run_loop(seconds)[:3])
+
+    server = SpectatorServer().start()
+    summary("server, no spectators", *run_loop(seconds, server)[:3])
+
+    parent, child = multiprocessing.Pipe()
+    viewers = multiprocessing.Process(target=_spectators, args=(child, server.port, clients, slow, period),
+                                      daemon=True)
+    viewers.start()
+    deadline = time.perf_counter() + 30
+    while server.stats()["clients"] < clients and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    before = server.stats()["frames"]
+    summary(f"{clients} spectators ({slow} slow)", *run_loop(seconds, server)[:3])
+    time.sleep(2 * period)  # let every viewer catch up on the last frame
+    parent.send("report")
+    counts = parent.recv()
+    viewers.join()
+    stats = server.stats()
+    server.close()
+
+    final = server.values
+    frames = stats["frames"] - before
+    fast = counts[slow:]
+    current = sum(values == final for _, _, values in fast)
+    print(f"server: {stats}")
+    print(f"fast viewers: {current}/{len(fast)} on the final frame, "
+          f"{statistics.mean(c for c, _, _ in fast):.0f} frames each of {frames}")
+    if slow:
+        print(f"slow viewers: {statistics.mean(c for c, _, _ in counts[:slow]):.0f} frames each, "
+              f"{statistics.mean(k for _, k, _ in counts[:slow]):.1f} keyframes")
+    print(f"{stats['bytes_sent'] / max(1, frames * clients):.1f} bytes per frame per viewer")
+    if current != len(fast):
+        sys.exit("some fast viewers did not reach the final frame")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import time
+
+VARIANTS = ("pongv0_Catsanv1.py", "ponghdr1.08.5.25.py")
+
+# Runs in a fresh interpreter: build the game, draw the menu once, report
+CHILD = r"""
+import importlib.util, sys, tkinter as tk
+spec = importlib.util.spec_from_file_location("game", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+root = tk.Tk()
+game = module.PS5Pong(root)
+root.update()
+print("menu", flush=True)
+game.sounds.ready.wait(10)
+print("sounds", flush=True)
+root.destroy()
+"""
+
+
+def time_startup(path):
+    """Seconds from process spawn to the first drawn menu frame and to sounds ready"""
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, "-c", CHILD, path], stdout=subprocess.PIPE, text=True,
+                             env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+    marks = {}
+    for line in child.stdout:
+        marks[line.strip()] = time.perf_counter() - start
+    child.wait()
+    if child.returncode:
+        raise RuntimeError(f"{path} exited with {child.returncode}")
+    return marks["menu"], marks["sounds"]
+
+
+def bench(runs=5):
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in VARIANTS:
+        results = [time_startup(os.path.join(here, name)) for _ in range(runs)]
+        menu = sorted(r[0] for r in results)
+        sounds = sorted(r[1] for r in results)
+        print(f"{name:22s} first menu frame: median {menu[runs // 2] * 1000:6.1f} ms "
+              f"(min {menu[0] * 1000:.1f})   sounds ready: median {sounds[runs // 2] * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
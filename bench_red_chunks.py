@@ -0,0 +1,60 @@
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # headless unless a display driver is chosen
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+
+import redv0
+from bench_red_world import camera_path
+from red_tiles import PATH, TileAtlas, ChunkCache
+
+TILE_SIZE = redv0.TILE_SIZE
+
+
+def frame_times(draw, cameras, fps=60):
+    """Per-frame ms for draw(camera_x, camera_y, water frame) over the camera path, animating as the game does"""
+    frame_ms = 1000 / fps
+    times = []
+    for i, (camera_x, camera_y) in enumerate(cameras):
+        start = time.perf_counter()
+        draw(camera_x, camera_y, int(i * frame_ms) // redv0.WATER_FRAME_MS)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summary(times):
+    ordered = sorted(times)
+    return f"{statistics.mean(times):6.3f} {ordered[len(ordered) // 2]:6.3f} {ordered[int(len(ordered) * 0.99)]:6.3f}"
+
+
+def bench(frames=2000, sizes=((20, 15), (100, 100), (1000, 1000))):
+    screen = redv0.screen
+    atlas = TileAtlas(TILE_SIZE, seed=0)
+    print(f"draw_world, {screen.get_width()}x{screen.get_height()} view, {frames} frames at 3 px "
+          f"({os.environ['SDL_VIDEODRIVER']} driver), ms mean/p50/p99")
+    for width, height in sizes:
+        start = time.perf_counter()
+        world_map = redv0.generate_map(width, height)
+        generated = time.perf_counter() - start
+        cameras = list(camera_path(world_map, screen, frames))
+        print(f"map {width}x{height} (generated in {generated:.2f} s)")
+        # The same map with every tile a plain path: no decorations, no animation
+        for name, tiles in (("", world_map), (", undecorated", np.full_like(world_map, PATH))):
+            per_tile = frame_times(lambda x, y, frame: atlas.draw(screen, tiles, x, y, frame), cameras)
+            chunks = ChunkCache(atlas, tiles, redv0.CHUNK_TILES, redv0.CHUNK_BUDGET)
+            cached = frame_times(lambda x, y, frame: chunks.draw(screen, x, y, frame), cameras)
+            stats = chunks.stats()
+            print(f"  per-tile atlas{name:14s} {summary(per_tile)}")
+            print(f"  chunk cache{name:17s} {summary(cached)}   {stats['chunks']} chunks, "
+                  f"{stats['bytes'] / 2**20:.1f}/{stats['budget'] / 2**20:.0f} MiB, {stats['hits']} hits, "
+                  f"{stats['misses']} misses, {stats['prefetched']} built ahead "
+                  f"({stats['build_ms'] / max(1, stats['misses'] + stats['prefetched']):.2f} ms each), "
+                  f"{stats['evictions']} evictions")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
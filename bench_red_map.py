@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # headless unless a display driver is chosen
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+
+import redv0
+from red_mapfile import MapFile, TileLayer, export_map, MAGIC, HEADER
+from red_tiles import TILE_TYPES, WALKABLE, ENCOUNTER_RATE
+
+VIEW = (19, 13)  # tiles in redv0's view, rounded up
+
+
+def generate_map_names(width, height):
+    """redv0's generate_map before the tile registry: a list of lists of tile names, built a tile at a time"""
+    world_map = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            # Create paths along the center
+            if (x > width//2 - 3 and x < width//2 + 3) or (y > height//2 - 3 and y < height//2 + 3):
+                row.append("path")
+            # Create water on edges
+            elif x < 3 or x > width - 4 or y < 3 or y > height - 4:
+                row.append("water")
+            # Create trees in some areas
+            elif (x > 10 and x < 20 and y > 10 and y < 20) or (x > 30 and x < 40 and y > 30 and y < 40):
+                row.append("tree")
+            # Create buildings
+            elif (x == 15 and y == 5) or (x == 35 and y == 25) or (x == 5 and y == 35):
+                row.append("building")
+            # The rest is grass
+            else:
+                row.append("grass")
+        world_map.append(row)
+    return world_map
+
+
+def build(generate, width, height):
+    """(map, seconds, bytes allocated) for generate(width, height); tracing is slow, so it is a second run"""
+    start = time.perf_counter()
+    generate(width, height)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    world_map = generate(width, height)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return world_map, elapsed, size
+
+
+def step_checks(names, grid, steps=200000):
+    """ns per move_player walkability and encounter check, before and after the registry"""
+    rng = random.Random(0)
+    tiles = [(rng.randrange(len(grid)), rng.randrange(len(grid[0]))) for _ in range(steps)]
+    chance = random.random
+
+    def before():
+        for y, x in tiles:
+            if names[y][x] not in ["water", "tree"]:
+                if names[y][x] == "grass" and chance() < 0.005:
+                    pass
+
+    def after():
+        for y, x in tiles:
+            tile = grid.item(y, x)
+            if WALKABLE[tile]:
+                if chance() < ENCOUNTER_RATE[tile]:
+                    pass
+    return [min(timeit.repeat(check, number=1, repeat=5)) / steps * 1e9 for check in (before, after)]
+
+
+def bench(sizes=((100, 100), (1000, 1000), (2000, 2000))):
+    print("map          generate: names    grid       memory: names       grid    step: names   grid")
+    for width, height in sizes:
+        names, names_s, names_bytes = build(generate_map_names, width, height)
+        grid, grid_s, grid_bytes = build(redv0.generate_map, width, height)
+        assert names == [[TILE_TYPES[tile] for tile in row] for row in grid.tolist()]
+        before, after = step_checks(names, grid)
+        print(f"{width}x{height:<8d} {names_s * 1000:10.1f} ms {grid_s * 1000:7.2f} ms "
+              f"{names_bytes / 2**20:10.1f} MiB {grid_bytes / 2**20:7.2f} MiB ({names_bytes / grid_bytes:4.1f}x) "
+              f"{before:6.0f} ns {after:4.0f} ns")
+        del names
+
+
+def rss():
+    """Resident set size of this process in bytes (Linux)"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def load(how, path, width, height):
+    if how == "generate":
+        return redv0.generate_map(width, height)
+    if how == "read":
+        # The whole file into memory: what opening a map would cost without mmap
+        with open(path, "rb") as f:
+            data = f.read()
+        block, data_offset = (HEADER.unpack_from(data, len(MAGIC))[i] for i in (3, -1))
+        rows, cols = -(-height // block), -(-width // block)
+        blocks = np.frombuffer(data, np.uint8, rows * cols * block * block, data_offset)
+        return TileLayer(blocks.reshape(rows, cols, block, block), width, height)
+    return MapFile(path).tiles
+
+
+def evict(path):
+    """Drop path from the page cache, as if the map had not been read since boot"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _walk_rss(conn, how, path, width, height, steps):
+    """In a fresh process: (RSS after loading, after walking steps tiles across the map) above the start"""
+    evict(path)
+    base = rss()
+    tiles = load(how, path, width, height)
+    loaded = rss()
+    total = 0
+    for step in range(steps):
+        x = step * (width - VIEW[0]) // steps
+        y = step * (height - VIEW[1]) // steps
+        total += int(tiles[y:y + VIEW[1], x:x + VIEW[0]].sum())  # every tile in view is read, as drawing does
+    conn.send((loaded - base, rss() - base))
+
+
+def load_bench(sizes=((1000, 1000), (4000, 4000), (8000, 8000)), repeat=5, steps=2000):
+    print(f"map loading (page cache warm), and RSS after a {steps}-step diagonal walk "
+          f"in a {VIEW[0]}x{VIEW[1]} view (page cache cold)")
+    print(f"map          {'':9s} load ms     RSS loaded   walked")
+    ctx = multiprocessing.get_context("spawn")  # a forked child would reuse the heap our loads have grown
+    with tempfile.TemporaryDirectory() as directory:
+        for width, height in sizes:
+            path = os.path.join(directory, f"{width}x{height}.redmap")
+            export_map(path, redv0.generate_map(width, height))
+            for how in ("generate", "read", "mmap"):
+                times = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    tiles = load(how, path, width, height)
+                    times.append((time.perf_counter() - start) * 1000)
+                    del tiles
+                parent, child = ctx.Pipe()
+                process = ctx.Process(target=_walk_rss, args=(child, how, path, width, height, steps))
+                process.start()
+                loaded, walked = parent.recv()
+                process.join()
+                print(f"{width}x{height:<8d} {how:9s} {statistics.median(times):8.3f} "
+                      f"{loaded / 2**20:10.2f} MiB {walked / 2**20:6.2f} MiB")
+
+
+if __name__ == "__main__":
+    sizes = [(int(n),) * 2 for n in sys.argv[1:]]
+    bench(sizes or ((100, 100), (1000, 1000), (2000, 2000)))
+    load_bench(sizes or ((1000, 1000), (4000, 4000), (8000, 8000)))
@@ -0,0 +1,110 @@
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # headless unless a display driver is chosen
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import redv0
+from red_tiles import TileAtlas, ChunkCache
+from red_world import StreamingWorld, generate_chunk
+
+TILE_SIZE = redv0.TILE_SIZE
+SEED = 1
+ORIGIN = 1 << 19  # tiles: start in the middle of the world
+
+
+def generation_throughput(seconds=2.0, worker="process"):
+    """Chunks a second generated inline, then through a started StreamingWorld's worker"""
+    n = redv0.CHUNK_TILES
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        generate_chunk(SEED, count, 0, n)
+        count += 1
+    inline = count / (time.perf_counter() - start)
+
+    world = StreamingWorld(SEED, n, worker=worker, in_flight=32).start()
+    view = (0, 0, n * 64, n * 32)  # far more chunks than the worker can make in the time
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        world.update(*view)
+        time.sleep(0.001)
+    through_worker = world.generated / (time.perf_counter() - start)
+    world.close()
+    return inline, through_worker
+
+
+def walk(world, speed, frames, origin):
+    """Walk the camera round a square from tile origin at speed px a frame, in a real 60 FPS clock.tick loop
+
+    Returns per-frame work (update and draw) and frame intervals in ms,
+    and the world's stalls and ms stalled while walking (None for a fixed map).
+    """
+    screen = redv0.screen
+    width, height = screen.get_size()
+    chunks = ChunkCache(TileAtlas(TILE_SIZE, seed=0), world, redv0.CHUNK_TILES, redv0.CHUNK_BUDGET)
+    streaming = isinstance(world, StreamingWorld)
+    clock = pygame.time.Clock()
+    camera_x = camera_y = origin * TILE_SIZE
+
+    def frame(number):
+        if streaming:
+            world.update(camera_x // TILE_SIZE, camera_y // TILE_SIZE,
+                         (camera_x + width) // TILE_SIZE + 1, (camera_y + height) // TILE_SIZE + 1)
+        chunks.draw(screen, camera_x, camera_y, number // 15)
+
+    # The first view, as the game has it before its loop starts
+    frame(0)
+    time.sleep(0.2)
+    stalls = (world.stalls, world.stall_time) if streaming else None
+    side = frames // 4
+    work = []
+    intervals = []
+    clock.tick()
+    for number in range(frames):
+        dx, dy = ((speed, 0), (0, speed), (-speed, 0), (0, -speed))[min(3, number // side)]
+        camera_x += dx
+        camera_y += dy
+        start = time.perf_counter()
+        frame(number)
+        work.append((time.perf_counter() - start) * 1000)
+        intervals.append(clock.tick(redv0.FPS))
+    if streaming:
+        stalls = (world.stalls - stalls[0], (world.stall_time - stalls[1]) * 1000)
+    return work, intervals, stalls
+
+
+def bench(frames=1200):
+    inline, through_worker = generation_throughput()
+    n = redv0.CHUNK_TILES
+    print(f"generation: {inline:.0f} chunks/s inline ({inline * n * n / 1e3:.0f}k tiles/s), "
+          f"{through_worker:.0f} chunks/s through a worker process")
+    print(f"walking {frames} frames at {redv0.FPS} FPS, ms       work mean    p99    max   "
+          f"frame p99    max   stalls   stall ms")
+    fixed = redv0.generate_map(1000, 1000)
+    for speed in (3, 12):
+        for worker in ("fixed map", None, "thread", "process"):
+            if worker == "fixed map":
+                world, origin = fixed, 100
+            else:
+                world, origin = StreamingWorld(SEED, n, worker=worker).start(), ORIGIN
+            work, intervals, stalls = walk(world, speed, frames, origin)
+            if stalls is not None:
+                world.close()
+            work = sorted(work)
+            intervals = sorted(intervals)
+            p99 = int(len(work) * 0.99)
+            name = worker if worker == "fixed map" else f"worker {worker}"
+            line = (f"  {speed:2d} px/frame, {name:15s} {statistics.mean(work):8.3f} {work[p99]:6.3f} {work[-1]:6.3f}"
+                    f"   {intervals[p99]:9d} {intervals[-1]:6d}")
+            if stalls is not None:
+                line += f"   {stalls[0]:6d} {stalls[1]:10.3f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1200)
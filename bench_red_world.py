@@ -0,0 +1,97 @@
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # headless unless a display driver is chosen
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import redv0
+from red_tiles import GRASS_TILE, PATH_TILE, WATER_TILE, TREE_TILE, BUILDING_TILE, TILE_TYPES, TileAtlas
+
+TILE_SIZE = redv0.TILE_SIZE
+
+
+def names(world_map):
+    """A tile ID grid as the lists of tile names redv0 kept before the tile registry"""
+    return [[TILE_TYPES[tile] for tile in row] for row in world_map.tolist()]
+
+
+def draw_world_shapes(screen, world_map, camera_x, camera_y):
+    """redv0's draw_world before the atlas: primitives and string compares for every tile, every frame"""
+    width, height = screen.get_size()
+    start_x = max(0, camera_x // TILE_SIZE)
+    start_y = max(0, camera_y // TILE_SIZE)
+    end_x = min(len(world_map[0]), (camera_x + width) // TILE_SIZE + 1)
+    end_y = min(len(world_map), (camera_y + height) // TILE_SIZE + 1)
+
+    for y in range(start_y, end_y):
+        for x in range(start_x, end_x):
+            tile_x = x * TILE_SIZE - camera_x
+            tile_y = y * TILE_SIZE - camera_y
+
+            if world_map[y][x] == "grass":
+                pygame.draw.rect(screen, GRASS_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
+                for i in range(3):
+                    offset_x = random.randint(0, TILE_SIZE-5)
+                    offset_y = random.randint(0, TILE_SIZE-5)
+                    pygame.draw.line(screen, (0, 180, 0),
+                                     (tile_x + offset_x, tile_y + offset_y),
+                                     (tile_x + offset_x, tile_y + offset_y + 3), 2)
+            elif world_map[y][x] == "path":
+                pygame.draw.rect(screen, PATH_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
+            elif world_map[y][x] == "water":
+                pygame.draw.rect(screen, WATER_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
+                for i in range(4):
+                    offset_x = random.randint(0, TILE_SIZE-5)
+                    offset_y = random.randint(0, TILE_SIZE-5)
+                    pygame.draw.arc(screen, (100, 100, 255),
+                                    (tile_x + offset_x, tile_y + offset_y, 10, 5),
+                                    0, math.pi, 2)
+            elif world_map[y][x] == "tree":
+                pygame.draw.rect(screen, GRASS_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
+                pygame.draw.rect(screen, TREE_TILE, (tile_x + TILE_SIZE//3, tile_y, TILE_SIZE//3, TILE_SIZE))
+                pygame.draw.circle(screen, (0, 80, 0), (tile_x + TILE_SIZE//2, tile_y - 5), TILE_SIZE//2)
+            elif world_map[y][x] == "building":
+                pygame.draw.rect(screen, BUILDING_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
+                pygame.draw.rect(screen, (100, 100, 255), (tile_x + TILE_SIZE//4, tile_y + TILE_SIZE//3, TILE_SIZE//2, TILE_SIZE//3))
+
+
+def camera_path(world_map, screen, frames):
+    """Camera positions sweeping diagonally across the map and back, 3 px a frame like the player"""
+    width, height = screen.get_size()
+    max_x = max(0, len(world_map[0]) * TILE_SIZE - width)
+    max_y = max(0, len(world_map) * TILE_SIZE - height)
+    span = max(max_x, max_y, 1)
+    for frame in range(frames):
+        t = (frame * 3) % (2 * span)
+        t = t if t <= span else 2 * span - t
+        yield max_x * t // span, max_y * t // span
+
+
+def time_draw(draw, screen, world_map, frames):
+    """ms per frame for draw(screen, world_map, camera_x, camera_y)"""
+    cameras = list(camera_path(world_map, screen, frames))
+    start = time.perf_counter()
+    for camera_x, camera_y in cameras:
+        draw(screen, world_map, camera_x, camera_y)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def bench(frames=600):
+    screen = redv0.screen
+    atlas = TileAtlas(TILE_SIZE, seed=0)
+    print(f"draw_world, {screen.get_width()}x{screen.get_height()} view, {frames} frames "
+          f"({os.environ['SDL_VIDEODRIVER']} driver)")
+    for name, size in (("game map 20x15", (20, 15)), ("map 50x50", (50, 50))):
+        world_map = redv0.generate_map(*size)
+        shapes = time_draw(draw_world_shapes, screen, names(world_map), frames)
+        blits = time_draw(atlas.draw, screen, world_map, frames)
+        print(f"{name:16s} primitives {shapes:7.3f} ms   atlas {blits:7.3f} ms   {shapes / blits:5.1f}x")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
@@ -0,0 +1,257 @@
+import numpy as np
+
+from pong_core import (WIDTH, HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT, PADDLE_MARGIN,
+                       BALL_SIZE, BALL_SPEED, PADDLE_SPEED, AI_DIFFICULTY,
+                       AI_MAX_DIFFICULTY, AI_ERROR_RATE, SPEEDUP, SPIN, WIN_SCORE,
+                       MAX_BALL_SPEED, MAX_BOUNCES, BASE_TICK_RATE, AI_INTERCEPT_SPREAD,
+                       P1_UP, P1_DOWN, intercept_y)
+
+# Rally lengths (paddle hits) above this land in the last histogram bucket
+MAX_RALLY_BUCKET = 64
+
+
+class BatchPong:
+    """N independent Pong matches in structure-of-arrays form, stepped together
+
+    Mirrors PongSim.move_paddles/move_ball tick for tick. The left paddle is
+    driven by per-match input bits, or by a second copy of the tracking AI
+    when no inputs are given, which is what parameter sweeps use. ai_mode
+    selects the right paddle's AI as in PongSim.
+    """
+
+    def __init__(self, n, seed=None, ai_difficulty=AI_DIFFICULTY, player_difficulty=AI_DIFFICULTY,
+                 error_rate=AI_ERROR_RATE, speedup=SPEEDUP, win_score=WIN_SCORE,
+                 width=WIDTH, height=HEIGHT, tick_rate=BASE_TICK_RATE, ai_mode="track"):
+        if ai_mode not in ("track", "intercept"):  # no second player in batch runs
+            raise ValueError(f"ai_mode must be 'track' or 'intercept', not {ai_mode!r}")
+        self.ai_mode = ai_mode
+        self.n = n
+        self.dt = BASE_TICK_RATE / tick_rate
+        self.rng = np.random.default_rng(seed)
+        self.width = width
+        self.height = height
+        self.win_score = win_score
+        self.player_x = PADDLE_MARGIN
+        self.ai_x = width - PADDLE_MARGIN - PADDLE_WIDTH
+
+        # Per-match tuning knobs accept scalars or arrays of length n
+        def per_match(value):
+            return np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy()
+        self.base_difficulty = per_match(ai_difficulty)
+        self.player_difficulty = per_match(player_difficulty)
+        self.error_rate = per_match(error_rate)
+        self.speedup = per_match(speedup)
+
+        self.ball_x = np.empty(n)
+        self.ball_y = np.empty(n)
+        self.ball_dx = np.empty(n)
+        self.ball_dy = np.empty(n)
+        self.player_y = np.empty(n)
+        self.ai_y = np.empty(n)
+        self.ai_difficulty = np.empty(n)
+        self.ai_target = np.empty(n)
+        self.player_score = np.zeros(n, dtype=np.int32)
+        self.ai_score = np.zeros(n, dtype=np.int32)
+        self.done = np.zeros(n, dtype=bool)
+        self.rally_hits = np.zeros(n, dtype=np.int32)
+        self.rally_ticks = np.zeros(n, dtype=np.int32)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        """Start every match over at 0 : 0"""
+        self.player_y.fill(self.height // 2 - PADDLE_HEIGHT // 2)
+        self.ai_y.fill(self.height // 2 - PADDLE_HEIGHT // 2)
+        self.ai_difficulty[:] = self.base_difficulty
+        self.ai_target.fill(self.height / 2 - BALL_SIZE / 2)
+        self.player_score.fill(0)
+        self.ai_score.fill(0)
+        self.done.fill(False)
+        self.rally_hits.fill(0)
+        self.rally_ticks.fill(0)
+        self.ticks.fill(0)
+        self.rallies = 0
+        self.rally_hit_total = 0
+        self.rally_tick_total = 0
+        self.max_rally = 0  # the histogram's last bucket lumps together everything from MAX_RALLY_BUCKET up
+        self.rally_hist = np.zeros(MAX_RALLY_BUCKET + 1, dtype=np.int64)
+        self.serve(np.ones(self.n, dtype=bool))
+
+    def serve(self, mask):
+        """Center and relaunch the ball in the matches selected by mask"""
+        k = int(np.count_nonzero(mask))
+        if not k:
+            return
+        self.ball_x[mask] = self.width // 2 - BALL_SIZE // 2
+        self.ball_y[mask] = self.height // 2 - BALL_SIZE // 2
+        signs = self.rng.integers(0, 2, size=(2, k)) * 2 - 1
+        self.ball_dx[mask] = BALL_SPEED * signs[0]
+        self.ball_dy[mask] = BALL_SPEED * signs[1]
+        if self.ai_mode == "intercept":
+            self._aim_ai(mask)
+
+    def _aim_ai(self, mask):
+        """Vectorized PongSim.aim_ai for the matches selected by mask"""
+        idx = np.flatnonzero(mask)
+        if not idx.size:
+            return
+        dx = self.ball_dx[idx]
+        incoming = dx > 0
+        target = np.full(idx.size, self.height / 2 - BALL_SIZE / 2)
+        i = idx[incoming]
+        error = self.rng.uniform(-1, 1, i.size) * (1 - self.ai_difficulty[i]) * AI_INTERCEPT_SPREAD
+        target[incoming] = intercept_y(self.ball_x[i], self.ball_y[i], self.ball_dx[i], self.ball_dy[i],
+                                       self.ai_x - BALL_SIZE, self.height) + error
+        self.ai_target[idx] = target
+
+    def _intercept_dy(self):
+        speed = PADDLE_SPEED * self.ai_difficulty
+        offset = self.ai_target + BALL_SIZE / 2 - (self.ai_y + PADDLE_HEIGHT / 2)
+        return np.clip(offset / self.dt, -speed, speed)
+
+    def _ai_dy(self, paddle_y, difficulty):
+        paddle_center = paddle_y + PADDLE_HEIGHT / 2
+        ball_center = self.ball_y + BALL_SIZE / 2
+        speed = PADDLE_SPEED * difficulty
+        dy = np.where(ball_center < paddle_center - 10, -speed,
+                      np.where(ball_center > paddle_center + 10, speed, 0.0))
+        # One draw per match covers both the error roll and its magnitude:
+        # given u < rate, u / rate is again uniform on [0, 1). The rate is
+        # per 60 Hz frame, as in PongSim
+        u = self.rng.random(self.n)
+        rate = self.error_rate * self.dt
+        err = u < rate
+        dy[err] *= 0.5 + u[err] / rate[err]
+        return dy
+
+    def _move_paddle(self, paddle_y, dy, active):
+        ok = active & (paddle_y + dy > 0) & (paddle_y + PADDLE_HEIGHT + dy < self.height)
+        paddle_y[ok] += dy[ok]
+
+    def step(self, inputs=None):
+        """Advance every unfinished match by one tick; returns the number advanced"""
+        active = ~self.done
+        n_active = int(np.count_nonzero(active))
+        if not n_active:
+            return 0
+        self.ticks += active
+        self.rally_ticks += active
+
+        # Paddles
+        if inputs is None:
+            player_dy = self._ai_dy(self.player_y, self.player_difficulty)
+        else:
+            inputs = np.asarray(inputs)
+            player_dy = PADDLE_SPEED * (((inputs & P1_DOWN) != 0).astype(np.float64) -
+                                        ((inputs & P1_UP) != 0))
+        self._move_paddle(self.player_y, player_dy * self.dt, active)
+        if self.ai_mode == "intercept":
+            ai_dy = self._intercept_dy()
+        else:
+            ai_dy = self._ai_dy(self.ai_y, self.ai_difficulty)
+        self._move_paddle(self.ai_y, ai_dy * self.dt, active)
+
+        self.rally_hits += self._sweep_ball(player_dy, active)
+
+        # Scoring
+        ai_point = active & (self.ball_x <= 0)
+        player_point = active & ~ai_point & (self.ball_x + BALL_SIZE >= self.width)
+        scored = ai_point | player_point
+        if scored.any():
+            self.ai_score += ai_point
+            self.player_score += player_point
+            self._record_rallies(scored)
+            if self.win_score is not None:
+                self.done |= scored & ((self.player_score >= self.win_score) |
+                                       (self.ai_score >= self.win_score))
+            again = scored & ~self.done
+            # Increase difficulty as score increases
+            total = self.ai_score[again] + self.player_score[again]
+            self.ai_difficulty[again] = np.minimum(AI_MAX_DIFFICULTY,
+                                                   self.base_difficulty[again] + total * 0.02)
+            self.serve(again)
+        return n_active
+
+    def _sweep_ball(self, player_dy, active):
+        """Vectorized PongSim.move_ball: advance each ball to its next contact until the tick is used up"""
+        x, y, vx, vy = self.ball_x, self.ball_y, self.ball_dx, self.ball_dy
+        remaining = np.where(active, self.dt, 0.0)
+        live = active.copy()
+        hits = np.zeros(self.n, dtype=np.int32)
+        left_face = self.player_x + PADDLE_WIDTH
+        right_face = self.ai_x - BALL_SIZE
+        floor = self.height - BALL_SIZE
+        for _ in range(MAX_BOUNCES):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t_wall = np.where(vy < 0, -y, floor - y) / vy
+                t_player = np.maximum((left_face - x) / vx, 0.0)
+                t_ai = np.maximum((right_face - x) / vx, 0.0)
+            t_wall[vy == 0] = np.inf
+            np.maximum(t_wall, 0.0, out=t_wall)
+            best = np.minimum(t_wall, remaining)
+            wall = live & (t_wall <= remaining)
+
+            y_at = y + vy * t_player
+            player = (live & (vx < 0) & (x + BALL_SIZE >= self.player_x) & (t_player <= best) &
+                      (y_at + BALL_SIZE >= self.player_y) & (y_at <= self.player_y + PADDLE_HEIGHT))
+            y_at = y + vy * t_ai
+            ai = (live & (vx > 0) & (x <= self.ai_x + PADDLE_WIDTH) & (t_ai <= best) &
+                  (y_at + BALL_SIZE >= self.ai_y) & (y_at <= self.ai_y + PADDLE_HEIGHT))
+            best = np.where(player, t_player, np.where(ai, t_ai, best))
+            best[~live] = 0.0
+            wall &= ~(player | ai)
+
+            x += vx * best
+            y += vy * best
+            remaining -= best
+            vy[wall] = -vy[wall]
+            speed = np.minimum(np.abs(vx) * self.speedup, MAX_BALL_SPEED)
+            vx[player] = speed[player]
+            vy[player] += player_dy[player] * SPIN
+            vx[ai] = -speed[ai]
+            hits += player | ai
+            if self.ai_mode == "intercept":
+                self._aim_ai(player | ai)
+            live &= wall | player | ai
+            if not live.any():
+                break
+        return hits
+
+    def _record_rallies(self, scored):
+        hits = self.rally_hits[scored]
+        self.rallies += hits.size
+        self.rally_hit_total += int(hits.sum())
+        self.rally_tick_total += int(self.rally_ticks[scored].sum())
+        self.max_rally = max(self.max_rally, int(hits.max()))
+        self.rally_hist += np.bincount(np.minimum(hits, MAX_RALLY_BUCKET),
+                                       minlength=MAX_RALLY_BUCKET + 1)
+        self.rally_hits[scored] = 0
+        self.rally_ticks[scored] = 0
+
+    def run(self, max_ticks=100000, inputs=None):
+        """Step until every match is over or max_ticks elapse; returns match-ticks simulated"""
+        total = 0
+        for _ in range(max_ticks):
+            advanced = self.step(inputs)
+            if not advanced:
+                break
+            total += advanced
+        return total
+
+    def stats(self):
+        """Aggregate win rates and rally statistics over the finished matches"""
+        finished = int(np.count_nonzero(self.done))
+        player_wins = int(np.count_nonzero(self.done & (self.player_score > self.ai_score)))
+        rallies = max(1, self.rallies)
+        return {
+            "matches": self.n,
+            "finished": finished,
+            "player_win_rate": player_wins / finished if finished else 0.0,
+            "ai_win_rate": (finished - player_wins) / finished if finished else 0.0,
+            "rallies": self.rallies,
+            "mean_rally_hits": self.rally_hit_total / rallies,
+            "mean_rally_ticks": self.rally_tick_total / rallies,
+            "max_rally_hits": self.max_rally,
+            "rally_hits_hist": self.rally_hist.copy(),
+            "mean_match_ticks": float(self.ticks[self.done].mean()) if finished else 0.0,
+        }
@@ -0,0 +1,257 @@
+import random
+import zlib
+
+# Playfield geometry and tuning, shared by every PS5Pong front end.
+# Speeds are in pixels per frame at the original 60 Hz tick.
+BASE_TICK_RATE = 60
+WIDTH = 900
+HEIGHT = 600
+PADDLE_WIDTH = 15
+PADDLE_HEIGHT = 120
+PADDLE_MARGIN = 50
+BALL_SIZE = 20
+BALL_SPEED = 5
+PADDLE_SPEED = 8
+AI_DIFFICULTY = 0.7  # AI skill level (0-1)
+AI_MAX_DIFFICULTY = 0.95
+AI_ERROR_RATE = 0.2
+AI_INTERCEPT_SPREAD = 300  # intercept AI aim error at difficulty 0, in px either way
+AI_MODES = ("track", "intercept", "versus")  # versus: P2 input bits drive the right paddle
+SPEEDUP = 1.05
+MAX_BALL_SPEED = 40  # horizontal cap; with swept collisions nothing else ends a rally
+SPIN = 0.2
+WIN_SCORE = 5
+MAX_BOUNCES = 8  # contacts resolved per tick before the rest of the move is dropped
+
+# Input bits passed to PongSim.step()
+P1_UP = 0x01
+P1_DOWN = 0x02
+P2_UP = 0x04
+P2_DOWN = 0x08
+
+
+def intercept_y(x, y, dx, dy, face_x, height=HEIGHT):
+    """Ball top y when it reaches face_x, with the path folded off the top and bottom walls
+
+    Works on floats and on NumPy arrays alike.
+    """
+    span = height - BALL_SIZE
+    raw = y + dy * (face_x - x) / dx
+    return span - abs(span - raw % (2 * span))
+
+
+class PongState:
+    """Authoritative match state; ball and paddles are stored by their top-left corner"""
+    __slots__ = ("ball_x", "ball_y", "ball_dx", "ball_dy",
+                 "player_y", "ai_y", "player_dy",
+                 "player_score", "ai_score", "ai_difficulty", "ai_target",
+                 "game_over", "tick")
+
+    def copy(self):
+        other = PongState.__new__(PongState)
+        for name in PongState.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def checksum(self):
+        """CRC32 over every field; repr() round-trips floats exactly"""
+        return zlib.crc32(repr(tuple(getattr(self, name) for name in PongState.__slots__)).encode())
+
+
+class PongSim:
+    """Headless Pong physics: paddles, ball, AI and scoring without any Tk canvas"""
+
+    def __init__(self, width=WIDTH, height=HEIGHT, win_score=WIN_SCORE, seed=None,
+                 tick_rate=BASE_TICK_RATE, ai_mode="track"):
+        if ai_mode not in AI_MODES:
+            raise ValueError(f"ai_mode must be one of {AI_MODES}, not {ai_mode!r}")
+        self.ai_mode = ai_mode
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.dt = BASE_TICK_RATE / tick_rate  # fraction of a 60 Hz frame per tick
+        self.win_score = win_score  # None plays forever
+        self.player_x = PADDLE_MARGIN
+        self.ai_x = width - PADDLE_MARGIN - PADDLE_WIDTH
+        self.state = PongState()
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new match: paddles centered, scores zeroed, a fresh RNG stream, then serve
+
+        All randomness in a match (serves, AI error) comes from one
+        random.Random seeded here, so seed plus per-tick inputs reproduce it.
+        """
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng = random.Random(self.seed)
+        s = self.state
+        s.player_y = s.ai_y = self.height // 2 - PADDLE_HEIGHT // 2
+        s.player_dy = 0
+        s.player_score = s.ai_score = 0
+        s.ai_difficulty = AI_DIFFICULTY
+        s.ai_target = self.height / 2 - BALL_SIZE / 2
+        s.game_over = False
+        s.tick = 0
+        self.serve()
+
+    def snapshot(self):
+        """Everything step() depends on, for restore() (rollback netcode)"""
+        return self.state.copy(), self.rng.getstate()
+
+    def restore(self, snapshot):
+        """Rewind to a snapshot() in place, so holders of self.state see the old match"""
+        state, rng_state = snapshot
+        for name in PongState.__slots__:
+            setattr(self.state, name, getattr(state, name))
+        self.rng.setstate(rng_state)
+
+    def serve(self):
+        """Center the ball and launch it in a random diagonal"""
+        s = self.state
+        s.ball_x = self.width // 2 - BALL_SIZE // 2
+        s.ball_y = self.height // 2 - BALL_SIZE // 2
+        s.ball_dx = BALL_SPEED * self.rng.choice([-1, 1])
+        s.ball_dy = BALL_SPEED * self.rng.choice([-1, 1])
+        if self.ai_mode == "intercept":
+            self.aim_ai()
+
+    def aim_ai(self):
+        """Intercept AI: solve where the ball meets the AI paddle, then miss by a difficulty-scaled error"""
+        s = self.state
+        if s.ball_dx > 0:
+            y = intercept_y(s.ball_x, s.ball_y, s.ball_dx, s.ball_dy, self.ai_x - BALL_SIZE, self.height)
+            s.ai_target = y + self.rng.uniform(-1, 1) * (1 - s.ai_difficulty) * AI_INTERCEPT_SPREAD
+        else:
+            # Ball heading away: wait in the middle
+            s.ai_target = self.height / 2 - BALL_SIZE / 2
+
+    def step(self, inputs=0):
+        """Advance one tick; returns a list of (event, x, y) for sounds and effects"""
+        s = self.state
+        if s.game_over:
+            return []
+        s.tick += 1
+        self.move_paddles(inputs)
+        return self.move_ball()
+
+    def move_paddles(self, inputs):
+        s = self.state
+        height = self.height
+        dt = self.dt
+
+        # Move player paddle
+        s.player_dy = PADDLE_SPEED * ((inputs & P1_DOWN != 0) - (inputs & P1_UP != 0))
+        dy = s.player_dy * dt
+        if s.player_y + dy > 0 and s.player_y + PADDLE_HEIGHT + dy < height:
+            s.player_y += dy
+
+        ai_center = s.ai_y + PADDLE_HEIGHT / 2
+        if self.ai_mode == "versus":
+            # Second player, usually a network peer
+            ai_dy = PADDLE_SPEED * ((inputs & P2_DOWN != 0) - (inputs & P2_UP != 0))
+        elif self.ai_mode == "intercept":
+            # Head for the precomputed target, arriving exactly
+            speed = PADDLE_SPEED * s.ai_difficulty
+            ai_dy = max(-speed, min(speed, (s.ai_target + BALL_SIZE / 2 - ai_center) / dt))
+        else:
+            # AI follows ball with some imperfection
+            ball_center = s.ball_y + BALL_SIZE / 2
+            if ball_center < ai_center - 10:
+                ai_dy = -PADDLE_SPEED * s.ai_difficulty
+            elif ball_center > ai_center + 10:
+                ai_dy = PADDLE_SPEED * s.ai_difficulty
+            else:
+                ai_dy = 0
+
+            # AI_ERROR_RATE is per 60 Hz frame: as many slips a second at any tick rate
+            if self.rng.random() < AI_ERROR_RATE * dt:
+                ai_dy *= self.rng.uniform(0.5, 1.5)
+        ai_dy *= dt
+
+        if s.ai_y + ai_dy > 0 and s.ai_y + PADDLE_HEIGHT + ai_dy < height:
+            s.ai_y += ai_dy
+
+    def move_ball(self):
+        """Sweep the ball through the tick, bouncing at each exact time of impact"""
+        s = self.state
+        events = []
+        remaining = self.dt
+        for _ in range(MAX_BOUNCES):
+            t, surface = self.time_of_impact(remaining)
+            s.ball_x += s.ball_dx * t
+            s.ball_y += s.ball_dy * t
+            remaining -= t
+            if surface is None:
+                break
+            cx, cy = s.ball_x + BALL_SIZE / 2, s.ball_y + BALL_SIZE / 2
+            if surface == "wall":
+                s.ball_dy = -s.ball_dy
+                events.append(("wall", cx, cy))
+            elif surface == "player":
+                s.ball_dx = min(abs(s.ball_dx) * SPEEDUP, MAX_BALL_SPEED)
+                # Add spin based on paddle movement
+                s.ball_dy += s.player_dy * SPIN
+                events.append(("paddle", cx, cy))
+            else:
+                s.ball_dx = -min(abs(s.ball_dx) * SPEEDUP, MAX_BALL_SPEED)
+                events.append(("paddle", cx, cy))
+            if surface != "wall" and self.ai_mode == "intercept":
+                self.aim_ai()
+
+        # Scoring
+        cx, cy = s.ball_x + BALL_SIZE / 2, s.ball_y + BALL_SIZE / 2
+        if s.ball_x <= 0:
+            s.ai_score += 1
+            self.score(events, cx, cy)
+        elif s.ball_x + BALL_SIZE >= self.width:
+            s.player_score += 1
+            self.score(events, cx, cy)
+        return events
+
+    def time_of_impact(self, limit):
+        """Earliest contact of the moving ball within limit ticks: (t, surface) or (limit, None)
+
+        Surfaces are the top/bottom walls and the inner face of each paddle.
+        A ball already touching a surface it is moving into collides at t=0,
+        and one moving away from it never does, so a bounce can't repeat
+        while the ball is still inside a paddle or past a wall.
+        """
+        s = self.state
+        x, y, vx, vy = s.ball_x, s.ball_y, s.ball_dx, s.ball_dy
+        best, surface = limit, None
+
+        # Top/bottom walls
+        if vy < 0:
+            t = max(0.0, -y / vy)
+        elif vy > 0:
+            t = max(0.0, (self.height - BALL_SIZE - y) / vy)
+        else:
+            t = limit + 1
+        if t <= best:
+            best, surface = t, "wall"
+
+        # Paddle faces, only while the ball hasn't passed the paddle
+        if vx < 0 and x + BALL_SIZE >= self.player_x:
+            t = max(0.0, (self.player_x + PADDLE_WIDTH - x) / vx)
+            y_at = y + vy * t
+            if t <= best and y_at + BALL_SIZE >= s.player_y and y_at <= s.player_y + PADDLE_HEIGHT:
+                best, surface = t, "player"
+        elif vx > 0 and x <= self.ai_x + PADDLE_WIDTH:
+            t = max(0.0, (self.ai_x - BALL_SIZE - x) / vx)
+            y_at = y + vy * t
+            if t <= best and y_at + BALL_SIZE >= s.ai_y and y_at <= s.ai_y + PADDLE_HEIGHT:
+                best, surface = t, "ai"
+        return best, surface
+
+    def score(self, events, cx, cy):
+        s = self.state
+        events.append(("score", cx, cy))
+        if self.win_score is not None and (s.player_score >= self.win_score or
+                                           s.ai_score >= self.win_score):
+            s.game_over = True
+            events.append(("game_over", cx, cy))
+            return
+        # Increase difficulty as score increases
+        s.ai_difficulty = min(AI_MAX_DIFFICULTY,
+                              AI_DIFFICULTY + (s.ai_score + s.player_score) * 0.02)
+        self.serve()
@@ -0,0 +1,88 @@
+def _fade_palette(color, background, steps):
+    """Hex colors stepping from color to background"""
+    c = [int(color[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(background[i:i + 2], 16) for i in (1, 3, 5)]
+    palette = []
+    for step in range(steps):
+        f = step / steps
+        palette.append("#%02x%02x%02x" % tuple(round(c[i] + (b[i] - c[i]) * f) for i in range(3)))
+    return palette
+
+
+class ImpactPool:
+    """Fixed pool of pre-created impact rings, recycled instead of created and deleted per hit
+
+    spawn() repositions the oldest ring and shows it; update(now), called
+    once per rendered frame, animates live rings and hides expired ones.
+    Nothing is allocated on the canvas or in Tk's timer queue per hit.
+    """
+
+    def __init__(self, canvas, size=16, lifetime=0.1, radius=15, color="#0072CE",
+                 background="#111111", animate=False, expand=15, fade_steps=6, tags=()):
+        self.canvas = canvas
+        self.lifetime = lifetime
+        self.radius = radius
+        self.animate = animate
+        self.expand = expand
+        self.palette = _fade_palette(color, background, fade_steps)
+        self.items = [
+            canvas.create_oval(0, 0, 0, 0, fill="", outline=color, width=3, dash=(5, 3),
+                               state="hidden", tags=tags)
+            for _ in range(size)
+        ]
+        self.x = [0.0] * size
+        self.y = [0.0] * size
+        self.born = [0.0] * size
+        self.shade = [0] * size  # palette index currently applied
+        self.live = [False] * size
+        self.live_count = 0
+        self.next = 0
+
+    def spawn(self, x, y, now):
+        """Show a ring at (x, y), reusing the oldest slot if all are busy"""
+        i = self.next
+        self.next = (i + 1) % len(self.items)
+        item = self.items[i]
+        r = self.radius
+        self.canvas.coords(item, x - r, y - r, x + r, y + r)
+        if self.shade[i]:
+            self.canvas.itemconfigure(item, outline=self.palette[0], state="normal")
+            self.shade[i] = 0
+        elif not self.live[i]:
+            self.canvas.itemconfigure(item, state="normal")
+        if not self.live[i]:
+            self.live[i] = True
+            self.live_count += 1
+        self.x[i] = x
+        self.y[i] = y
+        self.born[i] = now
+
+    def update(self, now):
+        """Advance live rings; cheap no-op when nothing is showing"""
+        if not self.live_count:
+            return
+        canvas = self.canvas
+        for i in range(len(self.items)):
+            if not self.live[i]:
+                continue
+            age = (now - self.born[i]) / self.lifetime
+            if age >= 1.0:
+                canvas.itemconfigure(self.items[i], state="hidden")
+                self.live[i] = False
+                self.live_count -= 1
+            elif self.animate:
+                r = self.radius + self.expand * age
+                x, y = self.x[i], self.y[i]
+                canvas.coords(self.items[i], x - r, y - r, x + r, y + r)
+                shade = int(age * len(self.palette))
+                if shade != self.shade[i]:
+                    canvas.itemconfigure(self.items[i], outline=self.palette[shade])
+                    self.shade[i] = shade
+
+    def clear(self):
+        """Hide every ring at once"""
+        for i, item in enumerate(self.items):
+            if self.live[i]:
+                self.canvas.itemconfigure(item, state="hidden")
+                self.live[i] = False
+        self.live_count = 0
@@ -0,0 +1,175 @@
+import multiprocessing
+import os
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pong_core import PongSim, P1_UP, P1_DOWN, WIN_SCORE, BASE_TICK_RATE, MAX_BALL_SPEED
+
+ACTIONS = (0, P1_UP, P1_DOWN)  # stay, up, down
+OBS_SIZE = 6  # ball x, y, dx, dy, own paddle y, AI paddle y; positions / court size, speeds / MAX_BALL_SPEED
+
+
+class PongEnv:
+    """Gym-style PongSim match: the agent plays the left paddle against the built-in AI
+
+    reset() returns an observation; step(action) returns (observation,
+    reward, done, info) with reward +1 for each point the agent scores and
+    -1 for each it concedes, and done at the end of a first-to-win_score
+    match. Each step advances frame_skip ticks with the same action.
+    """
+
+    def __init__(self, seed=None, ai_mode="track", win_score=WIN_SCORE, tick_rate=BASE_TICK_RATE,
+                 frame_skip=1):
+        self.seeds = random.Random(seed)  # one match seed per reset, reproducible from seed
+        self.sim = PongSim(win_score=win_score, seed=self.seeds.getrandbits(63), tick_rate=tick_rate,
+                           ai_mode=ai_mode)
+        self.frame_skip = frame_skip
+        self.action_count = len(ACTIONS)
+        self.observation_size = OBS_SIZE
+
+    def reset(self, seed=None):
+        self.sim.reset(seed if seed is not None else self.seeds.getrandbits(63))
+        return self.observe()
+
+    def observe(self, out=None):
+        """Write the observation into out (a float32 array of OBS_SIZE), or a new array"""
+        s = self.sim.state
+        if out is None:
+            out = np.empty(OBS_SIZE, np.float32)
+        width, height = self.sim.width, self.sim.height
+        out[:] = (s.ball_x / width, s.ball_y / height, s.ball_dx / MAX_BALL_SPEED,
+                  s.ball_dy / MAX_BALL_SPEED, s.player_y / height, s.ai_y / height)
+        return out
+
+    def advance(self, action):
+        """Play one step without building an observation: (reward, done)"""
+        s = self.sim.state
+        before = s.player_score - s.ai_score
+        if not 0 <= action < len(ACTIONS):
+            raise ValueError(f"action must be in range({len(ACTIONS)}), not {action}")
+        inputs = ACTIONS[action]
+        step = self.sim.step
+        for _ in range(self.frame_skip):
+            step(inputs)
+        return s.player_score - s.ai_score - before, s.game_over
+
+    def step(self, action):
+        reward, done = self.advance(action)
+        s = self.sim.state
+        return self.observe(), reward, done, {"player_score": s.player_score, "ai_score": s.ai_score}
+
+
+def _layout(n):
+    """Byte offsets of observations, rewards, dones and actions in the shared block, and its size"""
+    obs = 0
+    rewards = obs + n * OBS_SIZE * 4
+    dones = rewards + n * 4
+    actions = dones + n
+    return obs, rewards, dones, actions, actions + n
+
+
+def _views(buf, n):
+    obs, rewards, dones, actions, _ = _layout(n)
+    return (np.ndarray((n, OBS_SIZE), np.float32, buf, obs),
+            np.ndarray(n, np.float32, buf, rewards),
+            np.ndarray(n, np.bool_, buf, dones),
+            np.ndarray(n, np.uint8, buf, actions))
+
+
+def _worker(conn, name, n, lo, hi, seed, env_kwargs):
+    shm = shared_memory.SharedMemory(name=name)
+    observations, rewards, dones, actions = _views(shm.buf, n)
+    envs = [PongEnv(seed=seed + i, **env_kwargs) for i in range(lo, hi)]
+    try:
+        while True:
+            command = conn.recv()
+            if command == "step":
+                for i, env in enumerate(envs, lo):
+                    reward, done = env.advance(actions[i])
+                    rewards[i] = reward
+                    dones[i] = done
+                    if done:
+                        env.reset()  # auto-reset: the observation is the new match's first
+                    env.observe(observations[i])
+            elif command == "reset":
+                for i, env in enumerate(envs, lo):
+                    env.reset()
+                    env.observe(observations[i])
+            else:
+                break
+            conn.send(None)
+    finally:
+        del observations, rewards, dones, actions
+        shm.close()
+
+
+class VectorPongEnv:
+    """n PongEnvs sharded over worker processes that exchange data through shared memory
+
+    Each worker owns a contiguous slice of the environments and steps them
+    all on one message, so the pipe carries a few bytes per worker per step
+    while observations, rewards, dones and actions sit in one shared block.
+    Finished matches reset automatically. The arrays returned by reset()
+    and step() are views of that block, overwritten by the next call.
+    """
+
+    def __init__(self, n, workers=None, seed=0, context=None, **env_kwargs):
+        workers = max(1, min(n, workers or os.cpu_count() or 1))
+        self.n = n
+        self.shm = shared_memory.SharedMemory(create=True, size=_layout(n)[-1])
+        self.observations, self.rewards, self.dones, self.actions = _views(self.shm.buf, n)
+        ctx = multiprocessing.get_context(context)
+        self.conns = []
+        self.processes = []
+        bounds = np.linspace(0, n, workers + 1).astype(int)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(child, self.shm.name, n, lo, hi, seed, env_kwargs),
+                                  name=f"pong-env-{lo}", daemon=True)
+            process.start()
+            child.close()
+            self.conns.append(parent)
+            self.processes.append(process)
+
+    def _broadcast(self, command):
+        for conn in self.conns:
+            conn.send(command)
+        for conn in self.conns:
+            conn.recv()
+
+    def reset(self):
+        self._broadcast("reset")
+        return self.observations
+
+    def step(self, actions):
+        # Checked here: a bad action in a worker would kill it, leaving only an EOFError on its pipe
+        actions = np.asarray(actions)
+        bad = (actions < 0) | (actions >= len(ACTIONS))
+        if bad.any():
+            raise ValueError(f"actions must be in range({len(ACTIONS)}), not {actions[bad][0]}")
+        self.actions[:] = actions
+        self._broadcast("step")
+        return self.observations, self.rewards, self.dones, {}
+
+    def close(self):
+        if self.shm is None:
+            return
+        for conn in self.conns:
+            try:
+                conn.send("close")
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join()
+        del self.observations, self.rewards, self.dones, self.actions
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
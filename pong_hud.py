@@ -0,0 +1,79 @@
+from array import array
+
+
+class HudText:
+    """Canvas text item that only goes through Tk when its text actually changes"""
+
+    def __init__(self, canvas, x, y, text, **options):
+        self.canvas = canvas
+        self.text = text
+        self.item = canvas.create_text(x, y, text=text, **options)
+
+    def set(self, text):
+        if text != self.text:
+            self.text = text
+            self.canvas.itemconfig(self.item, text=text)
+
+
+class FrameTimes:
+    """Ring buffer of frame durations for rolling FPS figures"""
+
+    def __init__(self, size=240):
+        self.times = array("d", bytes(8 * size))
+        self.index = 0
+        self.count = 0
+
+    def add(self, seconds):
+        self.times[self.index] = seconds
+        self.index = (self.index + 1) % len(self.times)
+        if self.count < len(self.times):
+            self.count += 1
+
+    def average_fps(self):
+        if not self.count:
+            return 0.0
+        total = sum(self.times[:self.count])
+        return self.count / total if total > 0 else 0.0
+
+    def low_fps(self, fraction=0.01):
+        """FPS over the slowest fraction of frames (the "1% low")"""
+        if not self.count:
+            return 0.0
+        worst = sorted(self.times[:self.count], reverse=True)[:max(1, int(self.count * fraction))]
+        total = sum(worst)
+        return len(worst) / total if total > 0 else 0.0
+
+
+class Hud:
+    """Score and FPS readouts for the game canvas
+
+    frame(now) is cheap enough to call every frame: it only records the
+    frame time, and the FPS text is recomputed every refresh seconds.
+    """
+
+    def __init__(self, canvas, width, refresh=0.5, history=240, tags=()):
+        self.score = HudText(canvas, width // 2, 40, "0 : 0",
+                             fill="#aaa", font=("Arial", 24, "bold"), tags=tags)
+        self.fps = HudText(canvas, 80, 30, "FPS: 60",
+                           fill="#666", font=("Arial", 12), tags=tags)
+        self.refresh = refresh
+        self.frames = FrameTimes(history)
+        self.last_frame = None
+        self.next_refresh = 0.0
+
+    def set_score(self, player_score, ai_score):
+        self.score.set(f"{player_score} : {ai_score}")
+
+    def frame(self, now):
+        if self.last_frame is not None:
+            self.frames.add(now - self.last_frame)
+        self.last_frame = now
+        if now >= self.next_refresh:
+            self.next_refresh = now + self.refresh
+            if self.frames.count:
+                self.fps.set(f"FPS: {self.frames.average_fps():.0f}  "
+                             f"1% low: {self.frames.low_fps():.0f}")
+
+    def reset_clock(self):
+        """Forget the last frame time, e.g. after the loop was suspended"""
+        self.last_frame = None
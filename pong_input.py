@@ -0,0 +1,85 @@
+import time
+
+from pong_core import P1_UP, P1_DOWN, P2_UP, P2_DOWN
+
+# Tk keysym -> PongSim input bit
+DEFAULT_BINDINGS = {
+    "w": P1_UP,
+    "s": P1_DOWN,
+    "Up": P2_UP,
+    "Down": P2_DOWN,
+}
+
+# Holding both directions moves toward whichever key went down last
+OPPOSITE = {P1_UP: P1_DOWN, P1_DOWN: P1_UP, P2_UP: P2_DOWN, P2_DOWN: P2_UP}
+
+
+class KeyState:
+    """Held keys of a Tk window, sampled once per physics tick
+
+    The KeyPress/KeyRelease handlers only update the held set; nothing in
+    the game runs from inside them. X11 auto-repeat delivers a release and
+    press pair for a held key, so a release is only applied when sample()
+    runs and no press of the same key has come in since: the pair folds
+    into one continuous hold. Losing focus releases everything, since the
+    release events would go to another window.
+    """
+
+    def __init__(self, root, bindings=None, clock=time.perf_counter):
+        bindings = DEFAULT_BINDINGS if bindings is None else bindings
+        self.bindings = {self.normalize(k): bits for k, bits in bindings.items()}
+        self.clock = clock
+        self.held = {}  # keysym -> press order, for most-recent-wins
+        self.released = set()  # releases not yet applied, cancelled by a repeat press
+        self.presses = 0
+        self.sampled = 0  # self.presses at the last sample()
+        self.pressed_at = None  # clock() of the last press of a key that wasn't held
+        for keysym in self.bindings:
+            for name in {keysym, keysym.lower(), keysym.upper()} if len(keysym) == 1 else {keysym}:
+                root.bind(f"<KeyPress-{name}>", self.press, add="+")
+                root.bind(f"<KeyRelease-{name}>", self.release, add="+")
+        root.bind("<FocusOut>", self.clear, add="+")
+
+    @staticmethod
+    def normalize(keysym):
+        # Letters arrive upper case with Shift or Caps Lock
+        return keysym.lower() if len(keysym) == 1 else keysym
+
+    def press(self, event):
+        key = self.normalize(event.keysym)
+        if key in self.released:
+            self.released.discard(key)  # auto-repeat: still held
+            return
+        if key not in self.held:
+            self.presses += 1
+            self.held[key] = self.presses
+            self.pressed_at = self.clock()
+
+    def release(self, event):
+        key = self.normalize(event.keysym)
+        if key in self.held:
+            self.released.add(key)
+
+    def clear(self, event=None):
+        self.held.clear()
+        self.released.clear()
+
+    def sample(self, mask=0xFF):
+        """Input bits for this tick from the keys held, limited to mask
+
+        A key pressed and released since the last sample still counts for
+        this one tick, so a quick tap isn't lost.
+        """
+        held = self.held
+        bits = 0
+        for key in sorted(held, key=held.get):
+            if key in self.released and held[key] <= self.sampled:
+                continue
+            bit = self.bindings[key] & mask
+            if bit:
+                bits = bits & ~OPPOSITE.get(bit, 0) | bit
+        for key in self.released:
+            del held[key]
+        self.released.clear()
+        self.sampled = self.presses
+        return bits
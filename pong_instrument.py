@@ -0,0 +1,136 @@
+import json
+import time
+from array import array
+
+
+class Ring:
+    """Fixed-size ring of (start, duration) samples in seconds"""
+
+    def __init__(self, size=4096):
+        self.starts = array("d", bytes(8 * size))
+        self.values = array("d", bytes(8 * size))
+        self.index = 0
+        self.count = 0
+
+    def add(self, start, value):
+        i = self.index
+        self.starts[i] = start
+        self.values[i] = value
+        self.index = (i + 1) % len(self.values)
+        if self.count < len(self.values):
+            self.count += 1
+
+    def samples(self):
+        """(start, value) pairs, oldest first"""
+        n = len(self.values)
+        first = (self.index - self.count) % n
+        return [(self.starts[(first + k) % n], self.values[(first + k) % n]) for k in range(self.count)]
+
+    def percentiles(self, points=(50, 90, 99)):
+        values = sorted(self.values[:self.count])
+        if not values:
+            return {}
+        result = {f"p{p}_ms": values[min(len(values) - 1, int(len(values) * p / 100))] * 1000
+                  for p in points}
+        result["max_ms"] = values[-1] * 1000
+        result["count"] = len(values)
+        return result
+
+
+class Profiler:
+    """Per-phase frame timing and input-to-display latency for PS5Pong
+
+    Nothing here runs unless attach() is called: it swaps timed wrappers in
+    as instance attributes, so a game without a profiler executes exactly
+    the uninstrumented methods.
+    """
+
+    def __init__(self, size=4096, clock=time.perf_counter):
+        self.size = size
+        self.clock = clock
+        self.rings = {}
+        self.pending_press = None  # key press not yet seen to move the paddle
+        self.awaiting_frame = []   # presses whose movement is not yet on screen
+
+    def ring(self, name):
+        ring = self.rings.get(name)
+        if ring is None:
+            ring = self.rings[name] = Ring(self.size)
+        return ring
+
+    def timed(self, name, fn):
+        """Wrap fn so each call is recorded under name"""
+        ring = self.ring(name)
+        clock = self.clock
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                ring.add(start, clock() - start)
+        return wrapper
+
+    def attach(self, game):
+        """Instrument a started PS5Pong game"""
+        clock = self.clock
+        sim = game.sim
+        state = sim.state
+        game.hud.frame = self.timed("hud", game.hud.frame)
+        game.effects.update = self.timed("effects", game.effects.update)
+        game.render = self.timed("render", game.render)
+        move_paddles = self.timed("move_paddles", sim.move_paddles)
+        sim.move_ball = self.timed("move_ball", sim.move_ball)
+        redraw = self.timed("tk_redraw", game.root.update_idletasks)
+        to_move = self.ring("input_to_move")
+        to_frame = self.ring("input_to_frame")
+        idle = self.ring("tk_idle")
+        keys = game.keys
+        draw = game.draw
+        last_frame_end = [None]
+        seen_press = [keys.pressed_at]
+
+        def paddles(inputs):
+            # KeyState stamps each new press (auto-repeat is already folded out)
+            if keys.pressed_at != seen_press[0]:
+                seen_press[0] = keys.pressed_at
+                if self.pending_press is None:
+                    self.pending_press = keys.pressed_at
+            before = state.player_y
+            move_paddles(inputs)
+            if self.pending_press is not None and state.player_y != before:
+                now = clock()
+                to_move.add(self.pending_press, now - self.pending_press)
+                self.awaiting_frame.append(self.pending_press)
+                self.pending_press = None
+
+        def profiled_draw(alpha):
+            start = clock()
+            if last_frame_end[0] is not None:
+                idle.add(last_frame_end[0], start - last_frame_end[0])
+            draw(alpha)
+            redraw()
+            end = clock()
+            for press in self.awaiting_frame:
+                to_frame.add(press, end - press)
+            self.awaiting_frame.clear()
+            last_frame_end[0] = end
+
+        sim.move_paddles = paddles
+        game.draw = game.loop.render = self.timed("frame", profiled_draw)
+
+    def summary(self):
+        """{ring name: percentile dict} for every ring with samples"""
+        return {name: ring.percentiles() for name, ring in sorted(self.rings.items()) if ring.count}
+
+    def export_trace(self, path):
+        """Write every sample as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        events = []
+        for name, ring in self.rings.items():
+            tid = 2 if name.startswith("input_") else 1
+            for start, duration in ring.samples():
+                events.append({"name": name, "ph": "X", "pid": 1, "tid": tid,
+                               "ts": start * 1e6, "dur": duration * 1e6})
+        events.sort(key=lambda e: e["ts"])
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,145 @@
+import time
+from array import array
+
+TICK_RATES = (60, 120, 240)
+
+
+class FixedStepLoop:
+    """Fixed-timestep game loop on top of Tk's after() timer
+
+    Physics runs in whole ticks of 1/tick_rate seconds taken from an
+    accumulator filled with perf_counter() time, so game speed no longer
+    depends on how late Tk fires the timer. render(alpha) gets the fraction
+    of a tick left over for interpolating between the last two states.
+    """
+
+    def __init__(self, root, tick_rate, update, render, render_rate=60, max_steps=8,
+                 history=256):
+        if tick_rate not in TICK_RATES:
+            raise ValueError(f"tick_rate must be one of {TICK_RATES}, not {tick_rate}")
+        self.root = root
+        self.tick_rate = tick_rate
+        self.step_dt = 1.0 / tick_rate
+        self.frame_dt = 1.0 / render_rate
+        self.update = update
+        self.render = render
+        self.max_steps = max_steps  # catch-up cap per frame
+        self.running = False
+        self.after_id = None
+
+        # Frame-pacing ring buffer (seconds between rendered frames)
+        self.intervals = array("d", bytes(8 * history))
+        self.interval_index = 0
+        self.interval_count = 0
+        self.ticks = 0
+        self.frames = 0
+        self.dropped_time = 0.0
+        self.idle_time = 0.0
+        self.suspended_at = None
+        self.measure_interval = False  # no frame interval to record before the first frame
+
+    def start(self):
+        now = time.perf_counter()
+        self.running = True
+        self.accumulator = 0.0
+        self.last_time = now
+        self.start_time = now
+        self.next_frame = now
+        self.ticks = 0
+        self.frames = 0
+        self.dropped_time = 0.0
+        self.idle_time = 0.0
+        self.suspended_at = None
+        self.interval_index = 0
+        self.interval_count = 0
+        self.measure_interval = False
+        self.frame()
+
+    def stop(self):
+        self.running = False
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def suspend(self):
+        """Stop ticking and rendering until resume(); a static screen then costs no CPU"""
+        if self.running:
+            self.stop()
+            self.suspended_at = time.perf_counter()
+
+    def resume(self):
+        """Carry on after suspend() without treating the idle time as a backlog to catch up"""
+        if self.running or self.suspended_at is None:
+            return
+        now = time.perf_counter()
+        self.idle_time += now - self.suspended_at
+        self.suspended_at = None
+        self.running = True
+        self.accumulator = 0.0
+        self.last_time = now
+        self.next_frame = now
+        self.measure_interval = False
+        self.after_id = self.root.after_idle(self.frame)
+
+    def frame(self):
+        self.after_id = None
+        if not self.running:
+            return
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        self.last_time = now
+        self.accumulator += elapsed
+        if self.measure_interval:
+            self.intervals[self.interval_index] = elapsed
+            self.interval_index = (self.interval_index + 1) % len(self.intervals)
+            self.interval_count = min(self.interval_count + 1, len(self.intervals))
+        self.measure_interval = True
+
+        steps = 0
+        while self.accumulator >= self.step_dt and steps < self.max_steps and self.running:
+            self.update()
+            self.accumulator -= self.step_dt
+            steps += 1
+        self.ticks += steps
+        if self.accumulator >= self.step_dt:
+            # Too far behind (stall, debugger, suspended window): drop the
+            # backlog instead of spiralling into ever longer catch-up frames;
+            # the fraction of a tick left over is kept for interpolation
+            kept = self.accumulator % self.step_dt
+            self.dropped_time += self.accumulator - kept
+            self.accumulator = kept
+
+        self.render(self.accumulator / self.step_dt)
+        self.frames += 1
+        if not self.running:
+            return
+
+        # Pace frames against an absolute schedule so rounding doesn't drift
+        self.next_frame += self.frame_dt
+        now = time.perf_counter()
+        if self.next_frame < now - self.frame_dt:
+            self.next_frame = now
+        delay = max(1, int((self.next_frame - now) * 1000))
+        self.after_id = self.root.after(delay, self.frame)
+
+    def pacing(self):
+        """Frame-interval statistics in milliseconds plus the achieved tick rate"""
+        count = self.interval_count
+        if not count:
+            return {"frames": self.frames, "ticks": self.ticks}
+        samples = sorted(self.intervals[:count])
+        wall = time.perf_counter() - self.start_time - self.idle_time
+        if self.suspended_at is not None:
+            wall -= time.perf_counter() - self.suspended_at
+        mean = sum(samples) / count
+        jitter = (sum((s - mean) ** 2 for s in samples) / count) ** 0.5
+        return {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "mean_ms": mean * 1000,
+            "jitter_ms": jitter * 1000,
+            "p99_ms": samples[min(count - 1, int(count * 0.99))] * 1000,
+            "max_ms": samples[-1] * 1000,
+            "tick_rate": (self.ticks / (wall - self.dropped_time)) if wall > self.dropped_time else 0.0,
+            "dropped_ms": self.dropped_time * 1000,
+        }
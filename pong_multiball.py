@@ -0,0 +1,198 @@
+import numpy as np
+
+from pong_core import (PongState, WIDTH, HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT, PADDLE_MARGIN,
+                       BALL_SIZE, BALL_SPEED, PADDLE_SPEED, AI_DIFFICULTY, SPEEDUP, SPIN,
+                       MAX_BALL_SPEED, BASE_TICK_RATE, P1_UP, P1_DOWN)
+
+MIN_BALL_DX = BALL_SPEED / 2  # keeps balls from settling into vertical bounces after collisions
+
+
+class MultiBallSim:
+    """Pong with n balls at once, for stress tests: packed NumPy arrays and a uniform-grid broad phase
+
+    Ball positions and velocities live in four float arrays; walls,
+    paddles and scoring are vectorized over them. Ball-ball contacts are
+    found by bucketing balls into BALL_SIZE cells, sorting by cell and
+    pairing each ball only with balls in its own and four neighbouring
+    cells, so the cost grows with n rather than n squared
+    (broad_phase="brute" checks every pair, for comparison). A ball that
+    leaves the court scores and is re-served from the center line, so
+    the count stays constant and the match never ends.
+
+    step() has PongSim's signature and returns "paddle" and "score"
+    events; wall bounces are too numerous to report.
+    """
+
+    def __init__(self, n, width=WIDTH, height=HEIGHT, seed=None, tick_rate=BASE_TICK_RATE,
+                 broad_phase="grid"):
+        if broad_phase not in ("grid", "brute"):
+            raise ValueError(f"broad_phase must be 'grid' or 'brute', not {broad_phase!r}")
+        self.n = n
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.dt = BASE_TICK_RATE / tick_rate
+        self.broad_phase = broad_phase
+        self.ai_mode = "track"  # the right paddle is always the AI
+        self.player_x = PADDLE_MARGIN
+        self.ai_x = width - PADDLE_MARGIN - PADDLE_WIDTH
+        self.cols = width // BALL_SIZE + 3  # one empty column either side, so neighbours never wrap
+        self.rows = height // BALL_SIZE + 3
+        self.rng = np.random.default_rng(seed)
+        self.x = np.empty(n)
+        self.y = np.empty(n)
+        self.dx = np.empty(n)
+        self.dy = np.empty(n)
+        self.collisions = 0  # ball-ball contacts resolved in the last tick
+        self.state = PongState()
+        self.reset()
+
+    def reset(self):
+        s = self.state
+        s.ball_x = s.ball_y = s.ball_dx = s.ball_dy = 0.0  # per-ball state is in the arrays
+        s.player_y = s.ai_y = self.height // 2 - PADDLE_HEIGHT // 2
+        s.player_dy = 0
+        s.player_score = s.ai_score = 0
+        s.ai_difficulty = AI_DIFFICULTY
+        s.ai_target = self.height / 2 - BALL_SIZE / 2
+        s.game_over = False
+        s.tick = 0
+        # Scatter the balls over the middle of the court
+        self.x[:] = self.rng.uniform(self.width * 0.25, self.width * 0.75 - BALL_SIZE, self.n)
+        self.y[:] = self.rng.uniform(0, self.height - BALL_SIZE, self.n)
+        self.serve(np.arange(self.n))
+
+    def serve(self, index):
+        """Launch the given balls in random diagonals at 0.5-1.5x the normal speed"""
+        count = len(index)
+        self.dx[index] = BALL_SPEED * self.rng.choice((-1.0, 1.0), count) * self.rng.uniform(0.5, 1.5, count)
+        self.dy[index] = BALL_SPEED * self.rng.choice((-1.0, 1.0), count) * self.rng.uniform(0.5, 1.5, count)
+
+    def step(self, inputs=0):
+        s = self.state
+        s.tick += 1
+        dt = self.dt
+        height = self.height
+        x, y, dx, dy = self.x, self.y, self.dx, self.dy
+
+        # Player paddle, as in PongSim
+        s.player_dy = PADDLE_SPEED * ((inputs & P1_DOWN != 0) - (inputs & P1_UP != 0))
+        move = s.player_dy * dt
+        if s.player_y + move > 0 and s.player_y + PADDLE_HEIGHT + move < height:
+            s.player_y += move
+
+        # AI paddle follows the incoming ball nearest to it
+        incoming = np.flatnonzero(dx > 0)
+        if len(incoming):
+            target = y[incoming[np.argmax(x[incoming])]] + BALL_SIZE / 2
+            center = s.ai_y + PADDLE_HEIGHT / 2
+            speed = PADDLE_SPEED * s.ai_difficulty
+            move = max(-speed, min(speed, target - center)) * dt
+            if s.ai_y + move > 0 and s.ai_y + PADDLE_HEIGHT + move < height:
+                s.ai_y += move
+
+        x0 = x.copy()
+        x += dx * dt
+        y += dy * dt
+
+        # Walls: reflect the overshoot
+        top = y < 0
+        y[top] = -y[top]
+        dy[top] = np.abs(dy[top])
+        floor = height - BALL_SIZE
+        bottom = y > floor
+        y[bottom] = 2 * floor - y[bottom]
+        dy[bottom] = -np.abs(dy[bottom])
+
+        events = []
+        # Paddles: balls whose leading edge crossed a paddle face this tick
+        face = self.player_x + PADDLE_WIDTH
+        hit = np.flatnonzero((dx < 0) & (x0 >= face) & (x < face) &
+                             (y + BALL_SIZE >= s.player_y) & (y <= s.player_y + PADDLE_HEIGHT))
+        if len(hit):
+            x[hit] = 2 * face - x[hit]
+            dx[hit] = np.minimum(np.abs(dx[hit]) * SPEEDUP, MAX_BALL_SPEED)
+            dy[hit] += s.player_dy * SPIN
+            events += [("paddle", cx, cy) for cx, cy in zip(x[hit] + BALL_SIZE / 2, y[hit] + BALL_SIZE / 2)]
+        face = self.ai_x - BALL_SIZE
+        hit = np.flatnonzero((dx > 0) & (x0 <= face) & (x > face) &
+                             (y + BALL_SIZE >= s.ai_y) & (y <= s.ai_y + PADDLE_HEIGHT))
+        if len(hit):
+            x[hit] = 2 * face - x[hit]
+            dx[hit] = -np.minimum(np.abs(dx[hit]) * SPEEDUP, MAX_BALL_SPEED)
+            events += [("paddle", cx, cy) for cx, cy in zip(x[hit] + BALL_SIZE / 2, y[hit] + BALL_SIZE / 2)]
+
+        self.collide()
+
+        # Scoring: balls out either side are re-served from the center line
+        left = x <= 0
+        right = x + BALL_SIZE >= self.width
+        out = np.flatnonzero(left | right)
+        if len(out):
+            s.ai_score += int(np.count_nonzero(left))
+            s.player_score += int(np.count_nonzero(right))
+            events += [("score", cx, cy) for cx, cy in zip(x[out] + BALL_SIZE / 2, y[out] + BALL_SIZE / 2)]
+            x[out] = self.width // 2 - BALL_SIZE // 2
+            y[out] = self.rng.uniform(0, self.height - BALL_SIZE, len(out))
+            self.serve(out)
+        return events
+
+    def candidate_pairs(self):
+        """Index arrays (i, j), i != j, of every pair of balls close enough to possibly touch"""
+        n = self.n
+        if self.broad_phase == "brute":
+            return np.triu_indices(n, 1)
+        cols = self.cols
+        cx = np.clip((self.x // BALL_SIZE).astype(np.int64) + 1, 1, cols - 2)
+        cy = np.clip((self.y // BALL_SIZE).astype(np.int64) + 1, 1, self.rows - 2)
+        key = cy * cols + cx
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        rank = np.arange(n)
+        first, second = [], []
+        # Own cell (later balls only), then right, and the three cells below
+        for offset in (0, 1, cols - 1, cols, cols + 1):
+            hi = np.searchsorted(key, key + offset, "right")
+            lo = rank + 1 if offset == 0 else np.searchsorted(key, key + offset, "left")
+            counts = hi - lo
+            total = int(counts.sum())
+            if not total:
+                continue
+            starts = np.cumsum(counts) - counts
+            first.append(np.repeat(rank, counts))
+            second.append(np.repeat(lo - starts, counts) + np.arange(total))
+        if not first:
+            return rank[:0], rank[:0]
+        return order[np.concatenate(first)], order[np.concatenate(second)]
+
+    def collide(self):
+        """Elastic equal-mass bounces for touching balls, which are then pushed apart"""
+        i, j = self.candidate_pairs()
+        x, y, dx, dy = self.x, self.y, self.dx, self.dy
+        ddx = x[j] - x[i]
+        ddy = y[j] - y[i]
+        d2 = ddx * ddx + ddy * ddy
+        touching = np.flatnonzero((d2 < BALL_SIZE * BALL_SIZE) & (d2 > 0))
+        if not len(touching):
+            self.collisions = 0
+            return
+        i, j = i[touching], j[touching]
+        ddx, ddy, d2 = ddx[touching], ddy[touching], d2[touching]
+        approach = ddx * (dx[j] - dx[i]) + ddy * (dy[j] - dy[i])
+        n = self.n
+        # Separate the overlap, half to each ball, so contacts don't persist into the next tick
+        d = np.sqrt(d2)
+        push = (BALL_SIZE - d) / (2 * d)
+        px = push * ddx
+        py = push * ddy
+        x += np.bincount(j, px, n) - np.bincount(i, px, n)
+        y += np.bincount(j, py, n) - np.bincount(i, py, n)
+        # Exchange the velocity components along the line of centers, for pairs moving together
+        k = np.minimum(approach, 0) / d2
+        self.collisions = int(np.count_nonzero(approach < 0))
+        ix = k * ddx
+        iy = k * ddy
+        dx += np.bincount(i, ix, n) - np.bincount(j, ix, n)
+        dy += np.bincount(i, iy, n) - np.bincount(j, iy, n)
+        np.copyto(dx, np.copysign(np.clip(np.abs(dx), MIN_BALL_DX, MAX_BALL_SPEED), dx))
+        np.clip(dy, -MAX_BALL_SPEED, MAX_BALL_SPEED, out=dy)
@@ -0,0 +1,229 @@
+import socket
+import struct
+
+from pong_core import PongSim, BASE_TICK_RATE, WIN_SCORE
+from pong_replay import Recording
+
+# kind, remote frames received so far (the ack), first frame carried, input count;
+# then the inputs two to a byte, low nibble first
+PACKET = struct.Struct("<BIIB")
+INPUTS = 1
+MAX_INPUTS = 120  # per packet; unacknowledged inputs beyond this go in the next one
+SIDES = ("left", "right")
+
+
+def encode_packet(received, start, inputs):
+    out = bytearray(PACKET.pack(INPUTS, received, start, len(inputs)))
+    for i in range(0, len(inputs) - 1, 2):
+        out.append(inputs[i] | inputs[i + 1] << 4)
+    if len(inputs) % 2:
+        out.append(inputs[-1])
+    return bytes(out)
+
+
+def decode_packet(data):
+    """(received, start, inputs) from a packet, or None if it isn't one"""
+    if len(data) < PACKET.size:
+        return None
+    kind, received, start, count = PACKET.unpack_from(data)
+    body = data[PACKET.size:]
+    if kind != INPUTS or len(body) != (count + 1) // 2:
+        return None
+    inputs = bytearray()
+    for byte in body:
+        inputs.append(byte & 0x0F)
+        inputs.append(byte >> 4)
+    del inputs[count:]
+    return received, start, inputs
+
+
+class RollbackSession:
+    """Input delay plus rollback for a two-player PongSim in "versus" mode
+
+    Local input sampled on frame f is played on frame f + input_delay. The
+    remote input is predicted as a repeat of the last one received; when a
+    late input turns out different, the sim is restored to its snapshot
+    before that frame and re-simulated up to the present. The session
+    stalls rather than run more than max_rollback frames past the last
+    confirmed remote input.
+
+    Inputs are side-agnostic 2-bit values (P1_UP/P1_DOWN); the session
+    places them in the P1 or P2 bits according to side. Frames that both
+    peers have confirmed are appended to self.recording, so a networked
+    match can be replayed and checked like a local one.
+    """
+
+    def __init__(self, sim, side, input_delay=2, max_rollback=8, checksum_interval=60):
+        if sim.ai_mode != "versus":
+            raise ValueError("RollbackSession needs a PongSim with ai_mode='versus'")
+        if side not in SIDES:
+            raise ValueError(f"side must be one of {SIDES}, not {side!r}")
+        self.sim = sim
+        self.side = side
+        self.local_shift, self.remote_shift = (0, 2) if side == "left" else (2, 0)
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.frame = 0  # next frame to simulate
+        self.local = bytearray(input_delay)  # the first frames play with no input
+        self.remote = bytearray()  # confirmed remote inputs, frames 0..len-1
+        self.used = bytearray()  # remote input each simulated frame actually ran with
+        self.snapshots = {}  # frame -> sim.snapshot() taken just before it
+        self.rollback_to = None
+        self.peer_received = 0  # local frames the peer has confirmed
+        self.final = 0  # frames confirmed on both sides and recorded
+        self.recording = Recording(sim.seed, sim.tick_rate, sim.win_score, sim.ai_mode,
+                                   checksum_interval)
+        self.stalls = 0
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.max_depth = 0
+
+    def add_local_input(self, inputs):
+        """Schedule this frame's local input; ignored while stalled with the slot already filled"""
+        if len(self.local) <= self.frame + self.input_delay:
+            self.local.append(inputs & 0x03)
+
+    def outgoing(self):
+        """Packet with every local input the peer hasn't acknowledged yet"""
+        start = self.peer_received
+        return encode_packet(len(self.remote), start, self.local[start:start + MAX_INPUTS])
+
+    def receive(self, received, start, inputs):
+        self.peer_received = max(self.peer_received, min(received, len(self.local)))
+        remote = self.remote
+        if start > len(remote):
+            return  # can't be applied until the frames before it arrive
+        for value in inputs[len(remote) - start:]:
+            f = len(remote)
+            remote.append(value)
+            if f < self.frame and self.used[f] != value:
+                if self.rollback_to is None or f < self.rollback_to:
+                    self.rollback_to = f
+
+    def advance(self):
+        """Simulate the next frame; returns its events, or None when stalled waiting for the peer"""
+        if self.frame - len(self.remote) >= self.max_rollback:
+            self.stalls += 1
+            return None
+        if len(self.local) <= self.frame:
+            self.local.append(0)
+        if self.rollback_to is not None:
+            self.rollback()
+        events = self.simulate(self.frame)
+        self.frame += 1
+        self.finalize()
+        return events
+
+    def rollback(self):
+        first = self.rollback_to
+        self.rollback_to = None
+        self.sim.restore(self.snapshots[first])
+        for f in range(first, self.frame):
+            self.simulate(f)
+        depth = self.frame - first
+        self.rollbacks += 1
+        self.resimulated += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def simulate(self, f):
+        self.snapshots[f] = self.sim.snapshot()
+        if f < len(self.remote):
+            remote = self.remote[f]
+        else:
+            remote = self.remote[-1] if self.remote else 0
+        if f < len(self.used):
+            self.used[f] = remote
+        else:
+            self.used.append(remote)
+        return self.sim.step(self.local[f] << self.local_shift | remote << self.remote_shift)
+
+    def finalize(self):
+        """Record frames both peers have confirmed, correcting any misprediction first"""
+        if self.rollback_to is not None:
+            self.rollback()
+        rec = self.recording
+        end = min(len(self.remote), self.frame)
+        while self.final < end:
+            f = self.final
+            self.final += 1
+            rec.add(self.local[f] << self.local_shift | self.remote[f] << self.remote_shift)
+            if rec.ticks % rec.checksum_interval == 0:
+                state = self.snapshots[f + 1][0] if f + 1 < self.frame else self.sim.state
+                rec.checksums.append(state.checksum())
+            del self.snapshots[f]
+
+    def finish(self):
+        """Checksum the last confirmed frame into the recording; call once the match is over, before saving"""
+        self.finalize()
+        state = self.snapshots[self.final][0] if self.final < self.frame else self.sim.state
+        self.recording.finish(state)
+
+    def stats(self):
+        return {"frame": self.frame, "confirmed": self.final, "stalls": self.stalls,
+                "rollbacks": self.rollbacks, "resimulated": self.resimulated,
+                "max_depth": self.max_depth}
+
+
+class UdpPeer:
+    """Runs a RollbackSession over a non-blocking UDP socket
+
+    Every tick sends all unacknowledged local inputs, so a lost packet is
+    covered by the next one and nothing is ever retransmitted on a timer.
+    """
+
+    def __init__(self, session, local_addr, peer_addr, sock=None):
+        self.session = session
+        self.peer_addr = peer_addr
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(local_addr)
+            sock.setblocking(False)
+        self.sock = sock
+        self.packets_sent = self.packets_received = self.bytes_sent = 0
+
+    def poll(self):
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionRefusedError:  # an earlier send found no peer yet
+                continue
+            packet = decode_packet(data)
+            if packet is not None:
+                self.packets_received += 1
+                self.session.receive(*packet)
+
+    def send(self):
+        data = self.session.outgoing()
+        try:
+            self.sock.sendto(data, self.peer_addr)
+        except OSError:
+            return  # dropped like any other lost datagram
+        self.packets_sent += 1
+        self.bytes_sent += len(data)
+
+    def tick(self, inputs):
+        """One network frame: read packets, send local input, advance (None when stalled)"""
+        self.poll()
+        self.session.add_local_input(inputs)
+        self.send()
+        return self.session.advance()
+
+    def close(self):
+        self.sock.close()
+
+
+def parse_net(spec):
+    """Parse "left:9000:peer-host:9001[:seed]" into (side, local_addr, peer_addr, seed)"""
+    side, port, host, peer_port, *rest = spec.split(":")
+    if side not in SIDES:
+        raise ValueError(f"side must be one of {SIDES}, not {side!r}")
+    return side, ("0.0.0.0", int(port)), (host, int(peer_port)), int(rest[0]) if rest else 0
+
+
+def connect(spec, tick_rate=BASE_TICK_RATE, win_score=WIN_SCORE, input_delay=2):
+    """A UdpPeer for a versus match described by a parse_net() spec"""
+    side, local_addr, peer_addr, seed = parse_net(spec)
+    sim = PongSim(win_score=win_score, seed=seed, tick_rate=tick_rate, ai_mode="versus")
+    return UdpPeer(RollbackSession(sim, side, input_delay), local_addr, peer_addr)
@@ -0,0 +1,332 @@
+import time
+
+import numpy as np
+import pygame
+
+from pong_core import (PongSim, P1_UP, P1_DOWN, P2_UP, P2_DOWN, PADDLE_WIDTH, PADDLE_HEIGHT,
+                       BALL_SIZE, WIN_SCORE, MAX_BALL_SPEED)
+from pong_hud import FrameTimes
+from pong_multiball import MultiBallSim
+from pong_replay import MatchRecorder
+from pong_sound import SoundBank
+
+BACKGROUND = (17, 17, 17)
+CENTER_LINE = (51, 51, 51)
+BLUE = (0, 114, 206)  # PS5 blue
+GRAY = (93, 93, 93)  # PS5 gray
+ORANGE = (255, 155, 26)  # PS5 orange
+
+SOUNDS = {
+    "paddle": (440, 0.1),
+    "wall": (330, 0.1),
+    "score": (880, 0.3),
+    "start": (523.25, 0.5),
+    "game_over": (220, 1.0)
+}
+
+
+class Text:
+    """Text surface that is only re-rendered when its string changes"""
+
+    def __init__(self, font, color, text=""):
+        self.font = font
+        self.color = color
+        self.text = None
+        self.set(text)
+
+    def set(self, text):
+        if text != self.text:
+            self.text = text
+            self.surface = self.font.render(text, True, self.color)
+
+    def centered(self, x, y):
+        """(surface, topleft) with the text centered on (x, y)"""
+        return self.surface, self.surface.get_rect(center=(x, y))
+
+
+class Rings:
+    """Impact rings like pong_effects.ImpactPool: a fixed pool, every animation frame pre-rendered"""
+
+    def __init__(self, size=16, lifetime=0.1, radius=15, expand=15, steps=6, color=BLUE,
+                 background=BACKGROUND):
+        self.lifetime = lifetime
+        self.steps = steps
+        self.frames = []
+        for step in range(steps):
+            f = step / steps
+            r = round(radius + expand * f)
+            shade = tuple(round(c + (b - c) * f) for c, b in zip(color, background))
+            surface = pygame.Surface((2 * r + 1, 2 * r + 1), pygame.SRCALPHA)
+            pygame.draw.circle(surface, shade, (r, r), r, 3)
+            self.frames.append(surface)
+        self.x = [0.0] * size
+        self.y = [0.0] * size
+        self.born = [None] * size  # None: slot idle
+        self.next = 0
+
+    def spawn(self, x, y, now):
+        i = self.next
+        self.next = (i + 1) % len(self.born)
+        self.x[i] = x
+        self.y[i] = y
+        self.born[i] = now
+
+    def blits(self, now):
+        """(surface, position) for every live ring, expiring old ones"""
+        out = []
+        for i, born in enumerate(self.born):
+            if born is None:
+                continue
+            step = int((now - born) / self.lifetime * self.steps)
+            if step >= self.steps:
+                self.born[i] = None
+                continue
+            surface = self.frames[max(0, step)]
+            r = surface.get_width() // 2
+            out.append((surface, (self.x[i] - r, self.y[i] - r)))
+        return out
+
+
+class PygameRenderer:
+    """Draws a PongSim frame from pre-rendered surfaces with one blits() call
+
+    The background (with the center line), paddles, ball and overlay are
+    rendered once; text is re-rendered only when it changes.
+    """
+
+    def __init__(self, screen, sim):
+        self.screen = screen
+        self.sim = sim
+        width, height = sim.width, sim.height
+        self.background = pygame.Surface((width, height)).convert()
+        self.background.fill(BACKGROUND)
+        for y in range(0, height, 30):
+            self.background.fill(CENTER_LINE, (width // 2 - 5, y, 10, 15))
+        self.player_paddle = pygame.Surface((PADDLE_WIDTH, PADDLE_HEIGHT)).convert()
+        self.player_paddle.fill(BLUE)
+        self.ai_paddle = pygame.Surface((PADDLE_WIDTH, PADDLE_HEIGHT)).convert()
+        self.ai_paddle.fill(GRAY)
+        self.ball = pygame.Surface((BALL_SIZE, BALL_SIZE), pygame.SRCALPHA)
+        pygame.draw.ellipse(self.ball, ORANGE, self.ball.get_rect())
+        self.ball = self.ball.convert_alpha()
+
+        self.score = Text(pygame.font.SysFont("Arial", 32, bold=True), (170, 170, 170), "0 : 0")
+        self.fps = Text(pygame.font.SysFont("Arial", 16), (102, 102, 102), "FPS: 60")
+        self.rings = Rings()
+
+        # Game over overlay: translucent shade and title baked together
+        self.overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 160))
+        title = pygame.font.SysFont("Arial", 64, bold=True).render("GAME OVER", True, ORANGE)
+        self.overlay.blit(title, title.get_rect(center=(width // 2, height // 2 - 60)))
+        hint = pygame.font.SysFont("Arial", 24).render("R: restart    Q: quit", True, (170, 170, 170))
+        self.overlay.blit(hint, hint.get_rect(center=(width // 2, height // 2 + 110)))
+        self.winner = Text(pygame.font.SysFont("Arial", 48), BLUE)
+        self.final_score = Text(pygame.font.SysFont("Arial", 32), (255, 255, 255))
+        self.show_overlay = False
+        self.pause = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.pause.fill((0, 0, 0, 120))
+        text = pygame.font.SysFont("Arial", 48, bold=True).render("PAUSED", True, (170, 170, 170))
+        self.pause.blit(text, text.get_rect(center=(width // 2, height // 2)))
+        self.show_pause = False
+
+    def game_over(self, winner, player_score, ai_score):
+        self.winner.set(winner)
+        self.final_score.set(f"Final Score: {player_score} : {ai_score}")
+        self.show_overlay = True
+
+    def draw(self, ball_x, ball_y, player_y, ai_y, now):
+        self.draw_balls(((ball_x, ball_y),), player_y, ai_y, now)
+
+    def draw_balls(self, balls, player_y, ai_y, now):
+        """Draw a frame with a ball at each (x, y) in balls"""
+        sim = self.sim
+        ball = self.ball
+        blits = [(self.background, (0, 0)),
+                 (self.player_paddle, (sim.player_x, player_y)),
+                 (self.ai_paddle, (sim.ai_x, ai_y))]
+        blits += [(ball, position) for position in balls]
+        blits.append(self.score.centered(sim.width // 2, 40))
+        blits.append(self.fps.centered(80, 30))
+        blits += self.rings.blits(now)
+        if self.show_overlay:
+            blits.append((self.overlay, (0, 0)))
+            blits.append(self.winner.centered(sim.width // 2, sim.height // 2))
+            blits.append(self.final_score.centered(sim.width // 2, sim.height // 2 + 40))
+        if self.show_pause:
+            blits.append((self.pause, (0, 0)))
+        self.screen.blits(blits, doreturn=False)
+
+
+class PygamePong:
+    """PS5Pong drawn to a pygame window instead of a Tk canvas
+
+    Same simulation, sounds and fixed-step physics as the Tk front end, but
+    frames are paced by pygame.time.Clock and drawn from surfaces, with no
+    Tcl call per item per frame. The game starts straight away (no menu).
+    """
+
+    def __init__(self, tick_rate=60, ai_mode="track", win_score=WIN_SCORE, fps=60, max_steps=8, sim=None):
+        pygame.display.init()
+        pygame.font.init()
+        self.sim = sim or PongSim(win_score=win_score, tick_rate=tick_rate, ai_mode=ai_mode)
+        self.screen = pygame.display.set_mode((self.sim.width, self.sim.height))
+        pygame.display.set_caption("PS5 PONG")
+        self.renderer = PygameRenderer(self.screen, self.sim)
+        # Seed + per-tick inputs, for replays; only a PongSim can be replayed
+        self.recorder = MatchRecorder(self.sim) if sim is None else None
+        self.sounds = SoundBank(SOUNDS)
+        self.sounds.play("start", defer=True)
+        self.fps = fps  # render rate; physics stays at tick_rate
+        self.max_steps = max_steps
+        self.frame_times = FrameTimes()
+        self.frames = 0
+        self.running = False
+
+    def positions(self):
+        state = self.sim.state
+        return state.ball_x, state.ball_y, state.player_y, state.ai_y
+
+    def player_inputs(self):
+        """Input bits from the keyboard state; Up/Down drive the right paddle in versus mode"""
+        keys = pygame.key.get_pressed()
+        bits = (P1_UP if keys[pygame.K_w] else 0) | (P1_DOWN if keys[pygame.K_s] else 0)
+        if self.sim.ai_mode == "versus":
+            bits |= (P2_UP if keys[pygame.K_UP] else 0) | (P2_DOWN if keys[pygame.K_DOWN] else 0)
+        return bits
+
+    def tick(self):
+        self.prev_positions = self.positions()
+        for event in self.recorder.step(self.player_inputs()):
+            self.handle_event(*event)
+
+    def handle_event(self, kind, x, y):
+        if kind == "game_over":
+            self.sounds.play("game_over")
+            state = self.sim.state
+            left_won = state.player_score > state.ai_score
+            if self.sim.ai_mode == "versus":
+                winner = "LEFT PLAYER WINS!" if left_won else "RIGHT PLAYER WINS!"
+            else:
+                winner = "PLAYER WINS!" if left_won else "AI WINS!"
+            self.renderer.game_over(winner, state.player_score, state.ai_score)
+            return
+        self.sounds.play(kind)
+        if kind == "score":
+            state = self.sim.state
+            self.renderer.score.set(f"{state.player_score} : {state.ai_score}")
+            self.prev_positions = self.positions()
+        else:
+            self.renderer.rings.spawn(x, y, time.perf_counter())
+
+    def restart(self):
+        self.sim.reset()
+        self.recorder.start()
+        self.prev_positions = self.positions()
+        self.renderer.score.set("0 : 0")
+        self.renderer.show_overlay = False
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.renderer.show_pause = True
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.renderer.show_pause = False
+            elif event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+                elif self.sim.state.game_over and event.key == pygame.K_r:
+                    self.restart()
+                elif self.sim.state.game_over and event.key == pygame.K_q:
+                    self.running = False
+
+    def run(self, duration=None):
+        """Play until the window is closed, or for duration seconds"""
+        clock = pygame.time.Clock()
+        step = 1.0 / self.sim.tick_rate
+        self.prev_positions = self.positions()
+        self.running = True
+        start = last = time.perf_counter()
+        accumulator = 0.0
+        next_fps = start
+        while self.running:
+            self.handle_events(pygame.event.get())
+            now = time.perf_counter()
+            accumulator += now - last
+            if self.frames:
+                self.frame_times.add(now - last)
+            last = now
+            steps = 0
+            while accumulator >= step and steps < self.max_steps:
+                self.tick()
+                accumulator -= step
+                steps += 1
+            if steps == self.max_steps:
+                accumulator = min(accumulator, step)  # drop a backlog we can't catch up on
+
+            if now >= next_fps:
+                next_fps = now + 0.5
+                self.renderer.fps.set(f"FPS: {self.frame_times.average_fps():.0f}  "
+                                      f"1% low: {self.frame_times.low_fps():.0f}")
+            self.draw_frame(accumulator / step, now)
+            pygame.display.flip()
+            self.frames += 1
+            if duration is not None and now - start >= duration:
+                break
+            if self.renderer.show_pause or self.sim.state.game_over:
+                # Static screen: sleep in the event queue until something changes
+                while self.running and (self.renderer.show_pause or self.sim.state.game_over):
+                    if duration is not None and time.perf_counter() - start >= duration:
+                        return self.frames
+                    self.handle_events([pygame.event.wait(250)])
+                last = time.perf_counter()
+                accumulator = 0.0
+                self.frame_times.add(step)  # the idle gap isn't a slow frame
+            clock.tick(self.fps)
+        return self.frames
+
+    def draw_frame(self, alpha, now):
+        """Draw the state alpha of the way from the previous tick to the current one"""
+        ball_x, ball_y, player_y, ai_y = [p + (c - p) * alpha
+                                          for p, c in zip(self.prev_positions, self.positions())]
+        self.renderer.draw(ball_x, ball_y, player_y, ai_y, now)
+
+
+class MultiBallPong(PygamePong):
+    """Endless multi-ball stress mode: a MultiBallSim of balls balls against the tracking AI"""
+
+    def __init__(self, balls, tick_rate=60, fps=60, max_steps=8, seed=None):
+        super().__init__(fps=fps, max_steps=max_steps,
+                         sim=MultiBallSim(balls, seed=seed, tick_rate=tick_rate))
+
+    def positions(self):
+        sim = self.sim
+        return sim.x.copy(), sim.y.copy(), sim.state.player_y, sim.state.ai_y
+
+    def tick(self):
+        self.prev_positions = self.positions()
+        for event in self.sim.step(self.player_inputs()):
+            self.handle_event(*event)
+
+    def handle_event(self, kind, x, y):
+        if kind == "score":
+            # Balls score every few ticks here; skip the base class's snap of every position
+            state = self.sim.state
+            self.renderer.score.set(f"{state.player_score} : {state.ai_score}")
+            self.sounds.play(kind)
+        else:
+            super().handle_event(kind, x, y)
+
+    def draw_frame(self, alpha, now):
+        prev_x, prev_y, prev_player, prev_ai = self.prev_positions
+        sim = self.sim
+        state = sim.state
+        # Re-served balls jumped to the center: draw those where they are now
+        served = np.abs(sim.x - prev_x) > MAX_BALL_SPEED * sim.dt
+        xs = np.where(served, sim.x, prev_x + (sim.x - prev_x) * alpha)
+        ys = np.where(served, sim.y, prev_y + (sim.y - prev_y) * alpha)
+        self.renderer.draw_balls(zip(xs.tolist(), ys.tolist()),
+                                 prev_player + (state.player_y - prev_player) * alpha,
+                                 prev_ai + (state.ai_y - prev_ai) * alpha, now)
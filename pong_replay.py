@@ -0,0 +1,187 @@
+import struct
+import sys
+import time
+
+from pong_core import PongSim, AI_MODES
+
+MAGIC = b"PONGREC\x01"
+# seed, tick_rate, win_score (-1 = endless), ai_mode index, checksum interval, ticks
+HEADER = struct.Struct("<QHbBHI")
+
+
+class ReplayMismatch(Exception):
+    """A replay's state checksum differs from the one recorded"""
+
+    def __init__(self, tick, expected, actual):
+        super().__init__(f"state diverged by tick {tick}: recorded {expected:08x}, replayed {actual:08x}")
+        self.tick = tick
+
+
+def _put_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recording:
+    """One match: its setup, run-length encoded per-tick inputs and periodic state checksums"""
+
+    def __init__(self, seed, tick_rate, win_score, ai_mode, checksum_interval=60):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.win_score = win_score
+        self.ai_mode = ai_mode
+        self.checksum_interval = checksum_interval
+        self.runs = []  # [input bits, tick count] pairs
+        self.checksums = []  # state checksum after every checksum_interval ticks
+        self.final_checksum = None  # state checksum after the last tick, if that is between checksums
+        self.ticks = 0
+
+    def add(self, inputs):
+        if self.runs and self.runs[-1][0] == inputs:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([inputs, 1])
+        self.ticks += 1
+
+    def finish(self, state):
+        """Checksum state, the one after the last tick, so a replay checks the ticks since the last checksum too"""
+        self.final_checksum = state.checksum() if self.ticks % self.checksum_interval else None
+
+    def inputs(self):
+        for value, count in self.runs:
+            for _ in range(count):
+                yield value
+
+    def make_sim(self):
+        return PongSim(win_score=self.win_score, seed=self.seed, tick_rate=self.tick_rate,
+                       ai_mode=self.ai_mode)
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        out += HEADER.pack(self.seed, self.tick_rate,
+                           -1 if self.win_score is None else self.win_score,
+                           AI_MODES.index(self.ai_mode), self.checksum_interval, self.ticks)
+        _put_varint(out, len(self.runs))
+        for value, count in self.runs:
+            out.append(value)
+            _put_varint(out, count)
+        # The final checksum, if any, follows the periodic ones
+        checksums = self.checksums if self.final_checksum is None else self.checksums + [self.final_checksum]
+        _put_varint(out, len(checksums))
+        out += struct.pack(f"<{len(checksums)}I", *checksums)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a Pong recording")
+        pos = len(MAGIC)
+        seed, tick_rate, win_score, ai_mode, interval, ticks = HEADER.unpack_from(data, pos)
+        pos += HEADER.size
+        rec = cls(seed, tick_rate, None if win_score < 0 else win_score, AI_MODES[ai_mode], interval)
+        count, pos = _get_varint(data, pos)
+        for _ in range(count):
+            value = data[pos]
+            run, pos = _get_varint(data, pos + 1)
+            rec.runs.append([value, run])
+        count, pos = _get_varint(data, pos)
+        # One checksum per whole interval, and a final one if the ticks end between two
+        periodic = ticks // interval if interval else -1
+        if count != periodic and not (count == periodic + 1 and ticks % interval):
+            raise ValueError(f"recording has {count} checksums for {ticks} ticks every {interval}")
+        if len(data) < pos + 4 * count:
+            raise ValueError("recording is truncated")
+        rec.checksums = list(struct.unpack_from(f"<{count}I", data, pos))
+        rec.ticks = ticks
+        if count > ticks // interval:
+            rec.final_checksum = rec.checksums.pop()
+        return rec
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class MatchRecorder:
+    """Records every tick fed through step() so the match can be replayed"""
+
+    def __init__(self, sim, checksum_interval=60):
+        self.sim = sim
+        self.checksum_interval = checksum_interval
+        self.start()
+
+    def start(self):
+        """Begin a new recording from the sim's current (freshly reset) match"""
+        sim = self.sim
+        self.recording = Recording(sim.seed, sim.tick_rate, sim.win_score, sim.ai_mode,
+                                   self.checksum_interval)
+
+    def step(self, inputs=0):
+        rec = self.recording
+        if self.sim.state.game_over:
+            return []
+        rec.add(inputs)
+        events = self.sim.step(inputs)
+        if rec.ticks % rec.checksum_interval == 0:
+            rec.checksums.append(self.sim.state.checksum())
+        return events
+
+    def finish(self):
+        """Checksum the final state into the recording; call once the match is over, before saving"""
+        self.recording.finish(self.sim.state)
+
+
+def replay(recording, verify=True):
+    """Re-simulate a recording without any UI; returns the final PongSim
+
+    With verify, every recorded checksum, the final one included, is
+    compared and ReplayMismatch is raised at the first difference.
+    """
+    sim = recording.make_sim()
+    step = sim.step
+    state = sim.state
+    interval = recording.checksum_interval
+    checksums = recording.checksums
+    tick = 0
+    for value, count in recording.runs:
+        for _ in range(count):
+            step(value)
+            tick += 1
+            if verify and tick % interval == 0:
+                expected = checksums[tick // interval - 1]
+                actual = state.checksum()
+                if actual != expected:
+                    raise ReplayMismatch(tick, expected, actual)
+    if verify and recording.final_checksum is not None:
+        actual = state.checksum()
+        if actual != recording.final_checksum:
+            raise ReplayMismatch(tick, recording.final_checksum, actual)
+    return sim
+
+
+if __name__ == "__main__":
+    rec = Recording.load(sys.argv[1])
+    start = time.perf_counter()
+    sim = replay(rec)
+    elapsed = time.perf_counter() - start
+    print(f"{rec.ticks} ticks verified in {elapsed * 1000:.1f} ms "
+          f"({rec.ticks / elapsed:,.0f} ticks/s), final score "
+          f"{sim.state.player_score} : {sim.state.ai_score}")
@@ -0,0 +1,61 @@
+class Scene:
+    """Canvas items grouped under one tag
+
+    Every item created through the scene carries its tag, so showing, hiding
+    or clearing the whole group is a single Tk call however many items it
+    holds. Scenes are meant to be built once and toggled, not rebuilt.
+    """
+
+    def __init__(self, canvas, tag, visible=True):
+        self.canvas = canvas
+        self.tag = tag
+        self.visible = visible
+
+    def create(self, kind, *coords, **options):
+        """canvas.create_<kind>(...) with the scene tag added"""
+        tags = options.get("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        options["tags"] = (self.tag,) + tuple(tags)
+        if not self.visible:
+            options["state"] = "hidden"
+        return getattr(self.canvas, "create_" + kind)(*coords, **options)
+
+    def show(self):
+        if not self.visible:
+            self.visible = True
+            self.canvas.itemconfigure(self.tag, state="normal")
+
+    def hide(self):
+        if self.visible:
+            self.visible = False
+            self.canvas.itemconfigure(self.tag, state="hidden")
+
+    def clear(self):
+        """Delete every item in the scene"""
+        self.canvas.delete(self.tag)
+
+    def items(self):
+        return self.canvas.find_withtag(self.tag)
+
+
+class Scenes:
+    """The named scenes of one canvas, e.g. menu, playfield, hud, overlay"""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.scenes = {}
+
+    def __getitem__(self, name):
+        scene = self.scenes.get(name)
+        if scene is None:
+            scene = self.scenes[name] = Scene(self.canvas, name)
+        return scene
+
+    def show_only(self, *names):
+        """Show the given scenes and hide every other one"""
+        for name, scene in self.scenes.items():
+            if name in names:
+                scene.show()
+            else:
+                scene.hide()
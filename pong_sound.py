@@ -0,0 +1,200 @@
+import os
+import sys
+import math
+import hashlib
+import threading
+import traceback
+from array import array
+
+# NumPy is imported on first synthesis so importing this module stays cheap;
+# None after a failed import means use the stdlib array path
+_np = False
+
+# In-memory tone cache, keyed like the on-disk one
+_tone_cache = {}
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "ps5pong", "tones"
+)
+
+# pygame mixer format -> (array typecode, numpy dtype, full scale, offset)
+_FORMATS = {
+    -8: ("b", "i1", 127.0, 0),
+    8: ("B", "u1", 127.0, 128),
+    -16: ("h", "i2", 32767.0, 0),
+    16: ("H", "u2", 32767.0, 32768),
+    32: ("i", "i4", 2147483647.0, 0),
+    -32: ("f", "f4", 1.0, 0),  # float32: pygame reports it as signed 32
+}
+
+
+def mixer_format(mixer=None):
+    """Return (sample_rate, format, channels) of the running mixer"""
+    init = mixer.get_init() if mixer is not None else None
+    if not init:
+        return 44100, -16, 1
+    return init
+
+
+def _envelope_gain(i, n, attack_n, release_n):
+    gain = 1.0
+    if attack_n and i < attack_n:
+        gain = i / attack_n
+    if release_n and i >= n - release_n:
+        gain = min(gain, (n - 1 - i) / release_n)
+    return gain
+
+
+def _numpy():
+    global _np
+    if _np is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
+
+def _synth_numpy(np, freq, n, sample_rate, amp, offset, dtype, attack_n, release_n):
+    wave = amp * np.sin((2 * math.pi * freq / sample_rate) * np.arange(n))
+    if attack_n:
+        wave[:attack_n] *= np.arange(attack_n) / attack_n
+    if release_n:
+        wave[n - release_n:] *= np.arange(release_n - 1, -1, -1) / release_n
+    if offset:
+        wave += offset
+    return wave.astype(dtype)
+
+
+def _synth_array(freq, n, sample_rate, amp, offset, typecode, attack_n, release_n):
+    step = 2 * math.pi * freq / sample_rate
+    sin = math.sin
+    if attack_n or release_n:
+        values = [amp * _envelope_gain(i, n, attack_n, release_n) * sin(step * i) + offset
+                  for i in range(n)]
+    else:
+        values = [amp * sin(step * i) + offset for i in range(n)]
+    if typecode != "f":
+        values = [int(v) for v in values]
+    return array(typecode, values)
+
+
+def _cache_path(key):
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"tone-{digest}.pcm")
+
+
+def _read_disk(key):
+    try:
+        with open(_cache_path(key), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_disk(key, data):
+    path = _cache_path(key)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # caching is best effort
+
+
+def tone(freq, duration, sample_rate=44100, volume=0.5, fmt=-16, channels=1,
+         attack=0.0, release=0.0, disk_cache=True):
+    """Build a sine tone as raw PCM bytes in the given mixer format"""
+    key = (freq, duration, sample_rate, volume, fmt, channels, attack, release, sys.byteorder)
+    data = _tone_cache.get(key)
+    if data is not None:
+        return data
+    if disk_cache:
+        data = _read_disk(key)
+    if data is None:
+        if fmt not in _FORMATS:
+            raise ValueError(f"unsupported mixer sample format {fmt}")
+        typecode, dtype, scale, offset = _FORMATS[fmt]
+        n = int(duration * sample_rate)
+        attack_n = min(n, int(attack * sample_rate))
+        release_n = min(n, int(release * sample_rate))
+        amp = volume * scale
+        np = _numpy()
+        if np is not None:
+            samples = _synth_numpy(np, freq, n, sample_rate, amp, offset, dtype, attack_n, release_n)
+            if channels > 1:
+                samples = np.repeat(samples, channels)
+            data = samples.tobytes()
+        else:
+            samples = _synth_array(freq, n, sample_rate, amp, offset, typecode, attack_n, release_n)
+            if channels > 1:
+                samples = array(typecode, [s for s in samples for _ in range(channels)])
+            data = samples.tobytes()
+        if disk_cache:
+            _write_disk(key, data)
+    _tone_cache[key] = data
+    return data
+
+
+def load_sounds(mixer, specs, volume=0.5):
+    """Build mixer.Sound objects from {name: (freq, duration)} in the mixer's format"""
+    sample_rate, fmt, channels = mixer_format(mixer)
+    return {
+        name: mixer.Sound(buffer=tone(freq, duration, sample_rate, volume, fmt, channels))
+        for name, (freq, duration) in specs.items()
+    }
+
+
+class SoundBank:
+    """Sound effects prepared on a background thread
+
+    Only pygame's mixer is imported and initialized, and that happens off the
+    UI thread together with synthesis. play() is silent until the bank is
+    ready, or forever if there is no audio device; play(name, defer=True)
+    instead plays the sound as soon as it becomes available.
+    """
+
+    def __init__(self, specs, volume=0.5):
+        self.sounds = {}
+        self.deferred = []
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self._load, args=(specs, volume),
+                                       name="sound-loader", daemon=True)
+        self.thread.start()
+
+    def _load(self, specs, volume):
+        sounds = {}
+        try:
+            from pygame import mixer
+            mixer.init()
+            sounds = load_sounds(mixer, specs, volume)
+        except (ImportError, RuntimeError):  # no pygame or no audio device: stay silent
+            pass
+        except Exception:  # anything else is a bug: report it, then carry on silent all the same
+            traceback.print_exc()
+        finally:
+            # Whatever happened, loading is over: play what was deferred and release waiters
+            with self.lock:
+                self.sounds = sounds
+                deferred, self.deferred = self.deferred, None  # None: loading is over
+            try:
+                for name in deferred:
+                    self.play(name)
+            finally:
+                self.ready.set()
+
+    def play(self, name, defer=False):
+        sound = self.sounds.get(name)
+        if sound is None and defer:
+            with self.lock:
+                if self.deferred is not None:
+                    self.deferred.append(name)
+                    return
+                sound = self.sounds.get(name)
+        if sound is not None:
+            sound.play()
@@ -0,0 +1,380 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+
+from pong_replay import _put_varint, _get_varint
+
+# Streamed per tick; positions and velocities in 1/SCALE px
+FIELDS = ("tick", "player_y", "ai_y", "ball_x", "ball_y", "ball_dx", "ball_dy",
+          "player_score", "ai_score", "game_over")
+SCALE = 16
+# Every message is [length][kind][body]. A keyframe body is all FIELDS; a
+# delta body is a bit mask of the fields that changed and their differences.
+# Values are zigzag varints.
+KEYFRAME = 1
+DELTA = 2
+MASK = struct.Struct("<H")
+# Spectators ack the number of frames they have decoded every ACK_INTERVAL
+# frames; the server sends no more than max_lag frames past the last ack
+ACK = struct.Struct("<I")
+ACK_INTERVAL = 10
+# A published frame on its way from the game to the server process
+STATE = struct.Struct("<I6i2IB")
+COUNTERS = ("clients", "frames", "keyframes", "skipped", "dropped", "bytes_sent")
+CLIENTS, FRAMES, KEYFRAMES, SKIPPED, DROPPED, BYTES_SENT = range(len(COUNTERS))
+
+
+def quantize(state):
+    """A PongState's FIELDS as a tuple of integers"""
+    return (state.tick, round(state.player_y * SCALE), round(state.ai_y * SCALE),
+            round(state.ball_x * SCALE), round(state.ball_y * SCALE),
+            round(state.ball_dx * SCALE), round(state.ball_dy * SCALE),
+            state.player_score, state.ai_score, int(state.game_over))
+
+
+def unquantize(values):
+    """Field name -> value for a decoded frame, positions back in pixels"""
+    frame = dict(zip(FIELDS, values))
+    for name in FIELDS[1:7]:
+        frame[name] /= SCALE
+    frame["game_over"] = bool(frame["game_over"])
+    return frame
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value):
+    return -((value + 1) >> 1) if value & 1 else value >> 1
+
+
+def _message(body):
+    return bytes((len(body),)) + body
+
+
+def encode_keyframe(values):
+    body = bytearray((KEYFRAME,))
+    for value in values:
+        _put_varint(body, _zigzag(value))
+    return _message(body)
+
+
+def encode_delta(prev, values):
+    body = bytearray((DELTA, 0, 0))
+    mask = 0
+    for i, (old, new) in enumerate(zip(prev, values)):
+        if new != old:
+            mask |= 1 << i
+            _put_varint(body, _zigzag(new - old))
+    MASK.pack_into(body, 1, mask)
+    return _message(body)
+
+
+class SpectatorDecoder:
+    """Rebuilds frames from a spectator byte stream, fed in whatever chunks arrive"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.values = None
+        self.keyframes = 0
+        self.deltas = 0
+
+    def feed(self, data):
+        """Every complete frame in data, as quantized value tuples"""
+        buffer = self.buffer
+        buffer += data
+        frames = []
+        pos = 0
+        while pos < len(buffer) and pos + 1 + buffer[pos] <= len(buffer):
+            end = pos + 1 + buffer[pos]
+            kind = buffer[pos + 1]
+            if kind == KEYFRAME:
+                values = []
+                i = pos + 2
+                for _ in FIELDS:
+                    value, i = _get_varint(buffer, i)
+                    values.append(_unzigzag(value))
+                self.keyframes += 1
+            elif kind == DELTA and self.values is not None:
+                values = list(self.values)
+                mask, = MASK.unpack_from(buffer, pos + 2)
+                i = pos + 4
+                for field in range(len(FIELDS)):
+                    if mask >> field & 1:
+                        value, i = _get_varint(buffer, i)
+                        values[field] += _unzigzag(value)
+                self.deltas += 1
+            else:
+                raise ValueError(f"unexpected message kind {kind} in spectator stream")
+            self.values = tuple(values)
+            frames.append(self.values)
+            pos = end
+        del buffer[:pos]
+        return frames
+
+
+class _Subscriber(asyncio.Protocol):
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+        self.transport = None
+        self.seq = None  # last frame this client was sent
+        self.sent = 0  # messages sent
+        self.acked = 0  # messages the client says it has decoded
+        self.acks = bytearray()
+        self.full = False  # transport buffer over the high-water mark
+        self.stalled_at = None  # loop time the client started being skipped
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info("socket")
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # A small kernel buffer, so a slow viewer hits backpressure after a few frames, not a few seconds
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.broadcaster.send_buffer)
+        transport.set_write_buffer_limits(self.broadcaster.high_water)
+        self.broadcaster.subscribe(self)
+
+    def connection_lost(self, exc):
+        self.broadcaster.unsubscribe(self)
+
+    def pause_writing(self):
+        self.full = True
+
+    def resume_writing(self):
+        self.full = False
+
+    def data_received(self, data):
+        acks = self.acks
+        acks += data
+        end = len(acks) - len(acks) % ACK.size
+        if end:
+            self.acked, = ACK.unpack_from(acks, end - ACK.size)
+            del acks[:end]
+
+
+class _Broadcaster:
+    """The server process's side: reads published frames from a pipe and fans them out"""
+
+    def __init__(self, frames, counters, max_lag, high_water, send_buffer, max_stall):
+        self.frames = frames
+        self.counters = counters
+        self.max_lag = max_lag
+        self.high_water = high_water
+        self.send_buffer = send_buffer
+        self.max_stall = max_stall
+        self.clients = set()
+        self.values = None  # last frame fanned out
+        self.seq = 0
+        self.loop = None
+        self.done = None
+
+    async def serve(self, conn, host, port):
+        loop = self.loop = asyncio.get_running_loop()
+        try:
+            server = await loop.create_server(lambda: _Subscriber(self), host, port, backlog=1024)
+        except OSError as e:
+            conn.send(e)
+            return
+        conn.send(server.sockets[0].getsockname()[1])
+        self.done = loop.create_future()
+        loop.add_reader(self.frames.fileno(), self.read_frames)
+        try:
+            await self.done
+        finally:
+            loop.remove_reader(self.frames.fileno())
+            server.close()
+            for client in list(self.clients):
+                client.transport.abort()
+            await server.wait_closed()
+
+    def read_frames(self):
+        # Only the newest of any frames that queued up while we were busy is sent
+        values = None
+        try:
+            while self.frames.poll():
+                values = STATE.unpack(self.frames.recv_bytes())
+        except EOFError:
+            self.done.set_result(None)  # the game closed its end
+            return
+        if values is not None and values != self.values:
+            self.fan_out(values)
+
+    def subscribe(self, client):
+        self.clients.add(client)
+        self.counters[CLIENTS] = len(self.clients)
+        if self.values is not None:
+            keyframe = encode_keyframe(self.values)
+            client.transport.write(keyframe)
+            client.sent += 1
+            client.seq = self.seq
+            self.counters[KEYFRAMES] += 1
+            self.counters[BYTES_SENT] += len(keyframe)
+
+    def unsubscribe(self, client):
+        self.clients.discard(client)
+        self.counters[CLIENTS] = len(self.clients)
+
+    def fan_out(self, values):
+        prev, self.values = self.values, values
+        self.seq = seq = self.seq + 1
+        delta = encode_delta(prev, values) if prev is not None else None
+        keyframe = None
+        keyframes = skipped = dropped = sent = 0
+        now = self.loop.time()
+        for client in list(self.clients):
+            if client.transport.is_closing():
+                continue
+            if client.full or (client.sent - client.acked) & 0xFFFFFFFF >= self.max_lag:
+                if client.stalled_at is None:
+                    client.stalled_at = now
+                elif now - client.stalled_at > self.max_stall:
+                    client.transport.abort()
+                    dropped += 1
+                    continue
+                skipped += 1
+                continue
+            client.stalled_at = None
+            if client.seq == seq - 1:
+                data = delta
+            else:
+                if keyframe is None:
+                    keyframe = encode_keyframe(values)
+                data = keyframe
+                keyframes += 1
+            client.transport.write(data)
+            client.sent += 1
+            client.seq = seq
+            sent += len(data)
+        counters = self.counters
+        counters[CLIENTS] = len(self.clients)
+        counters[FRAMES] += 1
+        counters[KEYFRAMES] += keyframes
+        counters[SKIPPED] += skipped
+        counters[DROPPED] += dropped
+        counters[BYTES_SENT] += sent
+
+
+def _serve(conn, frames, counters, host, port, options, inherited):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C is the game's; it stops us by closing the pipe
+    for end in inherited:
+        end.close()  # the game's ends, copied by fork; the frame pipe only reaches EOF once all are shut
+    asyncio.run(_Broadcaster(frames, counters, **options).serve(conn, host, port))
+
+
+class SpectatorServer:
+    """Broadcasts a live match to TCP spectators from an asyncio server in its own process
+
+    The game loop calls publish(state) once per tick, which costs one
+    small non-blocking pipe write; encoding, fan-out and client I/O all
+    happen in the server process, so they never compete with the game for
+    the GIL. Each subscriber is sent the delta from the previous frame. A
+    subscriber more than max_lag frames ahead of its acks, or whose
+    socket backs up, is skipped rather than buffered for, and gets a
+    keyframe once it catches up, so a slow viewer sees fewer frames and
+    never holds up the game or the other viewers. One that stays behind
+    for max_stall seconds is disconnected. Frames that queue up while the
+    server is busy are coalesced, and if the pipe itself is full the
+    frame is dropped on the game side.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, max_lag=30, high_water=4096, send_buffer=16384,
+                 max_stall=10.0, context=None):
+        self.host = host
+        self.port = port
+        self.options = {"max_lag": max_lag, "high_water": high_water, "send_buffer": send_buffer,
+                        "max_stall": max_stall}
+        self.context = context
+        self.values = None  # last frame published
+        self.lost = 0  # frames dropped because the pipe was full
+        self.frames = None
+        self.counters = None
+        self.process = None
+
+    def start(self):
+        """Start the server process; returns self once its port is open"""
+        ctx = multiprocessing.get_context(self.context)
+        reader, writer = ctx.Pipe(duplex=False)
+        parent, child = ctx.Pipe()
+        self.counters = ctx.Array("q", len(COUNTERS), lock=False)
+        self.process = ctx.Process(target=_serve, name="pong-spectate", daemon=True,
+                                   args=(child, reader, self.counters, self.host, self.port, self.options,
+                                         (writer, parent)))
+        self.process.start()
+        reader.close()
+        child.close()
+        result = parent.recv()
+        parent.close()
+        if isinstance(result, Exception):
+            self.process.join()
+            raise result
+        self.port = result
+        os.set_blocking(writer.fileno(), False)  # a stuck server must never block the game
+        self.frames = writer
+        return self
+
+    def publish(self, state):
+        """Send the current state to the server process; cheap, and never blocks"""
+        self.values = quantize(state)
+        try:
+            self.frames.send_bytes(STATE.pack(*self.values))
+        except BlockingIOError:
+            self.lost += 1
+
+    def stats(self):
+        stats = dict(zip(COUNTERS, self.counters))
+        stats["lost"] = self.lost
+        return stats
+
+    def close(self):
+        if self.process is None:
+            return
+        self.frames.close()
+        self.process.join()
+        self.process = None
+
+
+def serve(spec):
+    """A started SpectatorServer for "[host:]port" (host defaults to loopback)"""
+    host, _, port = spec.rpartition(":")
+    return SpectatorServer(host or "127.0.0.1", int(port)).start()
+
+
+async def watch(host, port, on_frame):
+    """Follow a SpectatorServer until it closes, calling on_frame(values) for each frame"""
+    reader, writer = await asyncio.open_connection(host, port)
+    decoder = SpectatorDecoder()
+    decoded = acked = 0
+    try:
+        while data := await reader.read(65536):
+            for values in decoder.feed(data):
+                on_frame(values)
+                decoded += 1
+            if decoded - acked >= ACK_INTERVAL:
+                writer.write(ACK.pack(decoded & 0xFFFFFFFF))
+                acked = decoded
+    finally:
+        writer.close()
+    return decoder
+
+
+if __name__ == "__main__":
+    # python pong_spectate.py host:port -- print the score as a match goes
+    host, port = sys.argv[1].rsplit(":", 1)
+    last = None
+
+    def show(values):
+        global last
+        frame = unquantize(values)
+        score = (frame["player_score"], frame["ai_score"], frame["game_over"])
+        if score != last:
+            last = score
+            print(f"tick {frame['tick']:7d}  {score[0]} : {score[1]}" + ("  GAME OVER" if score[2] else ""))
+
+    start = time.perf_counter()
+    decoder = asyncio.run(watch(host, int(port), show))
+    print(f"{decoder.keyframes} keyframes, {decoder.deltas} deltas in {time.perf_counter() - start:.1f} s")
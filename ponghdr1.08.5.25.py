@@ -1,280 +1,283 @@
 import tkinter as tk
-import random
+import os
+import sys
 import time
-import math
-import pygame
-from pygame import mixer
+from pong_sound import SoundBank
+from pong_loop import FixedStepLoop
+from pong_effects import ImpactPool
+from pong_hud import Hud
+from pong_instrument import Profiler
+from pong_replay import MatchRecorder
+from pong_scene import Scenes
+from pong_input import KeyState
+from pong_core import PongSim, P1_UP, P1_DOWN, PADDLE_WIDTH, PADDLE_HEIGHT, BALL_SIZE
 
 class PS5Pong:
-    def __init__(self, root):
+    def __init__(self, root, tick_rate=60, ai_mode="track", profile=False, net=None, spectate=None):
         self.root = root
+        self.tick_rate = tick_rate  # physics ticks per second (60/120/240)
+        self.ai_mode = ai_mode  # "track" chases the ball, "intercept" predicts it
+        self.net = net  # pong_net spec for network versus, e.g. "left:9000:peer-host:9001"
+        self.profiler = Profiler() if profile else None
+        # Live stream of every tick for pong_spectate viewers, e.g. spectate="0.0.0.0:9100"
+        self.spectators = None
+        if spectate:
+            from pong_spectate import serve  # asyncio and multiprocessing: only when asked for
+            self.spectators = serve(spectate)
         self.root.title("PS5 PONG")
         self.root.geometry("900x600")
         self.root.configure(bg="#000814")
         self.root.resizable(False, False)
         
-        # Initialize pygame mixer
-        pygame.init()
-        mixer.init()
-        
-        # Create sound effects
-        self.sounds = {
-            "paddle": mixer.Sound(self.generate_sine_wave(440, 0.1)),
-            "wall": mixer.Sound(self.generate_sine_wave(330, 0.1)),
-            "score": mixer.Sound(self.generate_sine_wave(880, 0.3)),
-            "start": mixer.Sound(self.generate_sine_wave(523.25, 0.5))
-        }
+        # Start the mixer and build sound effects in the background so the
+        # menu shows immediately (vectorized and cached, see pong_sound)
+        self.sounds = SoundBank({
+            "paddle": (440, 0.1),
+            "wall": (330, 0.1),
+            "score": (880, 0.3),
+            "start": (523.25, 0.5)
+        })
         
         # Create main menu
         self.create_main_menu()
         
-        # Performance tracking
-        self.last_frame_time = time.time()
-        
-    def generate_sine_wave(self, freq, duration, sample_rate=44100, volume=0.5):
-        """Generate a sine wave sound effect"""
-        samples = bytearray()
-        for i in range(int(duration * sample_rate)):
-            sample = int(volume * 32767.0 * math.sin(2 * math.pi * freq * i / sample_rate))
-            samples.extend([sample & 0xFF, (sample >> 8) & 0xFF])
-        return bytes(samples)
-    
     def create_main_menu(self):
         """Create PS5-style main menu"""
-        self.menu_canvas = tk.Canvas(self.root, bg="#000814", highlightthickness=0)
-        self.menu_canvas.pack(fill=tk.BOTH, expand=True)
+        # One canvas for the whole session; menu, playfield, HUD and overlay
+        # are tagged scenes on it that are built once and shown or hidden
+        self.canvas = tk.Canvas(self.root, bg="#000814", highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.scenes = Scenes(self.canvas)
+        menu = self.scenes["menu"]
         
         # PS5 logo
-        self.menu_canvas.create_rectangle(350, 100, 550, 300, fill="#0072CE", outline="")
-        self.menu_canvas.create_text(450, 200, text="PS5", fill="white", 
-                                    font=("Arial", 48, "bold"))
+        menu.create("rectangle", 350, 100, 550, 300, fill="#0072CE", outline="")
+        menu.create("text", 450, 200, text="PS5", fill="white", 
+                    font=("Arial", 48, "bold"))
         
         # Game title
-        self.menu_canvas.create_text(450, 350, text="PONG", fill="#FF9B1A", 
-                                    font=("Arial", 64, "bold"))
+        menu.create("text", 450, 350, text="PONG", fill="#FF9B1A", 
+                    font=("Arial", 64, "bold"))
         
         # Start button
-        self.start_btn = tk.Button(self.root, text="START GAME", font=("Arial", 24), 
+        self.start_btn = tk.Button(self.canvas, text="START GAME", font=("Arial", 24), 
                                  bg="#0072CE", fg="white", activebackground="#FF9B1A",
                                  command=self.start_game)
-        self.start_btn.place(x=350, y=400, width=200, height=50)
+        menu.create("window", 350, 400, window=self.start_btn, anchor="nw", width=200, height=50)
         
         # Quit button
-        self.quit_btn = tk.Button(self.root, text="QUIT", font=("Arial", 24), 
+        self.quit_btn = tk.Button(self.canvas, text="QUIT", font=("Arial", 24), 
                                 bg="#5D5D5D", fg="white", activebackground="#FF9B1A",
                                 command=self.root.quit)
-        self.quit_btn.place(x=350, y=470, width=200, height=50)
+        menu.create("window", 350, 470, window=self.quit_btn, anchor="nw", width=200, height=50)
         
         # Play start sound
-        self.sounds["start"].play()
+        self.sounds.play("start", defer=True)
     
     def start_game(self):
         """Initialize game elements"""
-        # Remove menu elements
-        self.menu_canvas.destroy()
-        self.start_btn.destroy()
-        self.quit_btn.destroy()
-        
-        # Create game canvas
-        self.canvas = tk.Canvas(self.root, bg="#111", highlightthickness=0)
-        self.canvas.pack(fill=tk.BOTH, expand=True)
-        
-        # Game elements
-        self.width = 900
-        self.height = 600
-        self.paddle_width = 15
-        self.paddle_height = 120
-        self.ball_size = 20
-        self.ball_speed = 5
-        self.paddle_speed = 8
-        self.ai_difficulty = 0.7  # AI skill level (0-1)
+        # Swap the menu out for the game scenes
+        self.scenes["menu"].hide()
+        self.canvas.configure(bg="#111")
+        playfield = self.scenes["playfield"]
+        
+        # Game state lives in the headless simulation; the canvas only mirrors it
+        if self.net:
+            # Network versus: the right paddle belongs to the peer (rollback, see pong_net)
+            from pong_net import connect
+            self.peer = connect(self.net, self.tick_rate, win_score=None)
+            self.sim = self.peer.session.sim
+        else:
+            self.peer = None
+            self.sim = PongSim(win_score=None, tick_rate=self.tick_rate, ai_mode=self.ai_mode)
+        self.width = self.sim.width
+        self.height = self.sim.height
+        self.paddle_width = PADDLE_WIDTH
+        self.paddle_height = PADDLE_HEIGHT
+        self.ball_size = BALL_SIZE
+        if self.peer is None:
+            self.recorder = MatchRecorder(self.sim)  # seed + per-tick inputs, for replays
+        else:
+            self.recorder = self.peer.session  # its recording holds the frames both peers confirmed
+        state = self.sim.state
+        self.prev_positions = self.positions()
         
         # Create center line
         for i in range(0, self.height, 30):
-            self.canvas.create_rectangle(
-                self.width//2 - 5, i,
+            playfield.create(
+                "rectangle", self.width//2 - 5, i,
                 self.width//2 + 5, i + 15,
                 fill="#333", outline=""
             )
         
         # Create player paddle (left)
-        self.player_paddle = self.canvas.create_rectangle(
-            50, self.height//2 - self.paddle_height//2,
-            50 + self.paddle_width, self.height//2 + self.paddle_height//2,
+        self.player_paddle = playfield.create(
+            "rectangle", self.sim.player_x, state.player_y,
+            self.sim.player_x + self.paddle_width, state.player_y + self.paddle_height,
             fill="#0072CE", outline=""  # PS5 blue
         )
         
         # Create AI paddle (right)
-        self.ai_paddle = self.canvas.create_rectangle(
-            self.width - 50 - self.paddle_width, self.height//2 - self.paddle_height//2,
-            self.width - 50, self.height//2 + self.paddle_height//2,
+        self.ai_paddle = playfield.create(
+            "rectangle", self.sim.ai_x, state.ai_y,
+            self.sim.ai_x + self.paddle_width, state.ai_y + self.paddle_height,
             fill="#5D5D5D", outline=""  # PS5 gray
         )
         
         # Create ball
-        self.ball = self.canvas.create_oval(
-            self.width//2 - self.ball_size//2, self.height//2 - self.ball_size//2,
-            self.width//2 + self.ball_size//2, self.height//2 + self.ball_size//2,
+        self.ball = playfield.create(
+            "oval", state.ball_x, state.ball_y,
+            state.ball_x + self.ball_size, state.ball_y + self.ball_size,
             fill="#FF9B1A", outline=""  # PS5 orange
         )
         
-        # Score display
-        self.player_score = 0
-        self.ai_score = 0
-        self.score_display = self.canvas.create_text(
-            self.width//2, 40,
-            text="0 : 0",
-            fill="#aaa",
-            font=("Arial", 24, "bold")
-        )
-        
-        # FPS display
-        self.fps_display = self.canvas.create_text(
-            80, 30,
-            text="FPS: 60",
-            fill="#666",
-            font=("Arial", 12)
-        )
-        
-        # Initialize movement parameters
-        self.ball_dx = self.ball_speed * random.choice([-1, 1])
-        self.ball_dy = self.ball_speed * random.choice([-1, 1])
-        self.player_paddle_dy = 0
-        
-        # Key bindings
-        self.root.bind("<KeyPress-w>", lambda e: self.set_paddle_speed("player", -self.paddle_speed))
-        self.root.bind("<KeyPress-s>", lambda e: self.set_paddle_speed("player", self.paddle_speed))
-        self.root.bind("<KeyRelease-w>", lambda e: self.stop_paddle("player"))
-        self.root.bind("<KeyRelease-s>", lambda e: self.stop_paddle("player"))
-        
-        # Start game loop
-        self.last_frame_time = time.time()
-        self.game_loop()
+        # Score and FPS displays, only redrawn when their text changes
+        self.hud = Hud(self.canvas, self.width, refresh=0.5, tags="hud")
+        
+        # Pre-created impact rings, recycled by the main loop
+        self.effects = ImpactPool(self.canvas, animate=True, tags="effects")
+        
+        # Paddle keys are held state sampled once per tick: W/S, and Up/Down
+        # for a second local player in versus mode
+        self.keys = KeyState(self.root)
+        
+        # Pause notice; the loop is suspended while the window is in the background
+        pause = self.scenes["pause"]
+        pause.hide()
+        pause.create("text", self.width//2, self.height//2, text="PAUSED",
+                     fill="#aaa", font=("Arial", 36, "bold"))
+        self.root.bind("<FocusOut>", self.focus_changed, add="+")
+        self.root.bind("<FocusIn>", self.focus_changed, add="+")
+        
+        # Start game loop: fixed-rate physics, interpolated rendering
+        self.loop = FixedStepLoop(self.root, self.tick_rate, self.tick, self.draw)
+        if self.profiler is not None:
+            self.profiler.attach(self)
+        self.loop.start()
     
-    def set_paddle_speed(self, paddle, speed):
-        if paddle == "player":
-            self.player_paddle_dy = speed
+    def player_inputs(self):
+        """PongSim input bits for this tick from the held keys"""
+        if self.sim.ai_mode == "versus" and self.peer is None:
+            return self.keys.sample()  # both paddles are played on this keyboard
+        return self.keys.sample(P1_UP | P1_DOWN)
     
-    def stop_paddle(self, paddle):
-        if paddle == "player":
-            self.player_paddle_dy = 0
+    def handle_event(self, kind, x, y):
+        """Play sounds and effects for a simulation event"""
+        self.sounds.play(kind)
+        if kind != "score":
+            self.effects.spawn(x, y, time.perf_counter())
     
-    def move_paddles(self):
-        # Move player paddle
-        player_pos = self.canvas.coords(self.player_paddle)
-        if (player_pos[1] + self.player_paddle_dy > 0 and 
-            player_pos[3] + self.player_paddle_dy < self.height):
-            self.canvas.move(self.player_paddle, 0, self.player_paddle_dy)
-        
-        # AI paddle movement
-        ball_pos = self.canvas.coords(self.ball)
-        ai_pos = self.canvas.coords(self.ai_paddle)
-        ai_center = (ai_pos[1] + ai_pos[3]) / 2
-        ball_center = (ball_pos[1] + ball_pos[3]) / 2
-        
-        # AI follows ball with some imperfection
-        if ball_center < ai_center - 10:
-            ai_dy = -self.paddle_speed * self.ai_difficulty
-        elif ball_center > ai_center + 10:
-            ai_dy = self.paddle_speed * self.ai_difficulty
+    def sync_state(self):
+        """Mirror the score from the sim state
+        
+        Not from events: a network rollback re-simulates frames whose
+        events nobody sees, and can score a goal differently from what
+        was predicted.
+        """
+        state = self.sim.state
+        self.hud.set_score(state.player_score, state.ai_score)
+    
+    def focus_changed(self, event):
+        # Focus moves between our own widgets too; look once the dust settles
+        self.root.after_idle(self.check_focus)
+    
+    def check_focus(self):
+        if self.root.focus_get() is None:
+            self.pause()
         else:
-            ai_dy = 0
-            
-        # Add random imperfection to AI
-        if random.random() < 0.2:  # 20% chance of error
-            ai_dy *= random.uniform(0.5, 1.5)
-        
-        if (ai_pos[1] + ai_dy > 0 and 
-            ai_pos[3] + ai_dy < self.height):
-            self.canvas.move(self.ai_paddle, 0, ai_dy)
+            self.resume()
     
-    def move_ball(self):
-        self.canvas.move(self.ball, self.ball_dx, self.ball_dy)
-        ball_pos = self.canvas.coords(self.ball)
-        
-        # Wall collisions (top/bottom)
-        if ball_pos[1] <= 0 or ball_pos[3] >= self.height:
-            self.ball_dy *= -1
-            self.sounds["wall"].play()
-            self.create_impact_effect(ball_pos)
-        
-        # Paddle collisions
-        player_pos = self.canvas.coords(self.player_paddle)
-        ai_pos = self.canvas.coords(self.ai_paddle)
-        
-        # Player paddle collision
-        if (ball_pos[0] <= player_pos[2] and 
-            ball_pos[2] >= player_pos[0] and 
-            ball_pos[3] >= player_pos[1] and 
-            ball_pos[1] <= player_pos[3]):
-            self.ball_dx = abs(self.ball_dx) * 1.05
-            # Add spin based on paddle movement
-            self.ball_dy += self.player_paddle_dy * 0.2
-            self.sounds["paddle"].play()
-            self.create_impact_effect(ball_pos)
-        
-        # AI paddle collision
-        elif (ball_pos[2] >= ai_pos[0] and 
-              ball_pos[0] <= ai_pos[2] and 
-              ball_pos[3] >= ai_pos[1] and 
-              ball_pos[1] <= ai_pos[3]):
-            self.ball_dx = -abs(self.ball_dx) * 1.05
-            self.sounds["paddle"].play()
-            self.create_impact_effect(ball_pos)
-        
-        # Scoring
-        if ball_pos[0] <= 0:
-            self.ai_score += 1
-            self.sounds["score"].play()
-            self.reset_ball()
-        elif ball_pos[2] >= self.width:
-            self.player_score += 1
-            self.sounds["score"].play()
-            self.reset_ball()
+    def pause(self):
+        """Suspend ticking and drawing until the window has focus again"""
+        if self.peer is not None or not self.loop.running:
+            return  # a network match can't stop its clock; a suspended loop is already idle
+        self.loop.suspend()
+        self.scenes["pause"].show()
     
-    def create_impact_effect(self, pos):
-        """Create a PS5-style impact effect"""
-        x, y = (pos[0] + pos[2])/2, (pos[1] + pos[3])/2
-        # PS5 blue effect
-        effect = self.canvas.create_oval(
-            x-15, y-15, x+15, y+15,
-            fill="", outline="#0072CE",
-            width=3, dash=(5, 3)
-        )
-        self.canvas.after(100, lambda: self.canvas.delete(effect))
+    def resume(self):
+        if self.scenes["pause"].visible:
+            self.scenes["pause"].hide()
+            self.hud.reset_clock()
+            self.loop.resume()
     
-    def reset_ball(self):
-        self.canvas.coords(self.ball, 
-                          self.width//2 - self.ball_size//2,
-                          self.height//2 - self.ball_size//2,
-                          self.width//2 + self.ball_size//2,
-                          self.height//2 + self.ball_size//2)
-        self.ball_dx = self.ball_speed * random.choice([-1, 1])
-        self.ball_dy = self.ball_speed * random.choice([-1, 1])
-        self.canvas.itemconfig(self.score_display, text=f"{self.player_score} : {self.ai_score}")
-        
-        # Increase difficulty as score increases
-        self.ai_difficulty = min(0.95, 0.7 + (self.ai_score + self.player_score) * 0.02)
+    def positions(self):
+        state = self.sim.state
+        return state.ball_x, state.ball_y, state.player_y, state.ai_y
     
-    def update_fps(self):
-        current_time = time.time()
-        elapsed = current_time - self.last_frame_time
-        self.last_frame_time = current_time
-        fps = 1.0 / elapsed if elapsed > 0 else 60
-        self.canvas.itemconfig(self.fps_display, text=f"FPS: {int(fps)}")
+    def tick(self):
+        """Advance the physics by one fixed step"""
+        self.prev_positions = self.positions()
+        if self.peer is None:
+            events = self.recorder.step(self.player_inputs())
+        else:
+            events = self.peer.tick(self.player_inputs())
+            if events is None:
+                return  # too far ahead of the remote player; wait for their inputs
+        for kind, x, y in events:
+            self.handle_event(kind, x, y)
+            if kind == "score":
+                # The ball was re-served; don't interpolate across the court
+                self.prev_positions = self.positions()
+        self.sync_state()
+        if self.spectators is not None:
+            self.spectators.publish(self.sim.state)
     
-    def game_loop(self):
-        self.update_fps()
-        self.move_paddles()
-        self.move_ball()
-        
-        # Performance optimization: Self-adjusting delay
-        elapsed = time.time() - self.last_frame_time
-        delay = max(1, int(16.67 - elapsed*1000))  # Target 60 FPS (16.67ms/frame)
-        
-        self.root.after(delay, self.game_loop)
+    def render(self, alpha=1.0):
+        """Push the simulation state to the canvas items, blended alpha of the way from the previous tick"""
+        prev = self.prev_positions
+        ball_x, ball_y, player_y, ai_y = [p + (c - p) * alpha for p, c in zip(prev, self.positions())]
+        self.canvas.coords(self.player_paddle,
+                          self.sim.player_x, player_y,
+                          self.sim.player_x + self.paddle_width, player_y + self.paddle_height)
+        self.canvas.coords(self.ai_paddle,
+                          self.sim.ai_x, ai_y,
+                          self.sim.ai_x + self.paddle_width, ai_y + self.paddle_height)
+        self.canvas.coords(self.ball,
+                          ball_x, ball_y,
+                          ball_x + self.ball_size, ball_y + self.ball_size)
+    
+    def draw(self, alpha):
+        now = time.perf_counter()
+        self.hud.frame(now)
+        self.effects.update(now)
+        self.render(alpha)
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    game = PS5Pong(root)
-    root.mainloop()
+    tick_rate = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    ai_mode = sys.argv[2] if len(sys.argv) > 2 else "track"
+    if int(os.environ.get("PONG_BALLS", 1)) > 1:
+        # PONG_BALLS=1000: endless multi-ball stress mode, pygame only
+        from pong_pygame import MultiBallPong
+        game = MultiBallPong(int(os.environ["PONG_BALLS"]), tick_rate=tick_rate,
+                             fps=int(os.environ.get("PONG_FPS", 60)))
+        game.run()
+    elif os.environ.get("PONG_BACKEND") == "pygame":
+        # Draw with pygame surfaces instead of the Tk canvas (no menu, no profiler or netplay)
+        from pong_pygame import PygamePong
+        game = PygamePong(tick_rate=tick_rate, ai_mode=ai_mode, win_score=None, fps=int(os.environ.get("PONG_FPS", 60)))
+        game.run()
+    else:
+        root = tk.Tk()
+        game = PS5Pong(root, tick_rate=tick_rate, ai_mode=ai_mode,
+                       profile="PONG_PROFILE" in os.environ,
+                       net=os.environ.get("PONG_NET"),
+                       spectate=os.environ.get("PONG_SPECTATE"))
+        root.mainloop()
+        if game.spectators is not None:
+            game.spectators.close()
+    
+    # PONG_RECORD=match.rec: save the last match for pong_replay.py
+    if os.environ.get("PONG_RECORD") and getattr(game, "recorder", None) is not None:
+        game.recorder.finish()
+        game.recorder.recording.save(os.environ["PONG_RECORD"])
+    
+    # PONG_PROFILE=trace.json: print phase/latency percentiles and frame pacing, and save a Chrome trace
+    if getattr(game, "profiler", None) is not None:
+        rows = dict(game.profiler.summary())
+        if getattr(game, "loop", None) is not None:
+            rows["frame pacing"] = game.loop.pacing()
+        for name, stats in rows.items():
+            print(f"{name:16s} " + "  ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}"
+                                             for k, v in stats.items()))
+        if os.environ["PONG_PROFILE"]:
+            game.profiler.export_trace(os.environ["PONG_PROFILE"])
@@ -0,0 +1,204 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from red_tiles import TILE_TYPES, ENCOUNTER_RATE
+
+MAGIC = b"REDMAP\x01"
+# width, height, layer count, block size, spawn x, spawn y, metadata length, offset of the first layer
+HEADER = struct.Struct("<IIHHIIIQ")
+ALIGN = mmap.ALLOCATIONGRANULARITY  # layers start on a page, so each maps onto whole pages of the file
+BLOCK = 64  # layers are stored in BLOCK x BLOCK tile blocks: 4 KiB, a page each
+
+
+class EncounterZone:
+    """A rectangle of the map with its own wild encounter rate and, optionally, its own wild Pokémon"""
+
+    __slots__ = ("x", "y", "width", "height", "rate", "pokemon")
+
+    def __init__(self, x, y, width, height, rate, pokemon=()):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.rate = rate  # chance per step onto a tile that has encounters at all
+        self.pokemon = tuple(pokemon)
+
+    def __contains__(self, tile):
+        x, y = tile
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def to_json(self):
+        return {"rect": [self.x, self.y, self.width, self.height], "rate": self.rate, "pokemon": list(self.pokemon)}
+
+    @classmethod
+    def from_json(cls, zone):
+        return cls(*zone["rect"], zone["rate"], zone.get("pokemon", ()))
+
+
+def to_blocks(grid, block):
+    """grid padded out to whole blocks and reordered block by block, row-major within each"""
+    height, width = grid.shape
+    rows, cols = -(-height // block), -(-width // block)
+    padded = np.zeros((rows * block, cols * block), np.uint8)
+    padded[:height, :width] = grid
+    return padded.reshape(rows, block, cols, block).swapaxes(1, 2)
+
+
+def export_map(path, tiles, spawn=None, zones=(), layers=None, metadata=None, block=BLOCK):
+    """Write tiles, a uint8 grid of tile IDs, as a map file at path
+
+    layers maps the names of any further layers to grids of the same
+    shape; spawn is a tile (x, y) and defaults to the middle of the map;
+    metadata is anything else JSON can hold, kept alongside the zones.
+    """
+    tiles = np.asarray(tiles)
+    if tiles.dtype != np.uint8 or tiles.ndim != 2:
+        raise ValueError(f"tiles must be a 2-D uint8 grid, not {tiles.dtype} with {tiles.ndim} dimensions")
+    if tiles.size and tiles.max() >= len(TILE_TYPES):
+        raise ValueError(f"tile ID {tiles.max()} is not in the tile registry")
+    height, width = tiles.shape
+    grids = [tiles]
+    names = ["tiles"]
+    for name, grid in (layers or {}).items():
+        grid = np.asarray(grid, np.uint8)
+        if grid.shape != tiles.shape:
+            raise ValueError(f"layer {name!r} is {grid.shape}, not {tiles.shape} like the tiles")
+        grids.append(grid)
+        names.append(name)
+    spawn_x, spawn_y = spawn if spawn is not None else (width // 2, height // 2)
+    meta = dict(metadata or {}, layers=names, zones=[zone.to_json() for zone in zones])
+    meta = json.dumps(meta, separators=(",", ":")).encode()
+    start = len(MAGIC) + HEADER.size + len(meta)
+    data_offset = -(-start // ALIGN) * ALIGN
+    with open(path, "wb") as f:
+        f.write(MAGIC + HEADER.pack(width, height, len(grids), block, spawn_x, spawn_y, len(meta), data_offset))
+        f.write(meta)
+        f.write(bytes(data_offset - start))
+        for grid in grids:
+            f.write(np.ascontiguousarray(to_blocks(grid, block)).data)
+
+
+class TileLayer:
+    """One layer of a map file: reads like a [y, x] uint8 grid, from blocks straight over the mapping
+
+    shape, [y0:y1, x0:x1] slices and item(y, x) are all the chunk cache
+    and move_player use; a slice gathers just the blocks it covers.
+    """
+
+    def __init__(self, blocks, width, height):
+        self.blocks = blocks  # (block rows, block columns, block, block)
+        self.block = blocks.shape[2]
+        self.shape = (height, width)
+
+    def __getitem__(self, index):
+        rows, cols = index
+        y0, y1, _ = rows.indices(self.shape[0])
+        x0, x1, _ = cols.indices(self.shape[1])
+        b = self.block
+        by, bx = y0 // b, x0 // b
+        blocks = self.blocks[by:-(-y1 // b), bx:-(-x1 // b)]
+        region = blocks.swapaxes(1, 2).reshape(blocks.shape[0] * b, blocks.shape[1] * b)
+        return region[y0 - by * b:y1 - by * b, x0 - bx * b:x1 - bx * b]
+
+    def item(self, y, x):
+        b = self.block
+        return self.blocks.item(y // b, x // b, y % b, x % b)
+
+    def to_array(self):
+        """The whole layer as an ordinary [y, x] array (reads every block)"""
+        return self[:, :]
+
+
+class MapFile:
+    """A map file opened with mmap: its layers are TileLayers straight over the mapping
+
+    Opening reads just the header and metadata, whatever the size of the
+    map; the operating system pages a block of tiles in when it is first
+    read, so a game only ever holds the blocks round where it has been.
+    tiles is the tile ID layer, which reads like the grid generate_map
+    returns, and layers has it and any others by name. The tiles are not
+    checked on opening -- export_map checks them on the way in.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a redv0 map file")
+        (width, height, count, block, spawn_x, spawn_y, meta_length,
+         data_offset) = HEADER.unpack_from(self.mmap, len(MAGIC))
+        rows, cols = -(-height // block), -(-width // block)
+        size = rows * cols * block * block
+        if len(self.mmap) < data_offset + count * size:
+            raise ValueError(f"{path} is truncated")
+        if hasattr(mmap, "MADV_RANDOM"):  # not on Windows
+            self.mmap.madvise(mmap.MADV_RANDOM)  # a block at a time, wherever the player goes: no read-ahead
+        start = len(MAGIC) + HEADER.size
+        self.metadata = json.loads(self.mmap[start:start + meta_length])
+        self.spawn = (spawn_x, spawn_y)
+        self.zones = [EncounterZone.from_json(zone) for zone in self.metadata.get("zones", ())]
+        self.layers = {name: TileLayer(np.frombuffer(self.mmap, np.uint8, size, data_offset + i * size)
+                                       .reshape(rows, cols, block, block), width, height)
+                       for i, name in enumerate(self.metadata["layers"])}
+        self.tiles = self.layers["tiles"]
+
+    @property
+    def shape(self):
+        return self.tiles.shape
+
+    def zone_at(self, x, y):
+        """The first encounter zone tile (x, y) is in, or None"""
+        for zone in self.zones:
+            if (x, y) in zone:
+                return zone
+        return None
+
+    def encounter_rate(self, x, y, tile):
+        """Chance of a wild battle on stepping onto tile at (x, y): the zone's rate, if it has encounters at all"""
+        rate = ENCOUNTER_RATE[tile]
+        if rate:
+            zone = self.zone_at(x, y)
+            if zone is not None:
+                return zone.rate
+        return rate
+
+    def close(self):
+        """Let go of the layers and unmap the file
+
+        Arrays still held elsewhere that read from the mapping (a layer, or
+        a slice of one) keep it alive: it is then unmapped once the last of
+        them is freed.
+        """
+        self.layers = self.tiles = None
+        mapping, self.mmap = self.mmap, None
+        if mapping is not None:
+            try:
+                mapping.close()
+            except BufferError:
+                pass  # still exported; freed with the last array that uses it
+
+
+if __name__ == "__main__":
+    # python red_mapfile.py WIDTHxHEIGHT out.redmap -- export a generated map
+    # python red_mapfile.py map.redmap                -- time opening a map file and show what is in it
+    if len(sys.argv) > 2:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # redv0 opens its window on import
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        from redv0 import generate_map
+        width, height = (int(n) for n in sys.argv[1].split("x"))
+        export_map(sys.argv[2], generate_map(width, height))
+        print(f"wrote {width}x{height} map to {sys.argv[2]} ({os.path.getsize(sys.argv[2]):,} bytes)")
+    else:
+        start = time.perf_counter()
+        world = MapFile(sys.argv[1])
+        elapsed = time.perf_counter() - start
+        height, width = world.shape
+        print(f"{width}x{height} tiles, layers {', '.join(world.layers)}, spawn {world.spawn}, "
+              f"{len(world.zones)} encounter zones; opened in {elapsed * 1e6:.0f} us")
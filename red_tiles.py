@@ -0,0 +1,301 @@
+import math
+import random
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+GRASS_TILE = (0, 128, 0)  # Dark green for grass
+PATH_TILE = (200, 200, 200)  # Light gray for paths
+WATER_TILE = (0, 0, 255)  # Blue for water
+TREE_TILE = (0, 100, 0)  # Dark green for trees
+BUILDING_TILE = (150, 75, 0)  # Brown for buildings
+GRASS_BLADE = (0, 180, 0)
+WAVE = (100, 100, 255)
+TREE_TOP = (0, 80, 0)
+WINDOW = (100, 100, 255)
+
+
+class TileType:
+    """What the game needs to know about one kind of tile; name is also the key it is drawn by"""
+
+    __slots__ = ("id", "name", "walkable", "encounter_rate")
+
+    def __init__(self, id, name, walkable, encounter_rate=0.0):
+        self.id = id
+        self.name = name
+        self.walkable = walkable
+        self.encounter_rate = encounter_rate  # chance of a wild battle per step onto the tile
+
+
+# The tile registry: maps are uint8 grids of these IDs
+GRASS, PATH, WATER, TREE, BUILDING = range(5)
+TILE_REGISTRY = (
+    TileType(GRASS, "grass", True, 0.005),
+    TileType(PATH, "path", True),
+    TileType(WATER, "water", False),
+    TileType(TREE, "tree", False),
+    TileType(BUILDING, "building", True),
+)
+# Per-ID lookup tables, indexed by a map cell
+TILE_TYPES = tuple(tile.name for tile in TILE_REGISTRY)
+WALKABLE = bytes(tile.walkable for tile in TILE_REGISTRY)
+ENCOUNTER_RATE = tuple(tile.encounter_rate for tile in TILE_REGISTRY)
+
+DECORATED = (GRASS, WATER)  # tiles with randomly placed blades or waves, drawn in several variants
+ANIMATED = (WATER,)  # tiles whose decorations drift across the tile over the animation frames
+
+
+def tile_hash(x, y, seed=0):
+    """A well-mixed 32-bit hash of tile (x, y), the same on every frame and every run with the same seed
+
+    x and y may also be uint32 arrays, hashed element by element.
+    """
+    h = (x * 0x9E3779B1 ^ y * 0x85EBCA77 ^ seed) & 0xFFFFFFFF
+    h = ((h ^ (h >> 16)) * 0x7FEB352D) & 0xFFFFFFFF
+    h = ((h ^ (h >> 15)) * 0x846CA68B) & 0xFFFFFFFF
+    return h ^ (h >> 16)
+
+
+def draw_tile(surface, kind, x, y, size, rng, phase=0):
+    """Draw one tile of kind with its top-left at (x, y), as the overworld always has
+
+    phase shifts the waves of a water tile right by that many pixels,
+    wrapping round; the wrapped copies are only clipped away when
+    surface is the tile itself.
+    """
+    if kind == "grass":
+        pygame.draw.rect(surface, GRASS_TILE, (x, y, size, size))
+        # Draw grass pattern
+        for i in range(3):
+            offset_x = rng.randint(0, size - 5)
+            offset_y = rng.randint(0, size - 5)
+            pygame.draw.line(surface, GRASS_BLADE, (x + offset_x, y + offset_y),
+                             (x + offset_x, y + offset_y + 3), 2)
+    elif kind == "path":
+        pygame.draw.rect(surface, PATH_TILE, (x, y, size, size))
+    elif kind == "water":
+        pygame.draw.rect(surface, WATER_TILE, (x, y, size, size))
+        # Draw wave pattern
+        for i in range(4):
+            offset_x = (rng.randint(0, size - 5) + phase) % size
+            offset_y = rng.randint(0, size - 5)
+            pygame.draw.arc(surface, WAVE, (x + offset_x, y + offset_y, 10, 5), 0, math.pi, 2)
+            if phase:
+                pygame.draw.arc(surface, WAVE, (x + offset_x - size, y + offset_y, 10, 5), 0, math.pi, 2)
+    elif kind == "tree":
+        pygame.draw.rect(surface, GRASS_TILE, (x, y, size, size))
+        pygame.draw.rect(surface, TREE_TILE, (x + size // 3, y, size // 3, size))
+        pygame.draw.circle(surface, TREE_TOP, (x + size // 2, y - 5), size // 2)
+    elif kind == "building":
+        pygame.draw.rect(surface, BUILDING_TILE, (x, y, size, size))
+        pygame.draw.rect(surface, WINDOW, (x + size // 4, y + size // 3, size // 2, size // 3))
+
+
+class TileAtlas:
+    """Every tile type rendered once into converted surfaces, drawn with one blits() call per frame
+
+    Tree tops overhang the tile above, so each tile image is an (image, dy)
+    pair: the image is blitted dy pixels above its tile. Grass and water
+    are rendered in variants decorations each, and which variant a tile
+    shows comes from tile_hash of its position, so the map looks varied
+    but never changes from one frame to the next. Water is also rendered
+    in water_frames frames with its waves drifting a step further across
+    each; frames[i][tile ID] holds the images for animation frame i, and
+    the other kinds share theirs across all frames.
+    """
+
+    def __init__(self, tile_size, seed=None, variants=8, water_frames=4):
+        self.tile_size = tile_size
+        rng = random.Random(seed)
+        self.seed = rng.getrandbits(32)
+        self.variants = variants
+        self.water_frames = water_frames
+        overhang = tile_size // 2 + 5  # tree tops reach this far into the tile above
+        self.frames = [[] for _ in range(water_frames)]
+        for tile, kind in enumerate(TILE_TYPES):
+            top = overhang if tile == TREE else 0
+            frames = water_frames if tile in ANIMATED else 1
+            images = [[] for _ in range(frames)]
+            for variant in range(variants if tile in DECORATED else 1):
+                state = rng.getstate()  # every frame of a variant places the same waves
+                for frame in range(frames):
+                    rng.setstate(state)
+                    image = pygame.Surface((tile_size, tile_size + top), pygame.SRCALPHA)
+                    draw_tile(image, kind, 0, top, tile_size, rng, frame * tile_size // frames)
+                    image = image.convert_alpha() if top else image.convert()
+                    images[frame].append((image, -top))
+            for frame, tiles in enumerate(self.frames):
+                tiles.append(images[frame % frames])
+        self.tiles = self.frames[0]
+        self.overhang_rows = -(-overhang // tile_size)  # rows below a region that can reach into it
+
+    def draw(self, surface, world_map, camera_x, camera_y, frame=0):
+        """Draw the part of world_map, a grid of tile IDs, under the camera onto surface at animation frame"""
+        size = self.tile_size
+        width, height = surface.get_size()
+        start_x = max(0, camera_x // size)
+        start_y = max(0, camera_y // size)
+        end_x = min(world_map.shape[1], (camera_x + width) // size + 1)
+        end_y = min(world_map.shape[0], (camera_y + height) // size + 1 + self.overhang_rows)
+        tiles = self.frames[frame % self.water_frames]
+        seed = self.seed
+        blits = []
+        for y, row in enumerate(world_map[start_y:end_y, start_x:end_x].tolist(), start_y):
+            tile_y = y * size - camera_y
+            for x, tile in enumerate(row, start_x):
+                images = tiles[tile]
+                image, dy = images[tile_hash(x, y, seed) % len(images)]
+                blits.append((image, (x * size - camera_x, tile_y + dy)))
+        surface.blits(blits, doreturn=False)
+
+
+class ChunkCache:
+    """The map pre-rendered in chunk_tiles x chunk_tiles chunks, built on first view and kept in an LRU
+
+    Chunks are opaque surfaces drawn from a TileAtlas; once built, a frame
+    is just the two to four chunks under the camera whatever the map
+    size. A chunk with water in it is kept once per animation frame, so
+    the water moves without redrawing a tile. After drawing, up to ahead
+    chunks are built before they are needed -- the next water frame of
+    those in view, then those just past the edge of the view the camera
+    is heading for -- so scrolling into new ground rarely has to build
+    several at once. The least recently drawn chunks are evicted when the
+    cache holds more than budget bytes (chunks in view are never dropped
+    while being drawn; a budget below the chunks for one screen just
+    rebuilds them every frame, and builds none ahead). invalidate()
+    discards the chunks a changed tile appears in.
+    """
+
+    def __init__(self, atlas, world_map, chunk_tiles=16, budget=32 * 1024 * 1024, ahead=1):
+        self.atlas = atlas
+        self.world_map = world_map
+        self.chunk_tiles = chunk_tiles
+        self.budget = budget
+        self.ahead = ahead
+        self.camera = None  # where the last frame was drawn from, for the direction of travel
+        # Tiles that overhang upwards spill into the chunk above: build each chunk with the rows below it
+        self.extra_rows = atlas.overhang_rows
+        self.chunks = OrderedDict()  # (chunk x, chunk y, frame) -> (surface, bytes)
+        self.animated = {}  # (chunk x, chunk y) -> whether it shows an animated tile, while any frame is cached
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.prefetched = 0
+        self.build_time = 0.0
+
+    def is_animated(self, cx, cy):
+        animated = self.animated.get((cx, cy))
+        if animated is None:
+            n = self.chunk_tiles
+            animated = bool(np.isin(self.world_map[cy * n:cy * n + n, cx * n:cx * n + n], ANIMATED).any())
+            self.animated[(cx, cy)] = animated
+        return animated
+
+    def build(self, cx, cy, frame=0):
+        """Render chunk (cx, cy) at animation frame into a new surface"""
+        start = time.perf_counter()
+        world_map = self.world_map
+        size = self.atlas.tile_size
+        n = self.chunk_tiles
+        x0, y0 = cx * n, cy * n
+        x1 = min(x0 + n, world_map.shape[1])
+        y1 = min(y0 + n, world_map.shape[0])
+        # Made in the display's format rather than converted to it, which would cost a copy of every pixel
+        surface = pygame.Surface(((x1 - x0) * size, (y1 - y0) * size), 0, pygame.display.get_surface())
+        tiles = self.atlas.frames[frame]
+        seed = self.atlas.seed
+        blits = []
+        for y, row in enumerate(world_map[y0:y1 + self.extra_rows, x0:x1].tolist(), y0):
+            tile_y = (y - y0) * size
+            below = y >= y1  # only the overhang of these rows lands in this chunk
+            for x, tile in enumerate(row, x0):
+                images = tiles[tile]
+                image, dy = images[tile_hash(x, y, seed) % len(images)]
+                if not below or dy < 0:
+                    blits.append((image, ((x - x0) * size, tile_y + dy)))
+        surface.blits(blits, doreturn=False)
+        self.build_time += time.perf_counter() - start
+        return surface
+
+    def key(self, cx, cy, frame):
+        return cx, cy, frame % self.atlas.water_frames if self.is_animated(cx, cy) else 0
+
+    def get(self, cx, cy, frame=0):
+        key = self.key(cx, cy, frame)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.hits += 1
+            self.chunks.move_to_end(key)
+            return chunk[0]
+        self.misses += 1
+        return self.add(key)
+
+    def add(self, key):
+        surface = self.build(*key)
+        nbytes = surface.get_pitch() * surface.get_height()
+        self.chunks[key] = (surface, nbytes)
+        self.bytes += nbytes
+        while self.bytes > self.budget and len(self.chunks) > 1:
+            (cx, cy, _), (_, dropped) = self.chunks.popitem(last=False)
+            self.bytes -= dropped
+            self.evictions += 1
+            if not any((cx, cy, frame) in self.chunks for frame in range(self.atlas.water_frames)):
+                self.animated.pop((cx, cy), None)  # or it grows with every chunk of a streamed world
+        return surface
+
+    def draw(self, surface, camera_x, camera_y, frame=0):
+        """Draw the map under the camera at animation frame onto surface from (and into) the cache"""
+        span = self.chunk_tiles * self.atlas.tile_size
+        width, height = surface.get_size()
+        chunks_x = -(-self.world_map.shape[1] // self.chunk_tiles)
+        chunks_y = -(-self.world_map.shape[0] // self.chunk_tiles)
+        start_x = max(0, int(camera_x) // span)
+        start_y = max(0, int(camera_y) // span)
+        end_x = min(chunks_x, (int(camera_x) + width - 1) // span + 1)
+        end_y = min(chunks_y, (int(camera_y) + height - 1) // span + 1)
+        visible = [(cx, cy) for cy in range(start_y, end_y) for cx in range(start_x, end_x)]
+        surface.blits([(self.get(cx, cy, frame), (cx * span - camera_x, cy * span - camera_y))
+                       for cx, cy in visible], doreturn=False)
+        if self.ahead and len(self.chunks) > len(visible):  # room beyond the view: the LRU will not drop it
+            hx = hy = 0
+            if self.camera is not None:
+                hx = (camera_x > self.camera[0]) - (camera_x < self.camera[0])
+                hy = (camera_y > self.camera[1]) - (camera_y < self.camera[1])
+            upcoming = [(cx, cy, frame + 1) for cx, cy in visible]
+            if hx:
+                cx = end_x if hx > 0 else start_x - 1
+                upcoming += [(cx, cy, frame) for cy in range(start_y, end_y) if 0 <= cx < chunks_x]
+            if hy:
+                cy = end_y if hy > 0 else start_y - 1
+                upcoming += [(cx, cy, frame) for cx in range(start_x, end_x) if 0 <= cy < chunks_y]
+            self.prefetch(upcoming)
+        self.camera = (camera_x, camera_y)
+
+    def prefetch(self, upcoming):
+        """Build the first self.ahead of the (chunk x, chunk y, frame) in upcoming that are not cached yet"""
+        built = 0
+        for cx, cy, frame in upcoming:
+            if built == self.ahead:
+                break
+            key = self.key(cx, cy, frame)
+            if key not in self.chunks:
+                self.add(key)
+                self.prefetched += 1
+                built += 1
+
+    def invalidate(self, tile_x, tile_y):
+        """Forget the chunks that show tile (tile_x, tile_y), so they are rebuilt on next view"""
+        n = self.chunk_tiles
+        cx = tile_x // n
+        # The tile's own chunk, and those above it that its overhang may reach
+        for cy in range((tile_y - self.extra_rows) // n, tile_y // n + 1):
+            self.animated.pop((cx, cy), None)
+            for frame in range(self.atlas.water_frames):
+                chunk = self.chunks.pop((cx, cy, frame), None)
+                if chunk is not None:
+                    self.bytes -= chunk[1]
+
+    def stats(self):
+        return {"chunks": len(self.chunks), "bytes": self.bytes, "budget": self.budget, "hits": self.hits,
+                "misses": self.misses, "prefetched": self.prefetched, "evictions": self.evictions,
+                "build_ms": self.build_time * 1000}
@@ -0,0 +1,267 @@
+import multiprocessing
+import os
+import signal
+import struct
+import threading
+import time
+
+import numpy as np
+
+from red_tiles import GRASS, PATH, WATER, TREE, BUILDING, WALKABLE, tile_hash
+
+WORLD_TILES = 1 << 20  # tiles along each side of a streamed world: for walking purposes, endless
+CHUNK = struct.Struct("<ii")  # chunk x, y ahead of its tiles in a worker's reply
+
+# Terrain, as levels of the noise fields each decides on
+SEA_LEVEL = 0.335  # elevation below this is water
+FOREST_LEVEL = 0.63  # forest density above this is trees
+ROAD_WIDTH = 0.004  # roads follow the 0.5 contour of two noise fields, this far either side of it
+BUILDING_ODDS = 40  # about one in this many grass tiles beside a road has a building
+
+
+def value_noise(xs, ys, scale, seed):
+    """Smooth noise in [0, 1) over rows ys by columns xs (ascending tile coordinates), features about scale tiles across"""
+    fx = xs / scale
+    fy = ys / scale
+    ix = np.floor(fx).astype(np.int64)
+    iy = np.floor(fy).astype(np.int64)
+    tx = fx - ix
+    ty = fy - iy
+    tx = tx * tx * (3 - 2 * tx)
+    ty = (ty * ty * (3 - 2 * ty))[:, None]
+    # Hashed heights on just the lattice points round the grid, eased between along x and then y
+    lattice_x = np.arange(ix[0], ix[-1] + 2).astype(np.uint32)
+    lattice_y = np.arange(iy[0], iy[-1] + 2).astype(np.uint32)
+    heights = tile_hash(lattice_x[None, :], lattice_y[:, None], seed) / 2**32
+    ix -= ix[0]
+    iy -= iy[0]
+    rows = heights[:, ix] + (heights[:, ix + 1] - heights[:, ix]) * tx
+    return rows[iy] + (rows[iy + 1] - rows[iy]) * ty
+
+
+def fractal_noise(xs, ys, scale, seed, octaves=3):
+    """value_noise summed over octaves, each half the scale and weight of the last"""
+    total = 0.0
+    weight = 1.0
+    weights = 0.0
+    for octave in range(octaves):
+        total = total + value_noise(xs, ys, scale, (seed + octave * 0x632BE5AB) & 0xFFFFFFFF) * weight
+        weights += weight
+        weight /= 2
+        scale /= 2
+    return total / weights
+
+
+def generate_chunk(seed, cx, cy, size=16):
+    """Tiles of chunk (cx, cy) of the world for seed, as a size x size uint8 grid of tile IDs
+
+    Every tile is a function of the seed and its own coordinates, so
+    chunks can be made in any order, on any worker, and still meet
+    seamlessly.
+    """
+    x0, y0 = cx * size, cy * size
+    # One tile of margin all round: buildings look at their neighbours
+    xs = np.arange(x0 - 1, x0 + size + 1)
+    ys = np.arange(y0 - 1, y0 + size + 1)
+    seed &= 0xFFFFFFFF
+    elevation = fractal_noise(xs, ys, 64, seed ^ 0x1B873593)
+    forest = fractal_noise(xs, ys, 24, seed ^ 0xCC9E2D51)
+    roads = ((abs(fractal_noise(xs, ys, 96, seed ^ 0xE6546B64, 2) - 0.5) < ROAD_WIDTH) |
+             (abs(fractal_noise(xs, ys, 96, seed ^ 0x85EBCA6B, 2) - 0.5) < ROAD_WIDTH))
+    tiles = np.full(elevation.shape, GRASS, np.uint8)
+    tiles[forest > FOREST_LEVEL] = TREE
+    tiles[elevation < SEA_LEVEL] = WATER
+    tiles[roads] = PATH  # roads cross forests and water alike, so the world stays connected
+    tiles = tiles[1:-1, 1:-1]
+    beside_road = roads[1:-1, :-2] | roads[1:-1, 2:] | roads[:-2, 1:-1] | roads[2:, 1:-1]
+    lots = tile_hash(xs[None, 1:-1].astype(np.uint32), ys[1:-1, None].astype(np.uint32), seed ^ 0x27D4EB2F) % BUILDING_ODDS
+    tiles[beside_road & (tiles == GRASS) & (lots == 0)] = BUILDING
+    return np.ascontiguousarray(tiles)
+
+
+def _generate(conn, seed, size):
+    """Worker loop: generate each chunk asked for over conn and send it back, until conn closes"""
+    try:
+        while True:
+            cx, cy = conn.recv()
+            conn.send_bytes(CHUNK.pack(cx, cy) + generate_chunk(seed, cx, cy, size).tobytes())
+    except (EOFError, OSError):
+        pass
+
+
+def _generate_process(conn, seed, size, inherited):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C is the game's; it stops us by closing the pipe
+    for end in inherited:
+        end.close()
+    # Only take a core the game is not using: on a single core, just the time it sleeps in clock.tick
+    try:
+        os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    except (AttributeError, OSError):
+        try:
+            os.nice(19)
+        except (AttributeError, OSError):
+            pass
+    _generate(conn, seed, size)
+
+
+class StreamingWorld:
+    """A seeded world of WORLD_TILES x WORLD_TILES tiles, generated chunk by chunk ahead of the camera
+
+    It reads like the grid generate_map returns -- shape, [y0:y1, x0:x1]
+    slices and item(y, x) -- so the chunk cache and move_player use it
+    as they are. update(), called once a frame with the tiles in view,
+    collects finished chunks from the worker and asks it for the ones
+    around the view, reaching lookahead chunks further in the direction
+    the camera is moving, nearest first and at most in_flight at a time.
+    worker is "process" (the default: generation never holds the game's
+    GIL, and runs at idle priority), "thread" or None. A chunk that is read before the worker has
+    sent it is generated on the spot; those stalls are counted in
+    stats(). Chunks more than keep chunks from the view are forgotten,
+    as they can always be made again.
+    """
+
+    def __init__(self, seed, chunk_tiles=16, worker="process", lookahead=3, in_flight=8, keep=12, context=None):
+        self.seed = seed
+        self.chunk_tiles = chunk_tiles
+        self.shape = (WORLD_TILES, WORLD_TILES)
+        self.worker = worker
+        self.lookahead = lookahead
+        self.in_flight = in_flight
+        self.keep = keep
+        self.context = context
+        self.chunks = {}  # (chunk x, chunk y) -> uint8 grid
+        self.pending = set()  # asked of the worker, not yet back
+        self.wanted = []  # chunks to have around the view, most urgent first
+        self.view = None  # chunk range and heading self.wanted is for
+        self.heading = (0, 0)
+        self.center = None
+        self.generated = self.stalls = self.dropped = 0
+        self.stall_time = self.max_stall = 0.0
+        self.conn = None
+        self.process = None
+
+    def start(self):
+        """Start the worker, if there is one; returns self"""
+        if self.worker is None:
+            return self
+        ctx = multiprocessing.get_context(self.context)
+        parent, child = ctx.Pipe()
+        if self.worker == "thread":
+            self.process = threading.Thread(target=_generate, name="red-world", daemon=True,
+                                            args=(child, self.seed, self.chunk_tiles))
+        else:
+            self.process = ctx.Process(target=_generate_process, name="red-world", daemon=True,
+                                       args=(child, self.seed, self.chunk_tiles, (parent,)))
+        self.process.start()
+        if self.worker != "thread":
+            child.close()
+        self.conn = parent
+        return self
+
+    def chunk(self, cx, cy):
+        """The tiles of chunk (cx, cy), generated now if the worker has not delivered them"""
+        tiles = self.chunks.get((cx, cy))
+        if tiles is None:
+            start = time.perf_counter()
+            tiles = self.chunks[(cx, cy)] = generate_chunk(self.seed, cx, cy, self.chunk_tiles)
+            elapsed = time.perf_counter() - start
+            self.stalls += 1
+            self.stall_time += elapsed
+            self.max_stall = max(self.max_stall, elapsed)
+        return tiles
+
+    def __getitem__(self, index):
+        rows, cols = index
+        y0, y1, _ = rows.indices(self.shape[0])
+        x0, x1, _ = cols.indices(self.shape[1])
+        n = self.chunk_tiles
+        tiles = np.empty((max(0, y1 - y0), max(0, x1 - x0)), np.uint8)
+        if not tiles.size:
+            return tiles
+        for cy in range(y0 // n, (y1 - 1) // n + 1):
+            top = max(y0, cy * n)
+            bottom = min(y1, cy * n + n)
+            for cx in range(x0 // n, (x1 - 1) // n + 1):
+                left = max(x0, cx * n)
+                right = min(x1, cx * n + n)
+                tiles[top - y0:bottom - y0, left - x0:right - x0] = \
+                    self.chunk(cx, cy)[top - cy * n:bottom - cy * n, left - cx * n:right - cx * n]
+        return tiles
+
+    def item(self, y, x):
+        n = self.chunk_tiles
+        return self.chunk(x // n, y // n).item(y % n, x % n)
+
+    def find_walkable(self, x, y, radius=64):
+        """The walkable tile nearest (x, y) within radius tiles, or (x, y) if there is none"""
+        x0, y0 = max(0, x - radius), max(0, y - radius)
+        walkable = np.frombuffer(WALKABLE, np.uint8)[self[y0:y + radius + 1, x0:x + radius + 1]]
+        ys, xs = np.nonzero(walkable)
+        if not len(xs):
+            return x, y
+        nearest = np.argmin((xs + x0 - x) ** 2 + (ys + y0 - y) ** 2)
+        return int(xs[nearest]) + x0, int(ys[nearest]) + y0
+
+    def update(self, x0, y0, x1, y1):
+        """Take in finished chunks and ask for more around tiles [x0, x1) x [y0, y1), the camera's view"""
+        n = self.chunk_tiles
+        conn = self.conn
+        while conn is not None and conn.poll():
+            data = conn.recv_bytes()
+            key = CHUNK.unpack_from(data)
+            self.pending.discard(key)
+            self.chunks.setdefault(key, np.frombuffer(data, np.uint8, offset=CHUNK.size).reshape(n, n))
+            self.generated += 1
+        center = ((x0 + x1) // 2, (y0 + y1) // 2)
+        if self.center is not None and center != self.center:
+            self.heading = (int(np.sign(center[0] - self.center[0])), int(np.sign(center[1] - self.center[1])))
+        self.center = center
+        view = (x0 // n, y0 // n, (x1 - 1) // n + 1, (y1 - 1) // n + 1)
+        if (view, self.heading) != self.view:
+            self.view = (view, self.heading)
+            self.plan(*view)
+        if conn is not None:
+            for key in self.wanted:
+                if len(self.pending) >= self.in_flight:
+                    break
+                if key not in self.chunks and key not in self.pending:
+                    self.pending.add(key)
+                    conn.send(key)
+        if len(self.chunks) > len(self.wanted) + 4 * self.keep * self.keep:
+            self.forget(*view)
+
+    def plan(self, left, top, right, bottom):
+        """Order the chunks to have for view chunks [left, right) x [top, bottom), most urgent first"""
+        hx, hy = self.heading
+        # The view and two chunks round it (the chunk cache renders one past the view ahead of time,
+        # reading the top rows of the chunk below that for their overhang), and lookahead chunks
+        # more in the direction of travel
+        ahead = self.lookahead
+        limit = self.shape[1] // self.chunk_tiles
+        xs = range(max(0, left - 2 + min(0, hx * ahead)), min(limit, right + 2 + max(0, hx * ahead)))
+        ys = range(max(0, top - 2 + min(0, hy * ahead)), min(limit, bottom + 2 + max(0, hy * ahead)))
+        # In view first, then nearest a point ahead of the view
+        mid_x = (left + right) / 2 + hx * ahead / 2
+        mid_y = (top + bottom) / 2 + hy * ahead / 2
+        self.wanted = sorted(((cx, cy) for cy in ys for cx in xs),
+                             key=lambda c: (not (left <= c[0] < right and top <= c[1] < bottom),
+                                            (c[0] - mid_x) ** 2 + (c[1] - mid_y) ** 2))
+
+    def forget(self, left, top, right, bottom):
+        keep = self.keep
+        for cx, cy in list(self.chunks):
+            if cx < left - keep or cx >= right + keep or cy < top - keep or cy >= bottom + keep:
+                del self.chunks[(cx, cy)]
+                self.dropped += 1
+
+    def stats(self):
+        return {"chunks": len(self.chunks), "pending": len(self.pending), "generated": self.generated,
+                "stalls": self.stalls, "stall_ms": self.stall_time * 1000, "max_stall_ms": self.max_stall * 1000,
+                "dropped": self.dropped}
+
+    def close(self):
+        if self.conn is None:
+            return
+        self.conn.close()
+        self.process.join()
+        self.conn = self.process = None
@@ -1,9 +1,12 @@
 import pygame
 import sys
 import random
-import math
 import os
+import numpy as np
 from pygame.locals import *
+from red_tiles import TileAtlas, ChunkCache, GRASS, PATH, WATER, TREE, BUILDING, WALKABLE, ENCOUNTER_RATE
+from red_world import StreamingWorld
+from red_mapfile import MapFile
 
 # Initialize pygame
 pygame.init()
@@ -12,12 +15,11 @@ pygame.font.init()
 # Game constants
 WIDTH, HEIGHT = 600, 400
 FPS = 60
-TILE_SIZE = 32
-GRASS_TILE = (0, 128, 0)  # Dark green for grass
-PATH_TILE = (200, 200, 200)  # Light gray for paths
-WATER_TILE = (0, 0, 255)  # Blue for water
-TREE_TILE = (0, 100, 0)  # Dark green for trees
-BUILDING_TILE = (150, 75, 0)  # Brown for buildings
+TILE_SIZE = 32  # tile colors and drawing live in red_tiles
+CHUNK_TILES = 16  # the map is pre-rendered in chunks of CHUNK_TILES x CHUNK_TILES tiles
+CHUNK_BUDGET = 32 * 1024 * 1024  # bytes of chunk surfaces kept before the least recently seen go
+WATER_FRAME_MS = 250  # how long each frame of the water animation shows
+DECORATION_SEED = 0  # grass and water decorations, the same on every run (a streamed world uses its own seed)
 
 # Player colors
 PLAYER_COLORS = {
@@ -76,36 +78,47 @@ battle_text = ""
 battle_text_timer = 0
 battle_state = "player_choice"  # player_choice, enemy_turn, battle_text, victory, defeat
 
-# Create a simple world map
+# Create a simple world map: a uint8 grid of tile IDs (see red_tiles.TILE_REGISTRY), indexed [y, x]
 def generate_map(width, height):
-    world_map = []
-    for y in range(height):
-        row = []
-        for x in range(width):
-            # Create paths along the center
-            if (x > width//2 - 3 and x < width//2 + 3) or (y > height//2 - 3 and y < height//2 + 3):
-                row.append("path")
-            # Create water on edges
-            elif x < 3 or x > width - 4 or y < 3 or y > height - 4:
-                row.append("water")
-            # Create trees in some areas
-            elif (x > 10 and x < 20 and y > 10 and y < 20) or (x > 30 and x < 40 and y > 30 and y < 40):
-                row.append("tree")
-            # Create buildings
-            elif (x == 15 and y == 5) or (x == 35 and y == 25) or (x == 5 and y == 35):
-                row.append("building")
-            # The rest is grass
-            else:
-                row.append("grass")
-        world_map.append(row)
+    # The rest is grass; later layers paint over earlier ones
+    world_map = np.full((height, width), GRASS, np.uint8)
+    # Create buildings
+    for x, y in ((15, 5), (35, 25), (5, 35)):
+        if x < width and y < height:
+            world_map[y, x] = BUILDING
+    # Create trees in some areas
+    world_map[11:20, 11:20] = TREE
+    world_map[31:40, 31:40] = TREE
+    # Create water on edges
+    world_map[:3] = WATER
+    world_map[max(0, height - 3):] = WATER
+    world_map[:, :3] = WATER
+    world_map[:, max(0, width - 3):] = WATER
+    # Create paths along the center
+    world_map[:, max(0, width // 2 - 2):width // 2 + 3] = PATH
+    world_map[max(0, height // 2 - 2):height // 2 + 3] = PATH
     return world_map
 
-# Generate a 20x15 map (since 20*32=640, 15*32=480 - we'll only show part of it)
-world_map = generate_map(20, 15)
+# Generate a 20x15 map (since 20*32=640, 15*32=480 - we'll only show part of it),
+# or e.g. RED_MAP=1000x1000 for a large world, or RED_MAP=overworld.redmap to open a
+# map file (see red_mapfile). RED_WORLD=<seed> walks an endless seeded world instead,
+# generated on a worker ahead of the camera as it goes
+map_file = None
+if os.environ.get("RED_WORLD"):
+    world_map = StreamingWorld(int(os.environ["RED_WORLD"]), CHUNK_TILES).start()
+    start_x, start_y = world_map.find_walkable(world_map.shape[1] // 2, world_map.shape[0] // 2)
+    player_pos = [start_x * TILE_SIZE + TILE_SIZE // 2, start_y * TILE_SIZE + TILE_SIZE // 2]
+elif os.environ.get("RED_MAP", "").endswith(".redmap"):
+    map_file = MapFile(os.environ["RED_MAP"])
+    world_map = map_file.tiles
+    player_pos = [map_file.spawn[0] * TILE_SIZE + TILE_SIZE // 2, map_file.spawn[1] * TILE_SIZE + TILE_SIZE // 2]
+else:
+    MAP_WIDTH, MAP_HEIGHT = (int(n) for n in os.environ.get("RED_MAP", "20x15").split("x"))
+    world_map = generate_map(MAP_WIDTH, MAP_HEIGHT)
 
 # Camera position (to show part of the world)
-camera_x = max(0, min(player_pos[0] - WIDTH // 2, len(world_map[0]) * TILE_SIZE - WIDTH))
-camera_y = max(0, min(player_pos[1] - HEIGHT // 2, len(world_map) * TILE_SIZE - HEIGHT))
+camera_x = max(0, min(player_pos[0] - WIDTH // 2, world_map.shape[1] * TILE_SIZE - WIDTH))
+camera_y = max(0, min(player_pos[1] - HEIGHT // 2, world_map.shape[0] * TILE_SIZE - HEIGHT))
 
 # Pokemon data
 pokemon_data = {
@@ -117,46 +130,17 @@ pokemon_data = {
     "Rattata": {"type": "Normal", "color": (128, 128, 128)}
 }
 
+# Every tile type is drawn once into the atlas, and the map into chunks from it as
+# they come into view; a frame is then the two to four chunks under the camera
+tile_atlas = TileAtlas(TILE_SIZE, seed=int(os.environ.get("RED_WORLD") or DECORATION_SEED))
+world_chunks = ChunkCache(tile_atlas, world_map, CHUNK_TILES, CHUNK_BUDGET)
+
 # Draw the world map
 def draw_world():
-    # Calculate which tiles are visible
-    start_x = max(0, camera_x // TILE_SIZE)
-    start_y = max(0, camera_y // TILE_SIZE)
-    end_x = min(len(world_map[0]), (camera_x + WIDTH) // TILE_SIZE + 1)
-    end_y = min(len(world_map), (camera_y + HEIGHT) // TILE_SIZE + 1)
-    
-    for y in range(start_y, end_y):
-        for x in range(start_x, end_x):
-            tile_x = x * TILE_SIZE - camera_x
-            tile_y = y * TILE_SIZE - camera_y
-            
-            if world_map[y][x] == "grass":
-                pygame.draw.rect(screen, GRASS_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
-                # Draw grass pattern
-                for i in range(3):
-                    offset_x = random.randint(0, TILE_SIZE-5)
-                    offset_y = random.randint(0, TILE_SIZE-5)
-                    pygame.draw.line(screen, (0, 180, 0), 
-                                    (tile_x + offset_x, tile_y + offset_y),
-                                    (tile_x + offset_x, tile_y + offset_y + 3), 2)
-            elif world_map[y][x] == "path":
-                pygame.draw.rect(screen, PATH_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
-            elif world_map[y][x] == "water":
-                pygame.draw.rect(screen, WATER_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
-                # Draw wave pattern
-                for i in range(4):
-                    offset_x = random.randint(0, TILE_SIZE-5)
-                    offset_y = random.randint(0, TILE_SIZE-5)
-                    pygame.draw.arc(screen, (100, 100, 255), 
-                                   (tile_x + offset_x, tile_y + offset_y, 10, 5), 
-                                   0, math.pi, 2)
-            elif world_map[y][x] == "tree":
-                pygame.draw.rect(screen, GRASS_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
-                pygame.draw.rect(screen, TREE_TILE, (tile_x + TILE_SIZE//3, tile_y, TILE_SIZE//3, TILE_SIZE))
-                pygame.draw.circle(screen, (0, 80, 0), (tile_x + TILE_SIZE//2, tile_y - 5), TILE_SIZE//2)
-            elif world_map[y][x] == "building":
-                pygame.draw.rect(screen, BUILDING_TILE, (tile_x, tile_y, TILE_SIZE, TILE_SIZE))
-                pygame.draw.rect(screen, (100, 100, 255), (tile_x + TILE_SIZE//4, tile_y + TILE_SIZE//3, TILE_SIZE//2, TILE_SIZE//3))
+    if isinstance(world_map, StreamingWorld):
+        world_map.update(camera_x // TILE_SIZE, camera_y // TILE_SIZE,
+                         (camera_x + WIDTH) // TILE_SIZE + 1, (camera_y + HEIGHT) // TILE_SIZE + 1)
+    world_chunks.draw(screen, camera_x, camera_y, pygame.time.get_ticks() // WATER_FRAME_MS)
 
 # Draw the player
 def draw_player():
@@ -353,21 +337,23 @@ def move_player(dx, dy):
     new_y = player_pos[1] + dy
     
     # Check map bounds
-    if 0 <= new_x < len(world_map[0]) * TILE_SIZE and 0 <= new_y < len(world_map) * TILE_SIZE:
+    if 0 <= new_x < world_map.shape[1] * TILE_SIZE and 0 <= new_y < world_map.shape[0] * TILE_SIZE:
         # Check if tile is walkable (not water or tree)
         tile_x = int(new_x // TILE_SIZE)
         tile_y = int(new_y // TILE_SIZE)
+        tile = world_map.item(tile_y, tile_x)
         
-        if world_map[tile_y][tile_x] not in ["water", "tree"]:
+        if WALKABLE[tile]:
             player_pos[0] = new_x
             player_pos[1] = new_y
             
             # Update camera to follow player
-            camera_x = max(0, min(player_pos[0] - WIDTH // 2, len(world_map[0]) * TILE_SIZE - WIDTH))
-            camera_y = max(0, min(player_pos[1] - HEIGHT // 2, len(world_map) * TILE_SIZE - HEIGHT))
+            camera_x = max(0, min(player_pos[0] - WIDTH // 2, world_map.shape[1] * TILE_SIZE - WIDTH))
+            camera_y = max(0, min(player_pos[1] - HEIGHT // 2, world_map.shape[0] * TILE_SIZE - HEIGHT))
             
             # Random encounter in grass
-            if world_map[tile_y][tile_x] == "grass" and random.random() < 0.005:
+            rate = map_file.encounter_rate(tile_x, tile_y, tile) if map_file else ENCOUNTER_RATE[tile]
+            if random.random() < rate:
                 start_battle()
 
 # Start a battle
@@ -376,8 +362,10 @@ def start_battle():
     game_state = BATTLE
     battle_state = "player_choice"
     
-    # Choose a random enemy pokemon
-    enemy_pokemon = random.choice(list(pokemon_data.keys()))
+    # Choose a random enemy pokemon, from the encounter zone's own if the map file gives it some
+    zone = map_file.zone_at(int(player_pos[0] // TILE_SIZE), int(player_pos[1] // TILE_SIZE)) if map_file else None
+    wild = [name for name in zone.pokemon if name in pokemon_data] if zone else []
+    enemy_pokemon = random.choice(wild or list(pokemon_data.keys()))
     enemy_level = random.randint(max(1, player_level - 2), player_level + 2)
     enemy_max_health = 60 + enemy_level * 10
     enemy_health = enemy_max_health
@@ -439,132 +427,137 @@ def handle_battle():
             battle_text_timer = 120
 
 # Main game loop
-running = True
-while running:
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == QUIT:
-            running = False
+if __name__ == "__main__":
+    running = True
+    while running:
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                running = False
         
-        elif event.type == KEYDOWN:
-            if game_state == MAIN_MENU:
-                if event.key == K_DOWN:
-                    battle_option = (battle_option + 1) % 4
-                elif event.key == K_UP:
-                    battle_option = (battle_option - 1) % 4
-                elif event.key == K_RETURN:
-                    if battle_option == 0:  # New Game
-                        game_state = OVERWORLD
-                    elif battle_option == 3:  # Quit
-                        running = False
-            
-            elif game_state == OVERWORLD:
-                if event.key == K_RIGHT:
-                    move_player(player_speed, 0)
-                elif event.key == K_LEFT:
-                    move_player(-player_speed, 0)
-                elif event.key == K_DOWN:
-                    move_player(0, player_speed)
-                elif event.key == K_UP:
-                    move_player(0, -player_speed)
-                elif event.key == K_i:  # Inventory
-                    game_state = INVENTORY
-                    battle_option = 0
-                elif event.key == K_b:  # Force battle for testing
-                    start_battle()
+            elif event.type == KEYDOWN:
+                if game_state == MAIN_MENU:
+                    if event.key == K_DOWN:
+                        battle_option = (battle_option + 1) % 4
+                    elif event.key == K_UP:
+                        battle_option = (battle_option - 1) % 4
+                    elif event.key == K_RETURN:
+                        if battle_option == 0:  # New Game
+                            game_state = OVERWORLD
+                        elif battle_option == 3:  # Quit
+                            running = False
             
-            elif game_state == BATTLE:
-                if battle_state == "player_choice":
+                elif game_state == OVERWORLD:
                     if event.key == K_RIGHT:
-                        battle_option = (battle_option + 1) % 4
+                        move_player(player_speed, 0)
                     elif event.key == K_LEFT:
-                        battle_option = (battle_option - 1) % 4
+                        move_player(-player_speed, 0)
                     elif event.key == K_DOWN:
-                        battle_option = min(battle_option + 2, 3)
+                        move_player(0, player_speed)
                     elif event.key == K_UP:
-                        battle_option = max(battle_option - 2, 0)
-                    elif event.key == K_RETURN:
-                        if battle_option == 0:  # Fight
-                            battle_state = "move_selection"
-                            battle_move = 0
-                        elif battle_option == 1:  # Bag
-                            battle_text = "You opened your bag."
-                            battle_text_timer = 90
-                            battle_state = "battle_text"
-                        elif battle_option == 2:  # Pokémon
-                            battle_text = "You have only one Pokémon."
-                            battle_text_timer = 90
-                            battle_state = "battle_text"
-                        elif battle_option == 3:  # Run
-                            if random.random() < 0.8:  # 80% chance to escape
-                                battle_text = "Got away safely!"
+                        move_player(0, -player_speed)
+                    elif event.key == K_i:  # Inventory
+                        game_state = INVENTORY
+                        battle_option = 0
+                    elif event.key == K_b:  # Force battle for testing
+                        start_battle()
+            
+                elif game_state == BATTLE:
+                    if battle_state == "player_choice":
+                        if event.key == K_RIGHT:
+                            battle_option = (battle_option + 1) % 4
+                        elif event.key == K_LEFT:
+                            battle_option = (battle_option - 1) % 4
+                        elif event.key == K_DOWN:
+                            battle_option = min(battle_option + 2, 3)
+                        elif event.key == K_UP:
+                            battle_option = max(battle_option - 2, 0)
+                        elif event.key == K_RETURN:
+                            if battle_option == 0:  # Fight
+                                battle_state = "move_selection"
+                                battle_move = 0
+                            elif battle_option == 1:  # Bag
+                                battle_text = "You opened your bag."
                                 battle_text_timer = 90
                                 battle_state = "battle_text"
-                            else:
-                                battle_text = "Couldn't escape!"
+                            elif battle_option == 2:  # Pokémon
+                                battle_text = "You have only one Pokémon."
                                 battle_text_timer = 90
                                 battle_state = "battle_text"
+                            elif battle_option == 3:  # Run
+                                if random.random() < 0.8:  # 80% chance to escape
+                                    battle_text = "Got away safely!"
+                                    battle_text_timer = 90
+                                    battle_state = "battle_text"
+                                else:
+                                    battle_text = "Couldn't escape!"
+                                    battle_text_timer = 90
+                                    battle_state = "battle_text"
                 
-                elif battle_state == "move_selection":
-                    if event.key == K_RIGHT:
-                        battle_move = (battle_move + 1) % 4
-                    elif event.key == K_LEFT:
-                        battle_move = (battle_move - 1) % 4
-                    elif event.key == K_DOWN:
-                        battle_move = min(battle_move + 2, 3)
+                    elif battle_state == "move_selection":
+                        if event.key == K_RIGHT:
+                            battle_move = (battle_move + 1) % 4
+                        elif event.key == K_LEFT:
+                            battle_move = (battle_move - 1) % 4
+                        elif event.key == K_DOWN:
+                            battle_move = min(battle_move + 2, 3)
+                        elif event.key == K_UP:
+                            battle_move = max(battle_move - 2, 0)
+                        elif event.key == K_RETURN:
+                            # Player attacks
+                            damage = random.randint(10, 25)
+                            enemy_health = max(0, enemy_health - damage)
+                            battle_text = f"{player_pokemon} used {battle_moves[battle_move]}!\nIt did {damage} damage!"
+                            battle_text_timer = 120
+                            battle_state = "battle_text"
+                        
+                            if enemy_health <= 0:
+                                battle_text = f"Wild {enemy_pokemon} fainted!"
+                                battle_text_timer = 120
+                            else:
+                                battle_state = "enemy_turn"  # Enemy's turn after player attack
+                        elif event.key == K_ESCAPE:
+                            battle_state = "player_choice"
+            
+                elif game_state == INVENTORY:
+                    if event.key == K_DOWN:
+                        battle_option = (battle_option + 1) % len(inventory)
                     elif event.key == K_UP:
-                        battle_move = max(battle_move - 2, 0)
+                        battle_option = (battle_option - 1) % len(inventory)
                     elif event.key == K_RETURN:
-                        # Player attacks
-                        damage = random.randint(10, 25)
-                        enemy_health = max(0, enemy_health - damage)
-                        battle_text = f"{player_pokemon} used {battle_moves[battle_move]}!\nIt did {damage} damage!"
-                        battle_text_timer = 120
-                        battle_state = "battle_text"
-                        
-                        if enemy_health <= 0:
-                            battle_text = f"Wild {enemy_pokemon} fainted!"
-                            battle_text_timer = 120
-                        else:
-                            battle_state = "enemy_turn"  # Enemy's turn after player attack
+                        item = list(inventory.keys())[battle_option]
+                        if item == "Potion" and player_health < player_max_health:
+                            player_health = min(player_max_health, player_health + 30)
+                            inventory[item] -= 1
+                            if inventory[item] <= 0:
+                                del inventory[item]
                     elif event.key == K_ESCAPE:
-                        battle_state = "player_choice"
-            
-            elif game_state == INVENTORY:
-                if event.key == K_DOWN:
-                    battle_option = (battle_option + 1) % len(inventory)
-                elif event.key == K_UP:
-                    battle_option = (battle_option - 1) % len(inventory)
-                elif event.key == K_RETURN:
-                    item = list(inventory.keys())[battle_option]
-                    if item == "Potion" and player_health < player_max_health:
-                        player_health = min(player_max_health, player_health + 30)
-                        inventory[item] -= 1
-                        if inventory[item] <= 0:
-                            del inventory[item]
-                elif event.key == K_ESCAPE:
-                    game_state = OVERWORLD
-    
-    # Update game state
-    if game_state == BATTLE:
-        handle_battle()
-    
-    # Draw everything
-    if game_state == MAIN_MENU:
-        draw_main_menu()
-    elif game_state == OVERWORLD:
-        draw_world()
-        draw_player()
-        draw_hud()
-    elif game_state == BATTLE:
-        draw_battle()
-    elif game_state == INVENTORY:
-        draw_inventory()
-    
-    # Update display
-    pygame.display.flip()
-    clock.tick(FPS)
+                        game_state = OVERWORLD
+    
+        # Update game state
+        if game_state == BATTLE:
+            handle_battle()
+    
+        # Draw everything
+        if game_state == MAIN_MENU:
+            draw_main_menu()
+        elif game_state == OVERWORLD:
+            draw_world()
+            draw_player()
+            draw_hud()
+        elif game_state == BATTLE:
+            draw_battle()
+        elif game_state == INVENTORY:
+            draw_inventory()
+    
+        # Update display
+        pygame.display.flip()
+        clock.tick(FPS)
 
-# Clean up
-pygame.quit()
-sys.exit()
+    # Clean up
+    if isinstance(world_map, StreamingWorld):
+        world_map.close()
+    if map_file is not None:
+        map_file.close()
+    pygame.quit()
+    sys.exit()
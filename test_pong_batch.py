@@ -0,0 +1,41 @@
+import random
+
+import numpy as np
+import pytest
+
+import pong_core
+from pong_batch import BatchPong
+from pong_core import PongSim, P1_UP, P1_DOWN
+
+
+@pytest.mark.parametrize("tick_rate", (60, 240))
+def test_one_match_plays_like_pong_sim(monkeypatch, tick_rate):
+    """BatchPong(1) in track mode follows PongSim tick for tick, given the same serves and inputs"""
+    # The two draw their randomness differently: no AI error, and each serve copied across
+    monkeypatch.setattr(pong_core, "AI_ERROR_RATE", 0.0)
+    sim = PongSim(seed=3, tick_rate=tick_rate)
+    batch = BatchPong(1, seed=3, error_rate=0.0, tick_rate=tick_rate)
+    s = sim.state
+
+    def serve():
+        batch.ball_x[0], batch.ball_y[0] = s.ball_x, s.ball_y
+        batch.ball_dx[0], batch.ball_dy[0] = s.ball_dx, s.ball_dy
+
+    serve()
+    rng = random.Random(3)
+    inputs = 0
+    points = 0
+    while not s.game_over:
+        if rng.random() < 0.05:
+            inputs = rng.choice((0, P1_UP, P1_DOWN))
+        sim.step(inputs)
+        batch.step(np.array([inputs]))
+        assert (batch.player_score[0], batch.ai_score[0], batch.done[0]) == \
+               (s.player_score, s.ai_score, s.game_over), f"scores diverged at tick {s.tick}"
+        if s.player_score + s.ai_score != points:
+            points = s.player_score + s.ai_score
+            serve()
+        assert (batch.ball_x[0], batch.ball_y[0], batch.ball_dx[0], batch.ball_dy[0],
+                batch.player_y[0], batch.ai_y[0]) == \
+               (s.ball_x, s.ball_y, s.ball_dx, s.ball_dy, s.player_y, s.ai_y), f"diverged at tick {s.tick}"
+    assert points >= pong_core.WIN_SCORE